@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Load-test the backend end to end: stub upstreams, a throwaway MongoDB database, a uvicorn
+server and bench/loadgen.py, all on this machine.
+
+MongoDB comes from --mongo-url (a fresh database is created and dropped for every run) or,
+with --in-memory-mongo, from pymongo_inmemory, which downloads and starts a private mongod.
+
+--compare runs the same load against two git revisions, each checked out into a temporary
+worktree, and prints the change in throughput and latency percentiles. Only revisions whose
+server.py reads the *_BASE_URL overrides (added with the stub upstreams) can be loaded;
+older ones would send the load to the real upstream APIs, so they are refused.
+
+Usage:
+    python bench/load_suite.py [--mongo-url mongodb://localhost:27017 | --in-memory-mongo]
+                               [--rps 50] [--duration 30] [--latency-ms 80 --distribution lognormal]
+                               [--compare main HEAD]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import aiohttp
+from pymongo import MongoClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loadgen import parse_mix, print_report, run_load  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+REPO_DIR = BACKEND_DIR.parent
+# Upstream hosts and the setting that points each one at the stubs
+UPSTREAM_OVERRIDES = {
+    'PERENUAL_BASE_URL': 'perenual.com/api',
+    'PLANTNET_BASE_URL': 'api.plantnet.org',
+    'KINDWISE_BASE_URL': 'plant.id/api',
+}
+
+
+def check_stubbable(label: str, backend_dir: Path):
+    """Refuse a server that would call a real upstream API because it cannot be pointed at the stubs"""
+    source = (backend_dir / 'server.py').read_text(encoding='utf-8')
+    missing = [
+        setting for setting, host in UPSTREAM_OVERRIDES.items()
+        if host in source and f"os.environ.get('{setting}'" not in source
+    ]
+    if missing:
+        raise SystemExit(f"{label}: server.py does not read {', '.join(missing)}, so its load would go to "
+                         f"the real upstream APIs; compare revisions that include the stub upstream settings")
+
+
+@contextlib.contextmanager
+def mongo_server(args):
+    if not args.in_memory_mongo:
+        yield args.mongo_url
+        return
+    try:
+        from pymongo_inmemory import Mongod
+    except ImportError:
+        raise SystemExit("--in-memory-mongo needs pymongo_inmemory: pip install pymongo-inmemory")
+    with Mongod() as mongod:
+        yield mongod.connection_string
+
+
+@contextlib.contextmanager
+def revision_checkout(revision: str, workdir: Path):
+    """Check out a revision into a temporary git worktree and yield its backend directory"""
+    path = workdir / f"rev-{uuid.uuid4().hex[:8]}"
+    subprocess.run(['git', '-C', str(REPO_DIR), 'worktree', 'add', '--detach', str(path), revision],
+                   check=True, capture_output=True)
+    try:
+        yield path / 'backend'
+    finally:
+        subprocess.run(['git', '-C', str(REPO_DIR), 'worktree', 'remove', '--force', str(path)], capture_output=True)
+
+
+async def wait_until_ready(url: str, process: asyncio.subprocess.Process, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise RuntimeError(f"process exited with status {process.returncode}")
+            try:
+                async with session.get(url) as response:
+                    if response.status < 500:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+async def run_against(label: str, backend_dir: Path, mongo_url: str, args, workdir: Path) -> dict:
+    """Start the server from `backend_dir` with a fresh database, load it and return the report"""
+    check_stubbable(label, backend_dir)
+    db_name = f"plauntie_bench_{uuid.uuid4().hex[:8]}"
+    stub = f"http://127.0.0.1:{args.stub_port}"
+    env = {
+        **os.environ,
+        'MONGO_URL': mongo_url,
+        'DB_NAME': db_name,
+        'PERENUAL_BASE_URL': f"{stub}/perenual/api",
+        'PLANTNET_BASE_URL': f"{stub}/plantnet/v2",
+        'KINDWISE_BASE_URL': f"{stub}/kindwise/api/v3",
+        'PERENUAL_API_KEY': 'bench',
+        'PLANTNET_API_KEY': 'bench',
+        'KINDWISE_API_KEY': 'bench',
+        # The stubs have no quota; set these to load-test admission control itself
+        'PERENUAL_QUOTA': os.environ.get('PERENUAL_QUOTA', ''),
+        'PLANTNET_QUOTA': os.environ.get('PLANTNET_QUOTA', ''),
+    }
+    log_path = workdir / f"server-{db_name}.log"
+    with open(log_path, 'w') as log:
+        server = await asyncio.create_subprocess_exec(
+            sys.executable, '-m', 'uvicorn', 'server:app', '--port', str(args.port),
+            '--workers', str(args.workers), '--log-level', 'warning',
+            cwd=backend_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        try:
+            await wait_until_ready(f"{base_url}/api/", server)
+        except RuntimeError as e:
+            raise SystemExit(f"{label}: server did not start ({e}), see {log_path}")
+        return await run_load(base_url, args.rps, args.duration, parse_mix(args.mix),
+                              users=args.users, warmup=args.warmup)
+    finally:
+        if server.returncode is None:
+            server.terminate()
+            await server.wait()
+        MongoClient(mongo_url).drop_database(db_name)
+
+
+def print_comparison(before_label: str, before: dict, after_label: str, after: dict):
+    print(f"\n{before_label} -> {after_label}")
+    print(f"{'scenario':<18} {'rps':>16} {'p50 ms':>18} {'p95 ms':>18} {'p99 ms':>18}")
+
+    def change(old: float, new: float) -> str:
+        delta = f"{(new - old) / old * 100:+.0f}%" if old else 'n/a'
+        return f"{new:>8.1f} {delta:>7}"
+
+    rows = [(name, before['scenarios'][name], after['scenarios'].get(name)) for name in before['scenarios']]
+    rows.append(('total', before['total'], after['total']))
+    for name, old, new in rows:
+        if new is None:
+            continue
+        print(f"{name:<18} " + ' '.join(
+            f"{change(old[key], new[key]):>{width}}"
+            for key, width in (('throughput_rps', 16), ('p50_ms', 18), ('p95_ms', 18), ('p99_ms', 18))
+        ))
+
+
+async def run_suite(args):
+    stub = await asyncio.create_subprocess_exec(
+        sys.executable, str(BENCH_DIR / 'stub_upstreams.py'), '--port', str(args.stub_port),
+        '--latency-ms', str(args.latency_ms), '--distribution', args.distribution,
+        '--error-rate', str(args.error_rate),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    reports = {}
+    try:
+        await wait_until_ready(f"http://127.0.0.1:{args.stub_port}/perenual/api/species-list", stub)
+        with tempfile.TemporaryDirectory(prefix='plauntie-bench-') as tmp, mongo_server(args) as mongo_url:
+            workdir = Path(tmp)
+            if not args.compare:
+                reports['working tree'] = await run_against('working tree', BACKEND_DIR, mongo_url, args, workdir)
+            for revision in args.compare or ():
+                with revision_checkout(revision, workdir) as backend_dir:
+                    reports[revision] = await run_against(revision, backend_dir, mongo_url, args, workdir)
+    finally:
+        stub.terminate()
+        await stub.wait()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the backend against stub upstreams and a local MongoDB")
+    parser.add_argument('--mongo-url', default=os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
+    parser.add_argument('--in-memory-mongo', action='store_true', help="start a private mongod via pymongo_inmemory")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'), help="git revisions to compare")
+    parser.add_argument('--rps', type=float, default=50)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--warmup', type=float, default=5)
+    parser.add_argument('--mix', help="scenario weights, e.g. search=30,care=25 (default: all scenarios)")
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument('--port', type=int, default=8101)
+    parser.add_argument('--stub-port', type=int, default=9100)
+    parser.add_argument('--latency-ms', type=float, default=80, help="stub upstream latency (default: 80)")
+    parser.add_argument('--distribution', choices=('fixed', 'exponential', 'lognormal'), default='lognormal')
+    parser.add_argument('--error-rate', type=float, default=0.0, help="stub upstream error rate")
+    parser.add_argument('--json', help="also write the reports to this file")
+    args = parser.parse_args()
+
+    reports = asyncio.run(run_suite(args))
+    for label, report in reports.items():
+        print_report(report, f"\n== {label} ==")
+    if args.compare:
+        (before_label, before), (after_label, after) = reports.items()
+        print_comparison(before_label, before, after_label, after)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Open-loop asyncio load generator for the Plauntie API.
+
+Requests are started on a fixed schedule at the target rate whether or not earlier ones
+have finished, and latency is measured from the scheduled start. A slow server therefore
+shows up as latency instead of quietly lowering the offered load.
+
+The default mix covers plant search, care info, identification, the user plant listing
+and creation, and reminder listing and completion. Before the run, a pool of users is
+seeded with plants, and through them reminders.
+
+Usage:
+    python bench/loadgen.py --base-url http://127.0.0.1:8001 [--rps 50] [--duration 30]
+                            [--mix search=30,care=25,identify=5] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import aiohttp
+from PIL import Image
+
+DEFAULT_MIX = {
+    'search': 30,
+    'care': 25,
+    'identify': 5,
+    'list_plants': 15,
+    'add_plant': 5,
+    'list_reminders': 15,
+    'complete_reminder': 5,
+}
+SEARCH_TERMS = ['rose', 'ficus', 'orchid', 'cactus', 'lavender', 'aloe', 'fern', 'ivy', 'роза', 'фикус', 'кактус']
+CARE_PLANT_IDS = 300
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, float]:
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown scenario '{name}', expected one of: {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def sample_jpeg() -> bytes:
+    image = Image.new('RGB', (800, 600), (40, 140, 60))
+    for x in range(0, 800, 40):
+        image.paste((200, 80 + x % 120, 90), (x, 200, x + 20, 400))
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=85)
+    return buffer.getvalue()
+
+
+class LoadGenerator:
+    def __init__(self, base_url: str, users: int):
+        self.api = base_url.rstrip('/') + '/api'
+        self.user_ids = [f"load-{uuid.uuid4().hex[:8]}-{index}" for index in range(users)]
+        self.reminder_ids: List[tuple] = []
+        self.image = sample_jpeg()
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def seed(self, plants_per_user: int):
+        """Give every user some plants; each new plant also creates its first reminders"""
+        for user_id in self.user_ids:
+            for index in range(plants_per_user):
+                await self.add_plant(user_id, index)
+            await self.collect_reminders(user_id)
+
+    async def collect_reminders(self, user_id: str):
+        async with self.session.get(f"{self.api}/user/{user_id}/reminders") as response:
+            if response.status == 200:
+                self.reminder_ids.extend((user_id, reminder['id']) for reminder in await response.json())
+
+    async def add_plant(self, user_id: str, index: int) -> int:
+        body = {
+            'plant_id': str(random.randint(1, CARE_PLANT_IDS)),
+            'nickname': f"Plant {index}",
+            'plant_name': random.choice(SEARCH_TERMS),
+            'watering_frequency_days': random.choice([3, 7, 10]),
+        }
+        async with self.session.post(f"{self.api}/user/{user_id}/plants", json=body) as response:
+            await response.read()
+            return response.status
+
+    async def scenario(self, name: str) -> int:
+        """Run one request of a scenario and return its HTTP status"""
+        user_id = random.choice(self.user_ids)
+        if name == 'search':
+            request = self.session.get(f"{self.api}/plants/search", params={'q': random.choice(SEARCH_TERMS)})
+        elif name == 'care':
+            request = self.session.get(f"{self.api}/plants/{random.randint(1, CARE_PLANT_IDS)}/care")
+        elif name == 'identify':
+            form = aiohttp.FormData()
+            form.add_field('file', self.image, filename='plant.jpg', content_type='image/jpeg')
+            request = self.session.post(f"{self.api}/plants/identify", data=form)
+        elif name == 'list_plants':
+            request = self.session.get(f"{self.api}/user/{user_id}/plants")
+        elif name == 'add_plant':
+            return await self.add_plant(user_id, random.randint(0, 1000))
+        elif name == 'list_reminders':
+            request = self.session.get(f"{self.api}/user/{user_id}/reminders")
+        else:
+            if not self.reminder_ids:
+                await self.collect_reminders(user_id)
+                if not self.reminder_ids:
+                    return 0
+            user_id, reminder_id = self.reminder_ids.pop(random.randrange(len(self.reminder_ids)))
+            request = self.session.post(f"{self.api}/user/{user_id}/reminders/{reminder_id}/complete")
+        async with request as response:
+            await response.read()
+            return response.status
+
+    async def run(self, rps: float, duration: float, mix: Dict[str, float], max_in_flight: int) -> Dict:
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        results: Dict[str, Dict[str, list]] = {name: {'latencies': [], 'errors': []} for name in names}
+        in_flight = set()
+        dropped = 0
+
+        async def timed(name: str, scheduled: float):
+            try:
+                status = await self.scenario(name)
+                error = None if 200 <= status < 400 else str(status)
+            except Exception as e:
+                error = type(e).__name__
+            if error:
+                results[name]['errors'].append(error)
+            else:
+                results[name]['latencies'].append((time.perf_counter() - scheduled) * 1000)
+
+        started = time.perf_counter()
+        total = int(rps * duration)
+        for index in range(total):
+            scheduled = started + index / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                dropped += 1
+                continue
+            task = asyncio.create_task(timed(random.choices(names, weights)[0], scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.wait(in_flight)
+        elapsed = time.perf_counter() - started
+        return summarize(results, elapsed, rps, dropped)
+
+
+def summarize(results: Dict[str, Dict[str, list]], elapsed: float, rps: float, dropped: int) -> Dict:
+    def stats(latencies: List[float], errors: List[str]) -> Dict:
+        ordered = sorted(latencies)
+        return {
+            'requests': len(latencies) + len(errors),
+            'errors': len(errors),
+            'error_kinds': {kind: errors.count(kind) for kind in set(errors)},
+            'throughput_rps': round(len(latencies) / elapsed, 2),
+            'p50_ms': round(percentile(ordered, 0.50), 1),
+            'p95_ms': round(percentile(ordered, 0.95), 1),
+            'p99_ms': round(percentile(ordered, 0.99), 1),
+        }
+
+    all_latencies = [value for result in results.values() for value in result['latencies']]
+    all_errors = [value for result in results.values() for value in result['errors']]
+    return {
+        'target_rps': rps,
+        'elapsed_seconds': round(elapsed, 2),
+        'dropped': dropped,
+        'total': stats(all_latencies, all_errors),
+        'scenarios': {name: stats(result['latencies'], result['errors']) for name, result in results.items()},
+    }
+
+
+def print_report(report: Dict, title: str = ''):
+    if title:
+        print(title)
+    print(f"{'scenario':<18} {'reqs':>6} {'errors':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = [*report['scenarios'].items(), ('total', report['total'])]
+    for name, row in rows:
+        print(f"{name:<18} {row['requests']:>6} {row['errors']:>6} {row['throughput_rps']:>8.1f} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+    if report['dropped']:
+        print(f"dropped {report['dropped']} requests at the in-flight limit")
+
+
+async def run_load(base_url: str, rps: float, duration: float, mix: Dict[str, float], users: int = 20,
+                   plants_per_user: int = 3, warmup: float = 5, max_in_flight: int = 1000, seed: int = 1) -> Dict:
+    # The same seed gives the same request sequence, so runs against different revisions compare like for like
+    random.seed(seed)
+    generator = LoadGenerator(base_url, users)
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60)) as session:
+        generator.session = session
+        await generator.seed(plants_per_user)
+        if warmup:
+            await generator.run(rps, warmup, mix, max_in_flight)
+        return await generator.run(rps, duration, mix, max_in_flight)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the Plauntie API at a fixed request rate")
+    parser.add_argument('--base-url', default='http://127.0.0.1:8001')
+    parser.add_argument('--rps', type=float, default=50)
+    parser.add_argument('--duration', type=float, default=30, help="measured seconds (default: 30)")
+    parser.add_argument('--warmup', type=float, default=5, help="unmeasured seconds first (default: 5)")
+    parser.add_argument('--mix', help="scenario weights, e.g. search=30,care=25 (default: all scenarios)")
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--max-in-flight', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.base_url, args.rps, args.duration, parse_mix(args.mix),
+                                  users=args.users, warmup=args.warmup, max_in_flight=args.max_in_flight, seed=args.seed))
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
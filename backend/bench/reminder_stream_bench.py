@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: memory held per idle reminder event stream and the time to fan one
+change out to every stream. Connections are driven through the full ASGI app (middleware
+included) in-process, so socket buffers and the HTTP parser are not counted; MongoDB and
+the change stream are not involved. The parked streams are long-lived objects, so the
+cost of a full cyclic collection over them is reported too.
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=plauntie python bench/reminder_stream_bench.py
+        [--connections 10000] [--users 2000]
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import app, reminder_events  # noqa: E402
+
+
+class Connection:
+    """Stands in for the server side of one HTTP connection"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.requested = False
+        self.closed = asyncio.get_running_loop().create_future()
+        self.chunks = 0
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.closed
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.body':
+            self.chunks += 1
+
+    def scope(self):
+        return {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': f"/api/user/{self.user_id}/reminders/stream", 'raw_path': b'',
+            'query_string': b'', 'root_path': '', 'headers': [(b'host', b'localhost')],
+            'client': ('127.0.0.1', 50000), 'server': ('127.0.0.1', 8001),
+        }
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0.05)
+
+
+async def run(args):
+    reminder = {'id': 'r', 'plant_id': 'p', 'plant_nickname': 'Fern', 'reminder_type': 'watering',
+                'due_date': datetime(2026, 1, 1), 'status': 'due'}
+
+    # Warm up once so lazily created module state is not charged to the connections
+    warm = Connection('warmup')
+    warm_task = asyncio.create_task(app(warm.scope(), warm.receive, warm.send))
+    await settle()
+    reminder_events.publish('warmup', 'due', reminder)
+    await settle()
+    warm.closed.set_result(None)
+    await warm_task
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    connections = [Connection(f"user-{index % args.users}") for index in range(args.connections)]
+    tasks = [asyncio.create_task(app(c.scope(), c.receive, c.send)) for c in connections]
+    await settle()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    held = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    tracemalloc.stop()
+    assert reminder_events.connections == args.connections, reminder_events.snapshot()
+
+    # The first round pays for the allocator settling after tracemalloc
+    for index in range(args.users):
+        reminder_events.publish(f"user-{index}", 'due', reminder)
+    await settle()
+    # Cyclic collections walk every parked stream; timed separately below
+    gc.disable()
+    started = time.perf_counter()
+    for index in range(args.users):
+        reminder_events.publish(f"user-{index}", 'completed', reminder)
+    publish_seconds = time.perf_counter() - started
+    gc.enable()
+    await settle()
+    started = time.perf_counter()
+    gc.collect()
+    collect_seconds = time.perf_counter() - started
+    delivered = sum(c.chunks >= 3 for c in connections)
+
+    print(f"{args.connections:,} idle streams for {args.users:,} users")
+    print(f"  held              {held / 1024 / 1024:>9.1f} MiB ({held / args.connections / 1024:.1f} KiB per stream)")
+    print(f"  publish to all    {publish_seconds * 1000:>9.1f} ms")
+    print(f"  full gc pass      {collect_seconds * 1000:>9.1f} ms")
+    print(f"  delivered         {delivered:>9,}")
+
+    for c in connections:
+        c.closed.set_result(None)
+    await asyncio.gather(*tasks)
+    assert reminder_events.connections == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark idle reminder event streams")
+    parser.add_argument('--connections', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: computing new frequencies and due dates for a bulk reschedule with
+reschedule_plan (NumPy, one pass over the epoch milliseconds MongoDB returns) versus a
+per-plant Python loop over datetimes, plus the cost of building the reminder bulk write
+operations.
+
+With --mongo-url, also seeds a throwaway database with the plants and one reminder each,
+creates the indexes the server creates at startup, and times reschedule_plants end to end,
+reads and bulk writes included. The database is dropped afterwards.
+
+Usage:
+    python bench/reschedule_bench.py [--plants 1000000] [--factor 1.5] [--mongo-url mongodb://localhost:27017]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import InsertOne, UpdateOne
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+from server import EPOCH, RescheduleRequest, reschedule_plan, reschedule_plants  # noqa: E402
+
+
+def synthetic_plants(count: int):
+    now = datetime(2024, 11, 1)
+    date_added = [now - timedelta(days=random.randint(30, 900)) for _ in range(count)]
+    last_watered = [now - timedelta(hours=random.randint(1, 240)) if random.random() < 0.8 else None for _ in range(count)]
+    frequencies = [random.choice([3, 5, 7, 10, 14]) for _ in range(count)]
+    return last_watered, date_added, frequencies
+
+
+def python_loop(last_watered, date_added, frequencies, factor: float):
+    new_frequencies, due_dates = [], []
+    for last, added, frequency in zip(last_watered, date_added, frequencies):
+        new_frequency = max(1, round(frequency * factor))
+        new_frequencies.append(new_frequency)
+        due_dates.append((last or added) + timedelta(days=new_frequency))
+    return new_frequencies, due_dates
+
+
+async def end_to_end(mongo_url: str, last_watered, date_added, frequencies, factor: float):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[f"plauntie_bench_{uuid.uuid4().hex[:8]}"]
+    try:
+        await db.user_plants.create_index([("user_id", 1), ("date_added", 1), ("id", 1)])
+        await db.user_plants.create_index("id", unique=True)
+        await db.reminders.create_index("id", unique=True)
+        await db.reminders.create_index([("user_id", 1), ("completed", 1), ("due_date", 1), ("id", 1), ("status", 1)])
+        await db.reminders.create_index([("plant_id", 1), ("completed", 1)])
+        
+        started = time.perf_counter()
+        for offset in range(0, len(frequencies), 10000):
+            plants, reminders = [], []
+            for i in range(offset, min(offset + 10000, len(frequencies))):
+                plant_id = f"plant-{i}"
+                start = last_watered[i] or date_added[i]
+                plants.append(InsertOne({
+                    'id': plant_id, 'user_id': 'bench', 'date_added': date_added[i],
+                    'last_watered': last_watered[i], 'watering_frequency_days': frequencies[i],
+                }))
+                reminders.append(InsertOne({
+                    'id': f"reminder-{i}", 'user_id': 'bench', 'plant_id': plant_id, 'reminder_type': 'watering',
+                    'due_date': start + timedelta(days=frequencies[i]), 'completed': False, 'status': 'pending',
+                }))
+            await db.user_plants.bulk_write(plants, ordered=False)
+            await db.reminders.bulk_write(reminders, ordered=False)
+        seed_seconds = time.perf_counter() - started
+        
+        # reschedule_plants reads the module's database
+        server.db = db
+        started = time.perf_counter()
+        result = await reschedule_plants({'user_id': 'bench'}, RescheduleRequest(factor=factor))
+        return seed_seconds, time.perf_counter() - started, result
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized bulk reschedule pass")
+    parser.add_argument('--plants', type=int, default=1_000_000)
+    parser.add_argument('--factor', type=float, default=1.5)
+    parser.add_argument('--mongo-url', help="also time the real reads and writes against this MongoDB")
+    args = parser.parse_args()
+
+    last_watered, date_added, frequencies = synthetic_plants(args.plants)
+    ids = [str(index) for index in range(args.plants)]
+
+    started = time.perf_counter()
+    new_frequencies, due_dates = python_loop(last_watered, date_added, frequencies, args.factor)
+    loop_seconds = time.perf_counter() - started
+
+    # What the $project in reschedule_plants returns
+    start_ms = [int(((last or added) - EPOCH).total_seconds() * 1000) for last, added in zip(last_watered, date_added)]
+
+    started = time.perf_counter()
+    arrays = (
+        np.fromiter(start_ms, np.int64, len(start_ms)).view('datetime64[ms]'),
+        np.fromiter(frequencies, np.float64, len(frequencies)),
+    )
+    convert_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    planned_frequencies, planned_due_dates = reschedule_plan(*arrays, args.factor, None)
+    plan_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    planned_frequencies, planned_due_dates = planned_frequencies.tolist(), planned_due_dates.tolist()
+    back_seconds = time.perf_counter() - started
+
+    assert planned_due_dates == due_dates and planned_frequencies == new_frequencies
+
+    started = time.perf_counter()
+    operations = [
+        UpdateOne({'id': ids[i], 'completed': False}, {'$set': {
+            'due_date': planned_due_dates[i], 'frequency_days': planned_frequencies[i],
+            'status': 'pending', 'next_check_at': planned_due_dates[i],
+        }})
+        for i in range(args.plants)
+    ]
+    operations_seconds = time.perf_counter() - started
+
+    print(f"{args.plants:,} plants, factor {args.factor}")
+    print(f"  python loop          {loop_seconds * 1000:>9.1f} ms")
+    print(f"  lists -> arrays      {convert_seconds * 1000:>9.1f} ms")
+    print(f"  reschedule_plan      {plan_seconds * 1000:>9.1f} ms")
+    print(f"  arrays -> lists      {back_seconds * 1000:>9.1f} ms")
+    print(f"  build {len(operations):,} UpdateOne {operations_seconds * 1000:>9.1f} ms")
+    
+    if args.mongo_url:
+        seed_seconds, seconds, result = asyncio.run(
+            end_to_end(args.mongo_url, last_watered, date_added, frequencies, args.factor)
+        )
+        print(f"  seed database        {seed_seconds:>9.1f} s")
+        print(f"  reschedule_plants    {seconds:>9.1f} s "
+              f"({result['plants']:,} plants, {result['reminders']:,} reminders)")
+
+
+if __name__ == "__main__":
+    main()
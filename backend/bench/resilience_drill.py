@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Drive PlantAPIService against the local stub through healthy, failing, recovering and
+slow-tail phases, printing latency and circuit breaker state after each phase.
+
+Usage:
+    python bench/resilience_drill.py [--port 9101]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from stub_upstreams import create_app  # noqa: E402
+
+PHASES = [
+    ('healthy', {'latency_ms': 20, 'error_rate': 0, 'tail_rate': 0}, 40, 0),
+    ('failing', {'error_rate': 1.0}, 20, 0),
+    ('recovered', {'error_rate': 0}, 20, 2.5),
+    ('slow tail', {'tail_rate': 0.1, 'tail_latency_ms': 500}, 60, 0),
+]
+
+
+async def run_phase(plant_service, calls: int):
+    latencies, errors = [], 0
+    for index in range(calls):
+        started = time.perf_counter()
+        try:
+            await plant_service.fetch_species_details(str(index + 1))
+        except Exception:
+            errors += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, errors
+
+
+async def main(port: int):
+    base = f"http://127.0.0.1:{port}"
+    os.environ.setdefault('PERENUAL_BASE_URL', f"{base}/perenual/api")
+    os.environ.setdefault('PLANTNET_BASE_URL', f"{base}/plantnet/v2")
+    os.environ.setdefault('BREAKER_OPEN_SECONDS', '2')
+    os.environ.setdefault('HEDGE_PROVIDERS', 'perenual')
+    os.environ.setdefault('PERENUAL_QUOTA', '')
+    from server import plant_service  # noqa: E402 - reads the environment above at import
+
+    runner = web.AppRunner(create_app(latency_ms=20, error_rate=0))
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+
+    print(f"{'phase':<10} {'calls':>5} {'errors':>6} {'p50 ms':>8} {'max ms':>8}  breaker")
+    async with aiohttp.ClientSession() as admin:
+        for name, faults, calls, pause in PHASES:
+            await admin.post(f"{base}/_faults", json={'perenual': faults})
+            await asyncio.sleep(pause)
+            latencies, errors = await run_phase(plant_service, calls)
+            state = plant_service.get_breaker_states()['perenual']
+            print(f"{name:<10} {calls:>5} {errors:>6} {statistics.median(latencies):>8.1f} "
+                  f"{max(latencies):>8.1f}  {state['state']} (retries={state['retries']}, "
+                  f"hedges={state['hedges']}, rejected={state['rejected']})")
+
+    await plant_service.close_session()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exercise the upstream resilience layer against the stub")
+    parser.add_argument('--port', type=int, default=9101)
+    asyncio.run(main(parser.parse_args().port))
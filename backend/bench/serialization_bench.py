@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: cost of serving a list of user plants through the previous response path
+(build UserPlant models, validate against response_model, stdlib JSON) versus
+MongoJSONResponse (orjson on the stored documents).
+
+Both paths are served by an in-process FastAPI app, so routing overhead is included and equal.
+
+Usage:
+    python bench/serialization_bench.py [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import MongoJSONResponse, UserPlant  # noqa: E402
+
+SIZES = [1_000, 10_000]
+
+
+def stored_plants(count: int) -> List[dict]:
+    """Documents shaped like db.user_plants rows (without _id, as listings project it out)"""
+    added = datetime(2024, 1, 1)
+    return [
+        {
+            **UserPlant(
+                user_id='bench-user',
+                plant_id=str(index),
+                nickname=f"Растение {index}",
+                plant_name='Rose',
+                scientific_name='Rosa',
+                date_added=added + timedelta(minutes=index),
+                last_watered=added + timedelta(days=index % 30),
+                notes='Поливать по утрам',
+            ).dict(),
+            'id': str(uuid.UUID(int=index)),
+        }
+        for index in range(count)
+    ]
+
+
+def create_app(docs: List[dict]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/current", response_model=List[UserPlant])
+    async def current():
+        return [UserPlant(**doc) for doc in docs]
+
+    @app.get("/fast", response_model=List[UserPlant])
+    async def fast():
+        return MongoJSONResponse(docs)
+
+    return app
+
+
+def time_path(client: TestClient, path: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        best = min(best, time.perf_counter() - started)
+        assert response.status_code == 200
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare list response serialization paths")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'documents':>10} {'current ms':>11} {'fast ms':>8} {'speedup':>8}")
+    for size in SIZES:
+        docs = stored_plants(size)
+        with TestClient(create_app(docs)) as client:
+            assert client.get('/current').json() == client.get('/fast').json()
+            current = time_path(client, '/current', args.repeat)
+            fast = time_path(client, '/fast', args.repeat)
+        print(f"{size:>10} {current:>11.1f} {fast:>8.1f} {current / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
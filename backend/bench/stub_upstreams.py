@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Local stub for the Perenual, PlantNet and Kindwise APIs with injectable latency and errors.
+
+Point the backend at it with:
+    PERENUAL_BASE_URL=http://127.0.0.1:9100/perenual/api
+    PLANTNET_BASE_URL=http://127.0.0.1:9100/plantnet/v2
+    KINDWISE_BASE_URL=http://127.0.0.1:9100/kindwise/api/v3
+
+Faults can be changed while the stub runs:
+    curl -X POST localhost:9100/_faults -d '{"perenual": {"latency_ms": 800, "error_rate": 0.5}}'
+
+Fault settings per upstream: latency_ms, distribution (fixed, exponential or lognormal around
+latency_ms, with sigma for lognormal), tail_rate and tail_latency_ms (extra latency for that
+fraction of requests), error_rate and error_status.
+
+Usage:
+    python bench/stub_upstreams.py [--port 9100] [--latency-ms 50] [--distribution fixed] [--error-rate 0]
+"""
+
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+
+SPECIES = [
+    ('rose', 'Rosa'), ('african violet', 'Saintpaulia ionantha'), ('ficus', 'Ficus benjamina'),
+    ('orchid', 'Phalaenopsis'), ('cactus', 'Cactaceae'), ('lavender', 'Lavandula angustifolia'),
+    ('aloe', 'Aloe vera'), ('jade plant', 'Crassula ovata'), ('fern', 'Nephrolepis exaltata'),
+    ('ivy', 'Hedera helix'),
+]
+PAGE_SIZE = 30
+PAGES = 10
+
+
+class Faults:
+    """Latency and error injection settings for one upstream"""
+
+    FIELDS = ('latency_ms', 'distribution', 'sigma', 'tail_rate', 'tail_latency_ms', 'error_rate', 'error_status')
+
+    def __init__(self, latency_ms: float, error_rate: float, error_status: int = 503,
+                 tail_rate: float = 0.0, tail_latency_ms: float = 0.0,
+                 distribution: str = 'fixed', sigma: float = 0.5):
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.sigma = sigma
+        self.tail_rate = tail_rate
+        self.tail_latency_ms = tail_latency_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+    def update(self, settings: dict):
+        for key in self.FIELDS:
+            if key in settings:
+                setattr(self, key, type(getattr(self, key))(settings[key]))
+
+    def as_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def sample_latency_ms(self) -> float:
+        """latency_ms is the mean of the exponential distribution and the median of the lognormal one"""
+        if self.distribution == 'exponential':
+            return random.expovariate(1 / self.latency_ms) if self.latency_ms else 0.0
+        if self.distribution == 'lognormal':
+            return self.latency_ms * random.lognormvariate(0, self.sigma)
+        return self.latency_ms
+
+    async def inject(self):
+        """Sleep for the configured latency; return an error response at the configured rate"""
+        latency_ms = self.sample_latency_ms()
+        if random.random() < self.tail_rate:
+            latency_ms += self.tail_latency_ms
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if random.random() < self.error_rate:
+            return web.Response(status=self.error_status, text='injected failure')
+        return None
+
+
+def species_entry(species_id: int) -> dict:
+    common_name, scientific_name = SPECIES[species_id % len(SPECIES)]
+    return {
+        'id': species_id,
+        'common_name': f"{common_name} {species_id}",
+        'scientific_name': [f"{scientific_name} {species_id}"],
+        'other_name': [],
+        'default_image': None,
+    }
+
+
+def create_app(latency_ms: float, error_rate: float, distribution: str = 'fixed') -> web.Application:
+    faults = {
+        'perenual': Faults(latency_ms, error_rate, distribution=distribution),
+        'plantnet': Faults(latency_ms, error_rate, distribution=distribution),
+        'kindwise': Faults(latency_ms, error_rate, distribution=distribution),
+    }
+
+    async def species_list(request):
+        failure = await faults['perenual'].inject()
+        if failure:
+            return failure
+        page = int(request.query.get('page', 1))
+        query = request.query.get('q', '').lower()
+        start = (page - 1) * PAGE_SIZE + 1
+        data = [species_entry(i) for i in range(start, start + PAGE_SIZE)]
+        if query:
+            data = [entry for entry in data if query.split()[0] in entry['common_name']]
+        return web.json_response({'data': data, 'current_page': page, 'last_page': PAGES, 'per_page': PAGE_SIZE})
+
+    async def species_details(request):
+        failure = await faults['perenual'].inject()
+        if failure:
+            return failure
+        species_id = int(request.match_info['species_id'])
+        return web.json_response({
+            **species_entry(species_id),
+            'watering': 'Average',
+            'sunlight': ['part shade'],
+            'hardiness': {'min': '5', 'max': '10'},
+        })
+
+    async def identify(request):
+        await request.read()
+        failure = await faults['plantnet'].inject()
+        if failure:
+            return failure
+        return web.json_response({'results': [
+            {
+                'score': round(random.uniform(0.3, 0.9), 3),
+                'species': {
+                    'scientificNameWithoutAuthor': scientific_name,
+                    'commonNames': [common_name],
+                    'family': {'scientificNameWithoutAuthor': 'Stubaceae'},
+                },
+            }
+            for common_name, scientific_name in random.sample(SPECIES, 3)
+        ]})
+
+    async def kindwise_identify(request):
+        await request.read()
+        failure = await faults['kindwise'].inject()
+        if failure:
+            return failure
+        return web.json_response({'result': {'classification': {'suggestions': [
+            {
+                'name': scientific_name,
+                'probability': round(random.uniform(0.3, 0.9), 3),
+                'details': {'common_names': [common_name], 'taxonomy': {'family': 'Stubaceae'}},
+            }
+            for common_name, scientific_name in random.sample(SPECIES, 3)
+        ]}}}, status=201)
+
+    async def update_faults(request):
+        body = await request.json()
+        for provider, settings in body.items():
+            faults[provider].update(settings)
+        return web.json_response({name: fault.as_dict() for name, fault in faults.items()})
+
+    app = web.Application()
+    app.router.add_get('/perenual/api/species-list', species_list)
+    app.router.add_get('/perenual/api/species/details/{species_id}', species_details)
+    app.router.add_post('/plantnet/v2/identify/{project}', identify)
+    app.router.add_post('/kindwise/api/v3/identification', kindwise_identify)
+    app.router.add_post('/_faults', update_faults)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Perenual, PlantNet and Kindwise APIs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--distribution', choices=('fixed', 'exponential', 'lognormal'), default='fixed')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    web.run_app(create_app(args.latency_ms, args.error_rate, args.distribution), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
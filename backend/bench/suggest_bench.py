@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: build time, memory footprint, snapshot load time and lookup latency of the
+TypeaheadIndex for a synthetic set of plant names.
+
+Usage:
+    python bench/suggest_bench.py [--names 500000] [--queries 20000]
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import TypeaheadIndex  # noqa: E402
+
+LATIN = 'abcdefghijklmnopqrstuvwxyz'
+CYRILLIC = 'абвгдежзийклмнопрстуфхцчшщыэюя'
+
+
+def synthetic_names(count: int, rng: random.Random):
+    """Latin binomials and Russian names with a long-tailed popularity distribution"""
+    names = []
+    for index in range(count):
+        alphabet = CYRILLIC if index % 4 == 0 else LATIN
+        words = [''.join(rng.choice(alphabet) for _ in range(rng.randint(4, 11))) for _ in range(rng.randint(1, 3))]
+        name = ' '.join(words).capitalize()
+        names.append((name, name, str(index), int(rng.paretovariate(1.2)) - 1))
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the typeahead index")
+    parser.add_argument('--names', type=int, default=500_000)
+    parser.add_argument('--queries', type=int, default=20_000)
+    args = parser.parse_args()
+    rng = random.Random(42)
+    names = synthetic_names(args.names, rng)
+
+    started = time.perf_counter()
+    index = TypeaheadIndex.build(names)
+    build_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'suggest_snapshot.npz'
+        index.save(path)
+        snapshot_mb = path.stat().st_size / 2 ** 20
+        del index
+        started = time.perf_counter()
+        index = TypeaheadIndex.load(path)
+        load_seconds = time.perf_counter() - started
+
+        # Footprint of an index loaded from a snapshot, as the API holds it
+        del index
+        gc.collect()
+        tracemalloc.start()
+        index = TypeaheadIndex.load(path)
+        gc.collect()
+        memory_mb = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        tracemalloc.stop()
+
+    prefixes = []
+    for _ in range(args.queries):
+        name = rng.choice(names)[0].lower()
+        prefixes.append(name[:rng.randint(1, min(8, len(name)))])
+    latencies = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.suggest(prefix)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+
+    print(f"names:             {args.names:,} ({index.stats()})")
+    print(f"build:             {build_seconds:.1f} s")
+    print(f"index memory:      {memory_mb:.0f} MiB (tracemalloc, loaded from the snapshot)")
+    print(f"snapshot:          {snapshot_mb:.0f} MiB on disk, loaded in {load_seconds:.1f} s")
+    print(f"lookup p50 / p99:  {statistics.median(latencies):.1f} / {latencies[int(len(latencies) * 0.99)]:.1f} µs")
+    print(f"lookup max:        {latencies[-1]:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-query cost of the Russian→English translator as the dictionary grows.
+
+Compares the compiled QueryTranslator against the previous linear substring scan.
+
+Usage:
+    python bench/translator_bench.py [--queries 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import PLANT_TRANSLATIONS_PATH, QueryTranslator, load_plant_translations  # noqa: E402
+
+CYRILLIC = 'абвгдежзийклмнопрстуфхцчшщыэюя'
+SIZES = [50, 1_000, 10_000, 100_000]
+
+
+def linear_translate(translations, query):
+    """The original PlantAPIService.translate_query implementation"""
+    query_lower = query.lower().strip()
+    if query_lower in translations:
+        return translations[query_lower]
+    for russian, english in translations.items():
+        if russian in query_lower or query_lower in russian:
+            return english
+    return query
+
+
+def synthetic_dictionary(base, size, rng):
+    translations = dict(base)
+    while len(translations) < size:
+        words = [''.join(rng.choice(CYRILLIC) for _ in range(rng.randint(4, 10))) for _ in range(rng.randint(1, 3))]
+        translations[' '.join(words)] = f"plant {len(translations)}"
+    return translations
+
+
+def time_per_query(translate, queries):
+    start = time.perf_counter()
+    for query in queries:
+        translate(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    base = load_plant_translations(PLANT_TRANSLATIONS_PATH)
+    samples = ['роза', 'фиалки узамбарские', 'купить кактус', 'орхид', 'monstera deliciosa', 'неизвестное растение']
+    queries = [rng.choice(samples) for _ in range(args.queries)]
+
+    print(f"{'entries':>8} {'build ms':>10} {'compiled us/q':>14} {'linear us/q':>12}")
+    for size in SIZES:
+        translations = synthetic_dictionary(base, size, rng)
+        start = time.perf_counter()
+        translator = QueryTranslator(translations)
+        build_ms = (time.perf_counter() - start) * 1e3
+        compiled = time_per_query(translator.translate, queries)
+        linear = time_per_query(lambda q: linear_translate(translations, q), queries[:max(20, args.queries // 20)])
+        print(f"{size:>8} {build_ms:>10.1f} {compiled:>14.2f} {linear:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Build the typeahead snapshot loaded by the API at startup.
+
+Names come from the Russian translation table and the local species catalog (see
+sync_catalog.py). Each name is ranked by how many user plants have that plant.
+
+Usage:
+    python build_suggest_index.py [--output data/suggest_snapshot.npz]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from server import (
+    client,
+    db,
+    plant_service,
+    normalize_species_name,
+    species_names,
+    translation_suggestions,
+    TypeaheadIndex,
+    SUGGEST_SNAPSHOT_PATH,
+)
+
+
+async def plant_popularity() -> dict:
+    """Number of user plants per normalized plant name"""
+    counts = {}
+    pipeline = [{'$group': {'_id': {'$toLower': '$plant_name'}, 'count': {'$sum': 1}}}]
+    async for doc in db.user_plants.aggregate(pipeline):
+        name = normalize_species_name(doc['_id'] or '')
+        if name:
+            counts[name] = counts.get(name, 0) + doc['count']
+    return counts
+
+
+async def catalog_entries():
+    entries = []
+    cursor = db.species.find({}, {'_id': 0, 'id': 1, 'common_name': 1, 'scientific_name': 1, 'other_name': 1})
+    async for plant in cursor:
+        common_name = plant.get('common_name') or ''
+        for name in species_names(plant):
+            entries.append((name, common_name or name, str(plant['id']), 0))
+    return entries
+
+
+async def run(args):
+    started = time.perf_counter()
+    try:
+        popularity = await plant_popularity()
+        entries = translation_suggestions(plant_service.plant_translations) + await catalog_entries()
+    finally:
+        client.close()
+
+    # A name inherits the popularity of the plant it refers to, so Russian names rank with their translation
+    ranked = [
+        (name, plant, species_id, popularity.get(normalize_species_name(plant), 0))
+        for name, plant, species_id, _ in entries
+    ]
+    index = TypeaheadIndex.build(ranked)
+    index.save(args.output)
+    logging.info(f"Wrote {args.output} with {index.stats()} in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the plant name typeahead snapshot")
+    parser.add_argument('--output', type=Path, default=SUGGEST_SNAPSHOT_PATH,
+                        help=f"snapshot path (default: {SUGGEST_SNAPSHOT_PATH})")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,224 @@
-from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Form, Header, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import InsertOne, ReturnDocument, UpdateMany, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from bson import ObjectId
+import orjson
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional, Dict, Any, Tuple, Iterable
 import uuid
 from datetime import datetime, timedelta
 import aiohttp
 import asyncio
+import contextvars
 import json
+import csv
 import base64
-from PIL import Image
+import hashlib
+import hmac
+import heapq
+import socket
+import bisect
+import re
+import random
+import sys
+import threading
+from array import array
+from collections import OrderedDict, deque
+import time
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps
+import numpy as np
 import io
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics (per worker process, exposed at /api/metrics in Prometheus text format)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Metric:
+    """A counter or gauge with a fixed set of label names"""
+
+    def __init__(self, name: str, kind: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.labels = labels
+        self.values: Dict[Tuple[str, ...], float] = {}
+        # Mongo command events arrive on driver threads
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def set(self, value: float, *label_values: str):
+        with self.lock:
+            self.values[label_values] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            for label_values, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(self.labels, label_values)} {value:g}")
+        return lines
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, 'histogram', help_text, labels)
+        self.buckets = buckets
+        self.series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        # Per series: one count per bucket, then +Inf, then the sum
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series_items = sorted((label_values, list(series)) for label_values, series in self.series.items())
+        for label_values, series in series_items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound:g}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, label_values, le)} {cumulative:g}")
+            labels = format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{labels} {cumulative:g}")
+        return lines
+
+class MetricsRegistry:
+    """Metrics recorded as they happen plus collectors that read existing stats at scrape time"""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors = []
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Metric:
+        return self.register(Metric(name, 'counter', help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Metric:
+        return self.register(Metric(name, 'gauge', help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Histogram:
+        return self.register(Histogram(name, help_text, labels))
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for collect in self.collectors:
+            collect()
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
+http_request_seconds = metrics.histogram(
+    'plauntie_http_request_duration_seconds', "Time to serve a request, including streaming the body",
+    ('method', 'route', 'status'))
+http_upstream_seconds = metrics.histogram(
+    'plauntie_http_request_upstream_seconds', "Time a request spent waiting on upstream plant APIs",
+    ('route',))
+http_in_flight = metrics.gauge('plauntie_http_requests_in_flight', "Requests being served", ('method',))
+upstream_call_seconds = metrics.histogram(
+    'plauntie_upstream_call_duration_seconds', "Upstream API call attempts by provider and outcome",
+    ('provider', 'status'))
+mongo_command_seconds = metrics.histogram(
+    'plauntie_mongo_command_duration_seconds', "MongoDB command round trips",
+    ('command', 'collection', 'outcome'))
+
+# Upstream seconds accumulated by the request being served; unset outside requests
+request_upstream_time = contextvars.ContextVar('request_upstream_time', default=None)
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency per route template and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope['method']
+        status = '500'
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = str(message['status'])
+            await send(message)
+        
+        upstream_time = [0.0]
+        token = request_upstream_time.set(upstream_time)
+        http_in_flight.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.inc(method, amount=-1)
+            request_upstream_time.reset(token)
+            # Route templates keep the label set bounded; unmatched paths share one label
+            route = scope.get('route')
+            route_path = getattr(route, 'path', 'unmatched')
+            http_request_seconds.observe(elapsed, method, route_path, status)
+            if upstream_time[0]:
+                http_upstream_seconds.observe(upstream_time[0], route_path)
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Times every MongoDB command through the driver's command monitoring"""
+
+    def __init__(self):
+        self.collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self.collections[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else ''
+
+    def succeeded(self, event):
+        self.record(event, 'success')
+
+    def failed(self, event):
+        self.record(event, 'failure')
+
+    def record(self, event, outcome: str):
+        collection = self.collections.pop((event.connection_id, event.request_id), '')
+        mongo_command_seconds.observe(event.duration_micros / 1e6, event.command_name, collection, outcome)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()])
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
@@ -39,6 +236,146 @@ PLANTBOOK_API_TOKEN = os.environ.get('PLANTBOOK_API_TOKEN')
 KINDWISE_API_KEY = os.environ.get('KINDWISE_API_KEY')
 RAPIDAPI_KEY = os.environ.get('RAPIDAPI_KEY')
 
+# Upstream HTTP client pool settings
+HTTP_POOL_LIMIT = int(os.environ.get('HTTP_POOL_LIMIT', 100))
+HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get('HTTP_POOL_LIMIT_PER_HOST', 20))
+HTTP_DNS_CACHE_SECONDS = int(os.environ.get('HTTP_DNS_CACHE_SECONDS', 300))
+HTTP_KEEPALIVE_SECONDS = float(os.environ.get('HTTP_KEEPALIVE_SECONDS', 30))
+
+def provider_timeout(provider: str, total: float, connect: float, read: float) -> aiohttp.ClientTimeout:
+    """Per-provider timeouts, overridable with e.g. PERENUAL_TIMEOUT_TOTAL"""
+    prefix = provider.upper()
+    return aiohttp.ClientTimeout(
+        total=float(os.environ.get(f'{prefix}_TIMEOUT_TOTAL', total)),
+        connect=float(os.environ.get(f'{prefix}_TIMEOUT_CONNECT', connect)),
+        sock_read=float(os.environ.get(f'{prefix}_TIMEOUT_READ', read))
+    )
+
+# Upstream base URLs (point these at bench/stub_upstreams.py to test against a local stub)
+PERENUAL_BASE_URL = os.environ.get('PERENUAL_BASE_URL', 'https://perenual.com/api')
+PLANTNET_BASE_URL = os.environ.get('PLANTNET_BASE_URL', 'https://my-api.plantnet.org/v2')
+KINDWISE_BASE_URL = os.environ.get('KINDWISE_BASE_URL', 'https://plant.id/api/v3')
+
+# Upstream resilience settings
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', 5))
+BREAKER_OPEN_SECONDS = float(os.environ.get('BREAKER_OPEN_SECONDS', 30))
+RETRY_MAX_ATTEMPTS = int(os.environ.get('RETRY_MAX_ATTEMPTS', 3))
+RETRY_BASE_DELAY_SECONDS = float(os.environ.get('RETRY_BASE_DELAY_SECONDS', 0.2))
+RETRY_BUDGET_RATIO = float(os.environ.get('RETRY_BUDGET_RATIO', 0.1))
+RETRY_BUDGET_MAX_TOKENS = float(os.environ.get('RETRY_BUDGET_MAX_TOKENS', 10))
+HEDGE_PROVIDERS = [name for name in os.environ.get('HEDGE_PROVIDERS', '').split(',') if name]
+HEDGE_MIN_SAMPLES = int(os.environ.get('HEDGE_MIN_SAMPLES', 20))
+
+UPSTREAM_TIMEOUTS = {
+    'perenual': provider_timeout('perenual', total=10, connect=3, read=8),
+    'plantnet': provider_timeout('plantnet', total=20, connect=3, read=15),
+    'kindwise': provider_timeout('kindwise', total=20, connect=3, read=15),
+}
+
+# Upstream quota settings, per API key and shared by every worker through MongoDB
+# Comma-separated "<requests>/<minute|hour|day>" limits, e.g. PERENUAL_QUOTA=100/day for the
+# Perenual free tier or PLANTNET_QUOTA=500/day for PlantNet's; empty (the default) disables
+# admission control, since plan limits differ per key
+UPSTREAM_QUOTAS = {
+    'perenual': os.environ.get('PERENUAL_QUOTA', ''),
+    'plantnet': os.environ.get('PLANTNET_QUOTA', ''),
+    'kindwise': os.environ.get('KINDWISE_QUOTA', ''),
+}
+# Share of every bucket kept for interactive calls, so background work is shed first
+QUOTA_RESERVE_FRACTION = float(os.environ.get('QUOTA_RESERVE_FRACTION', 0.2))
+QUOTA_INTERACTIVE_WAIT_SECONDS = float(os.environ.get('QUOTA_INTERACTIVE_WAIT_SECONDS', 2))
+QUOTA_BACKGROUND_WAIT_SECONDS = float(os.environ.get('QUOTA_BACKGROUND_WAIT_SECONDS', 30))
+
+# Russian to English plant name dictionary
+PLANT_TRANSLATIONS_PATH = Path(os.environ.get('PLANT_TRANSLATIONS_PATH', ROOT_DIR / 'data' / 'plant_translations.json'))
+
+# Search cache settings
+SEARCH_CACHE_TTL_SECONDS = int(os.environ.get('SEARCH_CACHE_TTL_SECONDS', 6 * 3600))
+SEARCH_CACHE_STALE_SECONDS = int(os.environ.get('SEARCH_CACHE_STALE_SECONDS', 7 * 24 * 3600))
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES', 2048))
+
+# Typeahead settings
+SUGGEST_SNAPSHOT_PATH = Path(os.environ.get('SUGGEST_SNAPSHOT_PATH', ROOT_DIR / 'data' / 'suggest_snapshot.npz'))
+SUGGEST_TOP_K = int(os.environ.get('SUGGEST_TOP_K', 10))
+SUGGEST_SCAN_LIMIT = int(os.environ.get('SUGGEST_SCAN_LIMIT', 256))
+
+# Streaming search settings
+SEARCH_STREAM_MAX_PAGES = int(os.environ.get('SEARCH_STREAM_MAX_PAGES', 5))
+SEARCH_STREAM_PREFETCH = int(os.environ.get('SEARCH_STREAM_PREFETCH', 2))
+
+# Care info store settings
+CARE_INFO_MAX_AGE_DAYS = int(os.environ.get('CARE_INFO_MAX_AGE_DAYS', 30))
+CARE_INFO_CACHE_SECONDS = int(os.environ.get('CARE_INFO_CACHE_SECONDS', 24 * 3600))
+
+# Identification image preprocessing settings
+IDENTIFY_MAX_UPLOAD_BYTES = int(os.environ.get('IDENTIFY_MAX_UPLOAD_BYTES', 15 * 1024 * 1024))
+IDENTIFY_MAX_IMAGE_SIDE = int(os.environ.get('IDENTIFY_MAX_IMAGE_SIDE', 1280))
+IDENTIFY_JPEG_QUALITY = int(os.environ.get('IDENTIFY_JPEG_QUALITY', 85))
+IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', min(2, os.cpu_count() or 1)))
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Identification cache settings (perceptual hash; distances above 7 are clamped)
+IDENTIFY_CACHE_MAX_DISTANCE = min(7, int(os.environ.get('IDENTIFY_CACHE_MAX_DISTANCE', 5)))
+IDENTIFY_CACHE_TTL_DAYS = int(os.environ.get('IDENTIFY_CACHE_TTL_DAYS', 90))
+
+# Batch identification settings
+IDENTIFY_BATCH_CONCURRENCY = int(os.environ.get('IDENTIFY_BATCH_CONCURRENCY', 4))
+IDENTIFY_BATCH_MAX_FILES = int(os.environ.get('IDENTIFY_BATCH_MAX_FILES', 20))
+PLANTNET_MAX_IMAGES = 5
+PLANTNET_ORGANS = ('auto', 'leaf', 'flower', 'fruit', 'bark')
+
+# Identification provider settings
+# single: first provider only; race: first answer above the threshold wins; merge: combine every answer.
+# race and merge call every provider for each photo, paying each vendor and spending each quota
+IDENTIFY_STRATEGY = os.environ.get('IDENTIFY_STRATEGY', 'single').lower()
+IDENTIFY_PROVIDERS = [name for name in os.environ.get('IDENTIFY_PROVIDERS', 'plantnet,kindwise').split(',') if name]
+IDENTIFY_CONFIDENCE_THRESHOLD = float(os.environ.get('IDENTIFY_CONFIDENCE_THRESHOLD', 0.5))
+IDENTIFY_MERGE_TIMEOUT_SECONDS = float(os.environ.get('IDENTIFY_MERGE_TIMEOUT_SECONDS', 8))
+
+# Reminder scheduler settings
+REMINDER_SCHEDULER_ENABLED = os.environ.get('REMINDER_SCHEDULER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+REMINDER_OVERDUE_HOURS = float(os.environ.get('REMINDER_OVERDUE_HOURS', 24))
+REMINDER_SCHEDULER_HORIZON_SECONDS = float(os.environ.get('REMINDER_SCHEDULER_HORIZON_SECONDS', 300))
+REMINDER_SCHEDULER_BATCH = int(os.environ.get('REMINDER_SCHEDULER_BATCH', 10000))
+SCHEDULER_LEASE_SECONDS = float(os.environ.get('SCHEDULER_LEASE_SECONDS', 30))
+
+# Reminder completion settings (transactions need a replica set)
+REMINDER_TRANSACTIONS = os.environ.get('REMINDER_TRANSACTIONS', 'false').lower() in ('1', 'true', 'yes')
+REMINDER_BULK_MAX = int(os.environ.get('REMINDER_BULK_MAX', 500))
+
+# Reminder event stream settings (change streams need a replica set)
+REMINDER_STREAM_ENABLED = os.environ.get('REMINDER_STREAM_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+REMINDER_STREAM_HEARTBEAT_SECONDS = float(os.environ.get('REMINDER_STREAM_HEARTBEAT_SECONDS', 20))
+# Events buffered per connection; a client that falls further behind is told to resync instead
+REMINDER_STREAM_QUEUE = int(os.environ.get('REMINDER_STREAM_QUEUE', 64))
+REMINDER_STREAM_RETRY_SECONDS = float(os.environ.get('REMINDER_STREAM_RETRY_SECONDS', 30))
+
+# Bulk rescheduling settings
+RESCHEDULE_CHUNK_SIZE = int(os.environ.get('RESCHEDULE_CHUNK_SIZE', 10000))
+RESCHEDULE_MAX_FACTOR = float(os.environ.get('RESCHEDULE_MAX_FACTOR', 10))
+# Required in X-Admin-Token to reschedule every user's plants at once; unset disables it
+RESCHEDULE_ADMIN_TOKEN = os.environ.get('RESCHEDULE_ADMIN_TOKEN')
+
+# Listing pagination settings
+LISTING_PAGE_SIZE = int(os.environ.get('LISTING_PAGE_SIZE', 200))
+LISTING_MAX_PAGE_SIZE = int(os.environ.get('LISTING_MAX_PAGE_SIZE', 1000))
+
+# Plant import settings
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 500))
+IMPORT_MAX_LINE_BYTES = int(os.environ.get('IMPORT_MAX_LINE_BYTES', 64 * 1024))
+IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 100))
+
+# Request profiling settings (off unless a sample rate or an admin token is set)
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_ADMIN_TOKEN = os.environ.get('PROFILE_ADMIN_TOKEN')
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+PROFILE_FORMAT = os.environ.get('PROFILE_FORMAT', 'collapsed').lower()
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', ROOT_DIR / 'profiles'))
+
+# Species catalog settings
+CATALOG_FIRST = os.environ.get('CATALOG_FIRST', 'false').lower() in ('1', 'true', 'yes')
+CATALOG_MIN_SIMILARITY = float(os.environ.get('CATALOG_MIN_SIMILARITY', 0.5))
+
 # Models
 class PlantSearchResult(BaseModel):
     id: str
@@ -66,6 +403,13 @@ class PlantIdentification(BaseModel):
     suggestions: List[Dict[str, Any]] = []
     confidence: float = 0.0
     identified_name: Optional[str] = None
+    providers: List[str] = []
+    cached: bool = False
+
+class BatchIdentificationResult(BaseModel):
+    plant: str
+    images: int
+    identification: PlantIdentification
 
 class UserPlant(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -91,8 +435,19 @@ class Reminder(BaseModel):
     reminder_type: str  # watering, fertilizing, repotting
     due_date: datetime
     completed: bool = False
+    status: str = 'pending'  # pending, due, overdue, missed, completed
+    frequency_days: Optional[int] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class BulkCompleteRequest(BaseModel):
+    reminder_ids: List[str]
+
+class RescheduleRequest(BaseModel):
+    reminder_type: str = 'watering'  # watering or fertilizing
+    factor: Optional[float] = None  # multiply each plant's frequency, e.g. 1.5 for winter
+    frequency_days: Optional[int] = None  # or set the same frequency for every plant
+    plant_ids: Optional[List[str]] = None  # user plant ids; default every plant in scope
+
 class PlantDiagnosis(BaseModel):
     plant_name: Optional[str] = None
     health_status: str
@@ -100,285 +455,1917 @@ class PlantDiagnosis(BaseModel):
     recommendations: List[str] = []
     confidence: float = 0.0
 
+class UpstreamError(Exception):
+    """Raised when an upstream plant API returns an unusable response"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+class UpstreamUnavailable(UpstreamError):
+    """Raised without calling the upstream, e.g. while its circuit breaker is open"""
+
+class QuotaExhausted(UpstreamUnavailable):
+    """Raised when the API key's quota cannot admit a call before the caller's deadline"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+# Fast JSON responses
+def orjson_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class MongoJSONResponse(JSONResponse):
+    """Encodes documents read from our own collections directly with orjson.
+
+    Skips model validation and jsonable_encoder; use it only for documents this service
+    wrote. Naive datetimes are rendered like jsonable_encoder does (ISO 8601, no offset),
+    and a top-level document's `_id` is dropped.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, list):
+            for item in content:
+                if isinstance(item, dict):
+                    item.pop('_id', None)
+        elif isinstance(content, dict):
+            content.pop('_id', None)
+        return orjson.dumps(content, default=orjson_default)
+
+# Upstream response normalization
+def search_result_from_perenual(plant: Dict[str, Any]) -> PlantSearchResult:
+    """Build a search result from a Perenual species-list entry"""
+    return PlantSearchResult(
+        id=str(plant.get('id', '')),
+        name=plant.get('common_name', ''),
+        scientific_name=plant.get('scientific_name', [''])[0] if plant.get('scientific_name') else '',
+        common_names=plant.get('other_name', []),
+        image_url=plant.get('default_image', {}).get('medium_url') if plant.get('default_image') else None,
+        description=plant.get('description', ''),
+        care_level=plant.get('care_level', '')
+    )
+
+def care_info_from_perenual(plant_id: str, data: Dict[str, Any]) -> PlantCareInfo:
+    """Build care information from a Perenual species details response"""
+    return PlantCareInfo(
+        plant_id=plant_id,
+        name=data.get('common_name', 'Unknown'),
+        scientific_name=data.get('scientific_name', ['Unknown'])[0] if data.get('scientific_name') else 'Unknown',
+        watering=data.get('watering', 'Информация недоступна'),
+        sunlight=data.get('sunlight', ['Информация недоступна'])[0] if data.get('sunlight') else 'Информация недоступна',
+        temperature=f"{data.get('hardiness', {}).get('min', 'N/A')} - {data.get('hardiness', {}).get('max', 'N/A')}°C" if data.get('hardiness') else 'Информация недоступна',
+        humidity=data.get('humidity', 'Информация недоступна'),
+        fertilizer=data.get('fertilizer', 'Информация недоступна'),
+        repotting=data.get('repotting', 'Информация недоступна'),
+        common_problems=data.get('problem', []),
+        care_tips=data.get('care_guides', [])
+    )
+
+def identification_from_plantnet(result: Dict[str, Any]) -> PlantIdentification:
+    """Build an identification from a PlantNet /identify response"""
+    suggestions = []
+    max_score = 0
+    identified_name = None
+    
+    for species in result.get('results', []):
+        score = species.get('score', 0)
+        if score > max_score:
+            max_score = score
+            identified_name = species.get('species', {}).get('scientificNameWithoutAuthor', '')
+        
+        suggestions.append({
+            'name': species.get('species', {}).get('scientificNameWithoutAuthor', ''),
+            'common_names': [
+                name if isinstance(name, str) else name.get('value', '')
+                for name in species.get('species', {}).get('commonNames', [])
+            ],
+            'confidence': score,
+            'family': species.get('species', {}).get('family', {}).get('scientificNameWithoutAuthor', '')
+        })
+    
+    return PlantIdentification(
+        suggestions=suggestions,
+        confidence=max_score,
+        identified_name=identified_name,
+        providers=['plantnet']
+    )
+
+def identification_from_kindwise(result: Dict[str, Any]) -> PlantIdentification:
+    """Build an identification from a Kindwise (plant.id v3) /identification response"""
+    suggestions = []
+    for suggestion in result.get('result', {}).get('classification', {}).get('suggestions', []):
+        details = suggestion.get('details') or {}
+        suggestions.append({
+            'name': suggestion.get('name', ''),
+            'common_names': details.get('common_names') or [],
+            'confidence': suggestion.get('probability', 0),
+            'family': (details.get('taxonomy') or {}).get('family', '')
+        })
+    
+    best = max(suggestions, key=lambda suggestion: suggestion['confidence'], default=None)
+    return PlantIdentification(
+        suggestions=suggestions,
+        confidence=best['confidence'] if best else 0.0,
+        identified_name=best['name'] if best else None,
+        providers=['kindwise']
+    )
+
+def species_key(name: str) -> str:
+    """Genus and species epithet, lowercased, so providers' names can be matched"""
+    return ' '.join(name.lower().split()[:2])
+
+def merge_identifications(identifications: List[PlantIdentification]) -> PlantIdentification:
+    """Combine the suggestions of several providers.
+
+    Each provider's scores are normalized to sum to 1, then the scores a species gets
+    from every responding provider are averaged, so a species suggested by all of them
+    ranks above one only a single provider is sure about.
+    """
+    answered = [identification for identification in identifications if identification.suggestions]
+    merged: Dict[str, Dict[str, Any]] = {}
+    for identification in answered:
+        total = sum(suggestion['confidence'] for suggestion in identification.suggestions) or 1.0
+        for suggestion in identification.suggestions:
+            key = species_key(suggestion['name'])
+            if not key:
+                continue
+            entry = merged.setdefault(key, {**suggestion, 'confidence': 0.0, 'common_names': [], 'providers': []})
+            entry['confidence'] += suggestion['confidence'] / total / len(answered)
+            entry['common_names'] += [name for name in suggestion['common_names'] if name not in entry['common_names']]
+            entry['providers'] += identification.providers
+            entry['family'] = entry['family'] or suggestion['family']
+    
+    suggestions = sorted(merged.values(), key=lambda suggestion: suggestion['confidence'], reverse=True)
+    for suggestion in suggestions:
+        suggestion['confidence'] = round(suggestion['confidence'], 4)
+    return PlantIdentification(
+        suggestions=suggestions,
+        confidence=suggestions[0]['confidence'] if suggestions else 0.0,
+        identified_name=suggestions[0]['name'] if suggestions else None,
+        providers=[name for identification in answered for name in identification.providers]
+    )
+
+# Caching
+def normalize_search_key(query: str) -> str:
+    """Normalize a (translated) search query into a cache key"""
+    return ' '.join(query.lower().split())
+
+class SearchCache:
+    """Two-tier search cache: in-process LRU with TTL in front of a shared MongoDB tier.
+
+    Entries younger than `ttl` are fresh. Entries older than that but still within
+    `stale_ttl` are served immediately while a background task refreshes them. Each entry
+    is one upstream page of results with the upstream's `last_page`, when it reported one.
+    """
+
+    def __init__(self, collection, ttl_seconds: int, stale_seconds: int, max_entries: int):
+        self.collection = collection
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.stale_ttl = timedelta(seconds=stale_seconds)
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.refreshing: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            'memory_hits': 0,
+            'mongo_hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+        }
+
+    async def get_or_fetch(self, key: str, fetch) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return cached (results, last_page) for `key`, calling `fetch()` for them on a miss"""
+        now = datetime.utcnow()
+        tier = 'memory'
+        entry = self._get_memory(key)
+        if entry is None:
+            tier = 'mongo'
+            entry = await self._get_mongo(key)
+            if entry is not None:
+                self._put_memory(key, entry)
+
+        if entry is not None:
+            age = now - entry['fetched_at']
+            if age <= self.ttl:
+                self.stats[f'{tier}_hits'] += 1
+                return entry['results'], entry['last_page']
+            if age <= self.ttl + self.stale_ttl:
+                self.stats['stale_hits'] += 1
+                self._schedule_refresh(key, fetch)
+                return entry['results'], entry['last_page']
+
+        self.stats['misses'] += 1
+        results, last_page = await fetch()
+        await self.store(key, results, last_page)
+        return results, last_page
+
+    async def store(self, key: str, results: List[Dict[str, Any]], last_page: Optional[int] = None):
+        entry = {'results': results, 'last_page': last_page, 'fetched_at': datetime.utcnow()}
+        self._put_memory(key, entry)
+        try:
+            await self.collection.replace_one(
+                {'_id': key},
+                {**entry, 'expires_at': entry['fetched_at'] + self.ttl + self.stale_ttl},
+                upsert=True
+            )
+        except Exception as e:
+            logging.error(f"Error writing search cache entry '{key}': {e}")
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if datetime.utcnow() - entry['fetched_at'] > self.ttl + self.stale_ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def _put_memory(self, key: str, entry: Dict[str, Any]):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def _get_mongo(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            doc = await self.collection.find_one({'_id': key})
+        except Exception as e:
+            logging.error(f"Error reading search cache entry '{key}': {e}")
+            return None
+        if doc is None:
+            return None
+        # Entries written before last_page was stored leave it unknown
+        return {'results': doc['results'], 'last_page': doc.get('last_page'), 'fetched_at': doc['fetched_at']}
+
+    def _schedule_refresh(self, key: str, fetch):
+        if key in self.refreshing:
+            return
+
+        async def refresh():
+            upstream_priority.set('background')
+            try:
+                results, last_page = await fetch()
+                await self.store(key, results, last_page)
+                self.stats['refreshes'] += 1
+            except Exception as e:
+                self.stats['refresh_errors'] += 1
+                logging.error(f"Error refreshing search cache entry '{key}': {e}")
+            finally:
+                self.refreshing.pop(key, None)
+
+        self.refreshing[key] = asyncio.create_task(refresh())
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats['memory_hits'] + self.stats['mongo_hits'] + self.stats['stale_hits']
+        lookups = hits + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self.entries),
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+class CareInfoStore:
+    """Persistent normalized care information per plant_id, keyed by a content hash"""
+
+    def __init__(self, collection, max_age_days: int):
+        self.collection = collection
+        self.max_age = timedelta(days=max_age_days)
+        self.stats = {'hits': 0, 'not_modified': 0, 'misses': 0, 'stale': 0}
+
+    @staticmethod
+    def content_etag(care_info: PlantCareInfo) -> str:
+        payload = json.dumps(care_info.dict(), sort_keys=True, ensure_ascii=False)
+        return '"' + hashlib.sha256(payload.encode()).hexdigest()[:32] + '"'
+
+    def is_fresh(self, doc: Dict[str, Any]) -> bool:
+        return datetime.utcnow() - doc['fetched_at'] <= self.max_age
+
+    async def get_etag(self, plant_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch only the ETag and fetch time, without the care body"""
+        return await self.collection.find_one(
+            {'plant_id': plant_id},
+            {'_id': 0, 'etag': 1, 'fetched_at': 1}
+        )
+
+    async def get(self, plant_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({'plant_id': plant_id}, {'_id': 0})
+
+    async def put(self, care_info: PlantCareInfo) -> str:
+        etag = self.content_etag(care_info)
+        await self.collection.update_one(
+            {'plant_id': care_info.plant_id},
+            {'$set': {'care': care_info.dict(), 'etag': etag, 'fetched_at': datetime.utcnow()}},
+            upsert=True
+        )
+        return etag
+
+    def get_stats(self) -> Dict[str, Any]:
+        served = self.stats['hits'] + self.stats['not_modified']
+        lookups = served + self.stats['misses']
+        return {**self.stats, 'hit_ratio': round(served / lookups, 4) if lookups else 0.0}
+
+care_info_store = CareInfoStore(db.care_info, CARE_INFO_MAX_AGE_DAYS)
+
+def hash_bands(phash: int) -> List[int]:
+    """Split a 64-bit hash into 8 tagged bytes for multi-index Hamming search.
+
+    Two hashes within Hamming distance 7 always share at least one byte in the
+    same position, so an indexed `$in` over the bands finds every candidate.
+    """
+    return [(band << 8) | ((phash >> (8 * band)) & 0xFF) for band in range(8)]
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+class IdentificationCache:
+    """Previous identification results indexed by the perceptual hash of the photo"""
+
+    def __init__(self, collection, max_distance: int):
+        self.collection = collection
+        self.max_distance = max_distance
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def to_int64(phash: int) -> int:
+        # MongoDB integers are signed 64-bit
+        return phash - (1 << 64) if phash >= (1 << 63) else phash
+
+    async def lookup(self, phash: int) -> Optional[PlantIdentification]:
+        """Closest cached identification within `max_distance` bits, if any.
+
+        Every entry sharing a band is a candidate and all of them are checked, only by
+        their hash; the body is read for the closest one.
+        """
+        best, best_distance = None, self.max_distance + 1
+        try:
+            async for doc in self.collection.find({'bands': {'$in': hash_bands(phash)}}, {'phash': 1}):
+                distance = hamming_distance(phash, doc['phash'] & 0xFFFFFFFFFFFFFFFF)
+                if distance < best_distance:
+                    best, best_distance = doc['_id'], distance
+                    if distance == 0:
+                        break
+            if best is not None:
+                best = await self.collection.find_one({'_id': best}, {'_id': 0, 'bands': 0})
+        except Exception as e:
+            logging.error(f"Error reading identification cache: {e}")
+            return None
+
+        if best is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return PlantIdentification(
+            suggestions=best['suggestions'],
+            confidence=best['confidence'],
+            identified_name=best['identified_name'],
+            cached=True
+        )
+
+    async def store(self, phash: int, identification: PlantIdentification):
+        try:
+            await self.collection.insert_one({
+                'phash': self.to_int64(phash),
+                'bands': hash_bands(phash),
+                'suggestions': identification.suggestions,
+                'confidence': identification.confidence,
+                'identified_name': identification.identified_name,
+                'created_at': datetime.utcnow()
+            })
+        except Exception as e:
+            logging.error(f"Error writing identification cache: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {**self.stats, 'hit_ratio': round(self.stats['hits'] / lookups, 4) if lookups else 0.0}
+
+identification_cache = IdentificationCache(db.identifications, IDENTIFY_CACHE_MAX_DISTANCE)
+
+# Local species catalog (mirrored from Perenual by sync_catalog.py)
+def normalize_species_name(name: str) -> str:
+    """Lowercase a species name and reduce it to letters, digits and single spaces"""
+    cleaned = ''.join(ch if ch.isalnum() else ' ' for ch in name.lower().replace('ё', 'е'))
+    return ' '.join(cleaned.split())
+
+def name_trigrams(name: str) -> List[str]:
+    """Split a name into padded character trigrams for fuzzy matching"""
+    trigrams = set()
+    for word in normalize_species_name(name).split():
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return sorted(trigrams)
+
+def species_names(plant: Dict[str, Any]) -> List[str]:
+    """All common, scientific and other names of a Perenual species"""
+    names = [plant.get('common_name') or '']
+    names.extend(plant.get('scientific_name') or [])
+    names.extend(plant.get('other_name') or [])
+    return [name for name in names if name]
+
+class SpeciesCatalog:
+    """Read side of the local `species` collection"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("id", unique=True)
+        await self.collection.create_index(
+            [("common_name", "text"), ("scientific_name", "text"), ("other_name", "text")],
+            name="species_names_text"
+        )
+        await self.collection.create_index("trigrams")
+        await self.collection.create_index("details_synced_at")
+
+    async def search(self, query: str, limit: int = 30) -> List[PlantSearchResult]:
+        """Find species by name: full-text match first, trigram similarity second"""
+        projection = {'_id': 0, 'details': 0, 'trigrams': 0}
+        docs = await self.collection.find(
+            {'$text': {'$search': query}},
+            {**projection, 'score': {'$meta': 'textScore'}}
+        ).sort([('score', {'$meta': 'textScore'})]).limit(limit).to_list(limit)
+
+        if not docs:
+            query_trigrams = name_trigrams(query)
+            if not query_trigrams:
+                return []
+            min_shared = max(1, int(len(query_trigrams) * CATALOG_MIN_SIMILARITY))
+            docs = await self.collection.aggregate([
+                {'$match': {'trigrams': {'$in': query_trigrams}}},
+                {'$addFields': {'shared': {'$size': {'$setIntersection': ['$trigrams', query_trigrams]}}}},
+                {'$match': {'shared': {'$gte': min_shared}}},
+                {'$sort': {'shared': -1, 'id': 1}},
+                {'$limit': limit},
+                {'$project': {**projection, 'shared': 0}}
+            ]).to_list(limit)
+
+        return [search_result_from_perenual(doc) for doc in docs]
+
+    async def get_care_info(self, plant_id: str) -> Optional[PlantCareInfo]:
+        """Care information from synced species details, if present"""
+        if not plant_id.isdigit():
+            return None
+        doc = await self.collection.find_one(
+            {'id': int(plant_id), 'details': {'$exists': True}},
+            {'_id': 0, 'details': 1}
+        )
+        if not doc or not doc['details'] or 'error' in doc['details']:
+            return None
+        return care_info_from_perenual(plant_id, doc['details'])
+
+species_catalog = SpeciesCatalog(db.species)
+
+# Query translation
+RUSSIAN_ENDINGS = sorted([
+    'иями', 'ями', 'ами', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими',
+    'ах', 'ях', 'ов', 'ев', 'ей', 'ий', 'ый', 'ой', 'ая', 'яя', 'ое', 'ее',
+    'ые', 'ие', 'ую', 'юю', 'ом', 'ем', 'ам', 'ям', 'ья', 'ье', 'ьи', 'ью',
+    'а', 'я', 'ы', 'и', 'у', 'ю', 'е', 'о', 'ь'
+], key=len, reverse=True)
+
+def normalize_russian_word(word: str) -> str:
+    """Reduce a Russian word to a crude stem so that simple inflections compare equal"""
+    word = word.replace('ё', 'е')
+    for ending in RUSSIAN_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= 3:
+            return word[:-len(ending)]
+    return word
+
+def tokenize_query(text: str) -> List[str]:
+    return [normalize_russian_word(word) for word in re.findall(r'[а-яё]+|[a-z0-9]+', text.lower())]
+
+def load_plant_translations(path: Path) -> Dict[str, str]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+class QueryTranslator:
+    """Longest-match phrase translator compiled into a token trie.
+
+    Dictionary phrases are stemmed word by word, so "фиалки узамбарские" and
+    "фиалка узамбарская" share a path. Lookup cost depends on the query length and
+    the longest phrase, not on the dictionary size.
+    """
+
+    _VALUE = ''  # Trie key holding a translation; never a valid token
+
+    def __init__(self, translations: Dict[str, str]):
+        self.root: Dict[str, Any] = {}
+        self.max_phrase_tokens = 0
+        phrases = {}
+        for russian, english in translations.items():
+            tokens = tokenize_query(russian)
+            if not tokens:
+                continue
+            node = self.root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(self._VALUE, english)
+            self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+            phrases.setdefault(' '.join(tokens), english)
+        # Sorted stemmed phrases for prefix completion of partially typed names
+        self.prefix_keys = sorted(phrases)
+        self.prefix_values = [phrases[key] for key in self.prefix_keys]
+
+    def translate(self, query: str) -> Optional[str]:
+        """Translation of the longest dictionary phrase in `query`, or None"""
+        tokens = tokenize_query(query)
+        best, best_length = None, 0
+        for start in range(len(tokens)):
+            node = self.root
+            for end in range(start, min(len(tokens), start + self.max_phrase_tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                length = end - start + 1
+                if self._VALUE in node and length > best_length:
+                    best, best_length = node[self._VALUE], length
+        if best is not None:
+            return best
+
+        # Fall back to completing a partially typed name ("орхид" -> "орхиде")
+        prefix = ' '.join(tokens)
+        if len(prefix) >= 3:
+            index = bisect.bisect_left(self.prefix_keys, prefix)
+            if index < len(self.prefix_keys) and self.prefix_keys[index].startswith(prefix):
+                return self.prefix_values[index]
+        return None
+
+# Typeahead suggestions
+def suggestion_keys(name: str) -> List[str]:
+    """Index keys of a name: the normalized name and its tail from each later word ("chinensis" for "Rosa chinensis")"""
+    words = normalize_species_name(name).split()
+    return [' '.join(words[index:]) for index in range(min(len(words), 3))]
+
+class PackedStrings:
+    """Strings stored back to back in one UTF-8 buffer with an offsets array.
+
+    Indexing returns the raw bytes; UTF-8 byte order matches code point order, so a sorted
+    PackedStrings can be searched with the bisect module directly.
+    """
+
+    def __init__(self, blob: bytes, offsets: array):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def pack(cls, strings: Iterable[str]) -> 'PackedStrings':
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = array('I', [0])
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        return cls(b''.join(encoded), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return self.blob[self.offsets[index]:self.offsets[index + 1]]
+
+    def text(self, index: int) -> str:
+        return self[index].decode('utf-8')
+
+def uint32_array(values) -> array:
+    """array('I') from a numpy array or any iterable of ints"""
+    if isinstance(values, np.ndarray):
+        packed = array('I')
+        packed.frombytes(values.astype(np.uint32).tobytes())
+        return packed
+    return array('I', values)
+
+class TypeaheadIndex:
+    """Prefix index over plant names, ranked by popularity.
+
+    Keys live in one sorted PackedStrings with a parallel array of record ids, so a prefix
+    is a bisected range. Every prefix whose range is longer than `scan_limit` has its top
+    records precomputed, so no lookup ranks more than `scan_limit` candidates. Records are
+    ranked once at build time: most popular, then shortest, then alphabetical.
+    """
+
+    def __init__(self, keys: PackedStrings, key_records: array, names: PackedStrings, plants: PackedStrings,
+                 plant_of: array, species_ids: PackedStrings, popularity: array, rank: array,
+                 top: Dict[str, List[int]]):
+        self.keys = keys
+        self.key_records = key_records
+        self.names = names
+        self.plants = plants
+        self.plant_of = plant_of
+        self.species_ids = species_ids
+        self.popularity = popularity
+        self.rank = rank
+        self.top = top
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, str, str, int]], top_k: int = SUGGEST_TOP_K,
+              scan_limit: int = SUGGEST_SCAN_LIMIT) -> 'TypeaheadIndex':
+        """Build from (name, plant, species id, popularity) entries. Names that normalize the
+        same are merged, keeping the highest popularity and any species id"""
+        records: Dict[str, int] = {}
+        plant_numbers: Dict[str, int] = {}
+        names, species_ids, plant_of, popularity = [], [], array('I'), array('I')
+        for name, plant, species_id, count in entries:
+            normalized = normalize_species_name(name)
+            if not normalized:
+                continue
+            record = records.get(normalized)
+            if record is None:
+                records[normalized] = len(names)
+                names.append(name)
+                species_ids.append(species_id or '')
+                plant_of.append(plant_numbers.setdefault(plant, len(plant_numbers)))
+                popularity.append(count)
+                continue
+            popularity[record] = max(popularity[record], count)
+            if species_id and not species_ids[record]:
+                species_ids[record] = species_id
+                plant_of[record] = plant_numbers.setdefault(plant, len(plant_numbers))
+        
+        order = sorted(range(len(names)), key=lambda record: (-popularity[record], len(names[record]), names[record]))
+        rank = array('I', bytes(4 * len(names)))
+        for position, record in enumerate(order):
+            rank[record] = position
+        
+        pairs = sorted((key, record) for normalized, record in records.items() for key in suggestion_keys(normalized))
+        keys = [key for key, _ in pairs]
+        key_records = array('I', [record for _, record in pairs])
+        top = cls._heavy_prefixes(keys, key_records, rank, top_k, scan_limit)
+        return cls(
+            PackedStrings.pack(keys), key_records, PackedStrings.pack(names), PackedStrings.pack(plant_numbers),
+            plant_of, PackedStrings.pack(species_ids), popularity, rank, top
+        )
+
+    @staticmethod
+    def _heavy_prefixes(keys: List[str], key_records: array, rank: array, top_k: int, scan_limit: int) -> Dict[str, List[int]]:
+        """Top records of every prefix matching more than `scan_limit` keys"""
+        top = {}
+        heavy = [(0, len(keys))]
+        length = 0
+        while heavy:
+            length += 1
+            next_heavy = []
+            for start, end in heavy:
+                while start < end:
+                    if len(keys[start]) < length:
+                        start += 1
+                        continue
+                    prefix = keys[start][:length]
+                    group_end = bisect.bisect_left(keys, prefix + '\uffff', start, end)
+                    if group_end - start > scan_limit:
+                        top[prefix] = heapq.nsmallest(top_k, set(key_records[start:group_end]), key=rank.__getitem__)
+                        next_heavy.append((start, group_end))
+                    start = group_end
+            heavy = next_heavy
+        return top
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_TOP_K) -> List[Dict[str, Any]]:
+        normalized = normalize_species_name(prefix)
+        if not normalized:
+            return []
+        records = self.top.get(normalized)
+        if records is None:
+            encoded = normalized.encode('utf-8')
+            start = bisect.bisect_left(self.keys, encoded)
+            # 0xFF never occurs in UTF-8, so this is the end of the keys starting with the prefix
+            end = bisect.bisect_left(self.keys, encoded + b'\xff', start)
+            records = heapq.nsmallest(limit, set(self.key_records[start:end]), key=self.rank.__getitem__)
+        return [
+            {
+                'name': self.names.text(record),
+                'plant': self.plants.text(self.plant_of[record]),
+                'species_id': self.species_ids.text(record) or None,
+                'popularity': self.popularity[record],
+            }
+            for record in records[:limit]
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        return {'names': len(self.names), 'keys': len(self.keys), 'precomputed_prefixes': len(self.top)}
+
+    def save(self, path: Path):
+        """Write the arrays to an .npz snapshot (no pickled objects), replacing `path` atomically"""
+        prefixes = list(self.top)
+        top_records = np.full((len(prefixes), max(map(len, self.top.values()), default=0)), -1, dtype=np.int64)
+        for row, prefix in enumerate(prefixes):
+            top_records[row, :len(self.top[prefix])] = self.top[prefix]
+        top_prefixes = PackedStrings.pack(prefixes)
+        arrays = {
+            'top_records': top_records,
+            'top_prefixes_blob': np.frombuffer(top_prefixes.blob, dtype=np.uint8),
+            'top_prefixes_offsets': np.array(top_prefixes.offsets, dtype=np.uint32),
+            'key_records': np.array(self.key_records, dtype=np.uint32),
+            'plant_of': np.array(self.plant_of, dtype=np.uint32),
+            'popularity': np.array(self.popularity, dtype=np.uint32),
+            'rank': np.array(self.rank, dtype=np.uint32),
+        }
+        for name in ('keys', 'names', 'plants', 'species_ids'):
+            packed = getattr(self, name)
+            arrays[f'{name}_blob'] = np.frombuffer(packed.blob, dtype=np.uint8)
+            arrays[f'{name}_offsets'] = np.array(packed.offsets, dtype=np.uint32)
+        temporary = path.with_name(path.name + '.tmp')
+        with open(temporary, 'wb') as f:
+            np.savez(f, **arrays)
+        temporary.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'TypeaheadIndex':
+        with np.load(path, allow_pickle=False) as snapshot:
+            def packed(name: str) -> PackedStrings:
+                return PackedStrings(snapshot[f'{name}_blob'].tobytes(), uint32_array(snapshot[f'{name}_offsets']))
+            
+            top_prefixes = packed('top_prefixes')
+            top = {
+                top_prefixes.text(row): [int(record) for record in records if record >= 0]
+                for row, records in enumerate(snapshot['top_records'])
+            }
+            return cls(
+                packed('keys'), uint32_array(snapshot['key_records']), packed('names'), packed('plants'),
+                uint32_array(snapshot['plant_of']), packed('species_ids'), uint32_array(snapshot['popularity']),
+                uint32_array(snapshot['rank']), top
+            )
+
+def translation_suggestions(translations: Dict[str, str]) -> List[Tuple[str, str, str, int]]:
+    """Russian names and their English translations as typeahead entries"""
+    entries = []
+    for russian, english in translations.items():
+        entries.append((russian, english, '', 0))
+        entries.append((english, english, '', 0))
+    return entries
+
+def load_typeahead_index(path: Path, translations: Dict[str, str]) -> TypeaheadIndex:
+    """The snapshot written by build_suggest_index.py, or the translation table alone without one"""
+    if path.exists():
+        try:
+            return TypeaheadIndex.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Could not load typeahead snapshot {path}: {e}")
+    return TypeaheadIndex.build(translation_suggestions(translations))
+
+# Image preprocessing
+def difference_hash(image: Image.Image) -> int:
+    """64-bit dHash: brightness gradients of a 9x8 grayscale thumbnail"""
+    pixels = list(image.resize((9, 8), Image.BOX).convert('L').getdata())
+    phash = 0
+    for row in range(8):
+        for col in range(8):
+            phash = (phash << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return phash
+
+def preprocess_image(image_data: bytes, max_side: int, quality: int) -> Tuple[bytes, int, Dict[str, float]]:
+    """Decode, orient, downscale and re-encode an upload as a metadata-free JPEG.
+
+    Also returns the perceptual hash of the oriented image.
+
+    Runs in the image process pool, so it must stay a picklable top-level function.
+    """
+    timings = {}
+    started = time.perf_counter()
+
+    def lap(stage: str):
+        nonlocal started
+        now = time.perf_counter()
+        timings[stage] = round((now - started) * 1000, 2)
+        started = now
+
+    image = Image.open(io.BytesIO(image_data))
+    if image.format == 'JPEG':
+        # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 instead of decoding full size
+        image.draft('RGB', (max_side, max_side))
+    image.load()
+    lap('decode')
+
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    lap('resize')
+
+    # Apply the EXIF orientation, since the EXIF block itself is not re-encoded
+    image = ImageOps.exif_transpose(image)
+    lap('orient')
+
+    phash = difference_hash(image)
+    lap('hash')
+
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=quality)
+    lap('encode')
+    return output.getvalue(), phash, timings
+
+image_pool: Optional[ProcessPoolExecutor] = None
+# Bounds the uploads held in memory while waiting for a pool worker
+image_pool_slots = asyncio.Semaphore(IMAGE_WORKERS * 2)
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global image_pool
+    if image_pool is None:
+        image_pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return image_pool
+
+async def read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """Read an upload chunk by chunk, rejecting it as soon as it exceeds `max_bytes`"""
+    chunks = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Image must be at most {max_bytes // (1024 * 1024)} MB")
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+async def prepare_identification_image(file: UploadFile, timings: Dict[str, float]) -> Tuple[bytes, int]:
+    """Read an uploaded image and preprocess it off the event loop for identification.
+
+    Returns the re-encoded JPEG and its perceptual hash.
+    """
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    
+    started = time.perf_counter()
+    image_data = await read_upload(file, IDENTIFY_MAX_UPLOAD_BYTES)
+    timings['read'] = round((time.perf_counter() - started) * 1000, 2)
+    
+    started = time.perf_counter()
+    async with image_pool_slots:
+        timings['queue'] = round((time.perf_counter() - started) * 1000, 2)
+        try:
+            image_data, phash, stage_timings = await asyncio.get_running_loop().run_in_executor(
+                get_image_pool(),
+                preprocess_image,
+                image_data,
+                IDENTIFY_MAX_IMAGE_SIDE,
+                IDENTIFY_JPEG_QUALITY
+            )
+        except Exception as e:
+            logging.error(f"Error preprocessing image: {e}")
+            raise HTTPException(status_code=400, detail="Invalid image file")
+    timings.update(stage_timings)
+    return image_data, phash
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    return ', '.join(f"{stage};dur={duration}" for stage, duration in timings.items())
+
+# Upstream resilience
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single probe through once `open_seconds` pass"""
+
+    def __init__(self, failure_threshold: int, open_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == 'closed':
+            return True
+        if self.state == 'open' and time.monotonic() - self.opened_at >= self.open_seconds:
+            self.state = 'half_open'
+            self.probe_in_flight = False
+        if self.state == 'half_open' and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = 'closed'
+        self.failures = 0
+        self.probe_in_flight = False
+
+    def release_probe(self):
+        """Let another probe through when the current one was cancelled before it finished"""
+        self.probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            if self.state != 'open':
+                logging.warning(f"Circuit breaker opened after {self.failures} failures")
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+            self.probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = {'state': self.state, 'consecutive_failures': self.failures}
+        if self.state == 'open':
+            snapshot['retry_in_seconds'] = round(max(0.0, self.opened_at + self.open_seconds - time.monotonic()), 1)
+        return snapshot
+
+class RetryBudget:
+    """Caps retries to a fraction of requests: every request deposits `ratio` tokens, a retry spends one"""
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+class LatencyWindow:
+    """Recent successful call latencies, used to pick the hedging delay"""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class UpstreamProvider:
+    """Per-provider timeouts, circuit breaker, retry budget and latency window"""
+
+    def __init__(self, name: str, label: str, timeout: aiohttp.ClientTimeout):
+        self.name = name
+        self.label = label
+        self.timeout = timeout
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_OPEN_SECONDS)
+        self.retry_budget = RetryBudget(RETRY_BUDGET_RATIO, RETRY_BUDGET_MAX_TOKENS)
+        self.latencies = LatencyWindow()
+        self.hedge = name in HEDGE_PROVIDERS
+        self.stats = {'requests': 0, 'failures': 0, 'retries': 0, 'hedges': 0, 'rejected': 0}
+
+    def snapshot(self) -> Dict[str, Any]:
+        p95 = self.latencies.percentile(0.95)
+        return {
+            **self.breaker.snapshot(),
+            **self.stats,
+            'retry_tokens': round(self.retry_budget.tokens, 2),
+            'hedging': self.hedge,
+            'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+QUOTA_PERIODS = {'minute': 60, 'hour': 3600, 'day': 24 * 3600}
+
+# Calls made while serving a user wait briefly for quota; background work (cache refreshes,
+# prefetches, hedges, catalog sync) only uses what is left above the interactive reserve
+upstream_priority = contextvars.ContextVar('upstream_priority', default='interactive')
+
+upstream_quota_admitted = metrics.counter(
+    'plauntie_upstream_quota_admitted_total', "Upstream calls admitted by the quota", ('provider', 'priority'))
+upstream_quota_shed = metrics.counter(
+    'plauntie_upstream_quota_shed_total', "Upstream calls refused by the quota", ('provider', 'priority'))
+
+def parse_quota(spec: str) -> List[Tuple[int, int]]:
+    """Parse "100/day,10/minute" into (requests, period seconds) pairs"""
+    limits = []
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        requests, _, period = part.strip().partition('/')
+        limits.append((int(requests), QUOTA_PERIODS[period.strip()]))
+    return limits
+
+class QuotaBucket:
+    """A token bucket kept in one MongoDB document and refilled and spent in one atomic update"""
+
+    def __init__(self, collection, bucket_id: str, capacity: int, period_seconds: int):
+        self.collection = collection
+        self.bucket_id = bucket_id
+        self.capacity = float(capacity)
+        self.period_seconds = period_seconds
+        self.rate = capacity / period_seconds
+
+    def refilled(self, now: datetime):
+        """Tokens as of `now`; clock skew between workers never refills backwards"""
+        elapsed = {'$max': [0, {'$subtract': [now, {'$ifNull': ['$updated_at', now]}]}]}
+        return {'$min': [self.capacity, {'$add': [
+            {'$ifNull': ['$tokens', self.capacity]},
+            {'$multiply': [{'$divide': [elapsed, 1000]}, self.rate]},
+        ]}]}
+
+    async def take(self, floor: float) -> Tuple[bool, float]:
+        """Spend a token if more than `floor` remain; returns whether it was granted and the tokens left"""
+        now = datetime.utcnow()
+        doc = await self.collection.find_one_and_update(
+            {'_id': self.bucket_id},
+            [
+                {'$set': {'tokens': self.refilled(now), 'updated_at': {'$max': [{'$ifNull': ['$updated_at', now]}, now]}}},
+                {'$set': {'granted': {'$gte': ['$tokens', floor + 1]}}},
+                {'$set': {'tokens': {'$cond': ['$granted', {'$subtract': ['$tokens', 1]}, '$tokens']}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc['granted'], doc['tokens']
+
+    async def refund(self):
+        await self.collection.update_one(
+            {'_id': self.bucket_id}, [{'$set': {'tokens': {'$min': [self.capacity, {'$add': ['$tokens', 1]}]}}}]
+        )
+
+    async def drain(self):
+        await self.collection.update_one(
+            {'_id': self.bucket_id}, {'$set': {'tokens': 0.0, 'updated_at': datetime.utcnow()}}, upsert=True
+        )
+
+    async def remaining(self) -> float:
+        doc = await self.collection.find_one({'_id': self.bucket_id})
+        if doc is None:
+            return self.capacity
+        elapsed = max(0.0, (datetime.utcnow() - doc['updated_at']).total_seconds())
+        return min(self.capacity, doc['tokens'] + elapsed * self.rate)
+
+class UpstreamQuota:
+    """Admission control for one provider's API key, shared by all workers.
+
+    A call takes a token from every bucket (e.g. per minute and per day). When a bucket is
+    empty the caller waits for the refill if that fits its priority's deadline, otherwise it
+    is refused at once with QuotaExhausted. Background calls may not dip into the reserve,
+    and in this worker they also wait while interactive calls are queued.
+    """
+
+    def __init__(self, name: str, collection, spec: str, api_key: Optional[str]):
+        self.name = name
+        key_id = hashlib.sha256((api_key or '').encode()).hexdigest()[:12]
+        self.buckets = [
+            QuotaBucket(collection, f"{name}:{key_id}:{requests}/{period}", requests, period)
+            for requests, period in parse_quota(spec)
+        ]
+        self.waiting = {'interactive': 0, 'background': 0}
+
+    async def acquire(self, priority: str):
+        if not self.buckets:
+            return
+        deadline = time.monotonic() + (QUOTA_INTERACTIVE_WAIT_SECONDS if priority == 'interactive' else QUOTA_BACKGROUND_WAIT_SECONDS)
+        while True:
+            if priority == 'background' and self.waiting['interactive']:
+                wait = 0.1
+            else:
+                wait = await self._try_take(priority)
+                if not wait:
+                    upstream_quota_admitted.inc(self.name, priority)
+                    return
+            if time.monotonic() + wait > deadline:
+                upstream_quota_shed.inc(self.name, priority)
+                raise QuotaExhausted(f"{self.name} quota exhausted for {priority} calls", retry_after=wait)
+            self.waiting[priority] += 1
+            try:
+                # Jitter spreads out workers waking for the same refill
+                await asyncio.sleep(wait * random.uniform(1.0, 1.2))
+            finally:
+                self.waiting[priority] -= 1
+
+    async def _try_take(self, priority: str) -> float:
+        """Take a token from every bucket; returns 0, or the seconds until the short bucket refills"""
+        taken = []
+        for bucket in self.buckets:
+            floor = bucket.capacity * QUOTA_RESERVE_FRACTION if priority == 'background' else 0.0
+            granted, tokens = await bucket.take(floor)
+            if not granted:
+                for spent in taken:
+                    await spent.refund()
+                return (floor + 1 - tokens) / bucket.rate
+            taken.append(bucket)
+        return 0.0
+
+    async def on_rate_limited(self):
+        """The vendor answered 429: empty the shortest bucket so no worker calls again until it refills"""
+        if self.buckets:
+            await min(self.buckets, key=lambda bucket: bucket.period_seconds).drain()
+
+    async def snapshot(self) -> Dict[str, Any]:
+        limits = []
+        for bucket in self.buckets:
+            remaining = await bucket.remaining()
+            limits.append({
+                'limit': int(bucket.capacity),
+                'period_seconds': bucket.period_seconds,
+                'remaining': int(remaining),
+                'interactive_reserve': int(bucket.capacity * QUOTA_RESERVE_FRACTION),
+                'full_in_seconds': round((bucket.capacity - remaining) / bucket.rate),
+            })
+        return {'limits': limits, 'waiting': dict(self.waiting)}
+
+def is_retryable(error: Exception) -> bool:
+    """Timeouts, connection errors and 5xx responses may succeed on another attempt"""
+    if isinstance(error, UpstreamError):
+        return error.status is not None and error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+def counts_as_failure(error: Exception) -> bool:
+    """Errors that indicate an unhealthy upstream rather than a bad request"""
+    if isinstance(error, QuotaExhausted):
+        return False
+    if isinstance(error, UpstreamError):
+        return error.status is None or error.status >= 500 or error.status == 429
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
 # Plant API Integration Services
+class UpstreamPoolStats:
+    """Connection pool counters collected through aiohttp trace hooks"""
+
+    def __init__(self):
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0
+        self.queue_wait_ms_total = 0.0
+        self.queue_wait_ms_max = 0.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_queued_start(session, context, params):
+            context.queued_at = time.perf_counter()
+
+        async def on_queued_end(session, context, params):
+            waited = (time.perf_counter() - context.queued_at) * 1000
+            self.queued += 1
+            self.queue_wait_ms_total += waited
+            self.queue_wait_ms_max = max(self.queue_wait_ms_max, waited)
+
+        async def on_create_end(session, context, params):
+            self.connections_created += 1
+
+        async def on_reuse(session, context, params):
+            self.connections_reused += 1
+
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_end.append(on_create_end)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
 class PlantAPIService:
     def __init__(self):
         self.session = None
-        # Russian to English plant name translations
-        self.plant_translations = {
-            'роза': 'rose',
-            'розы': 'rose',
-            'фиалка': 'violet',
-            'фиалки': 'violet',
-            'кактус': 'cactus',
-            'кактусы': 'cactus',
-            'фикус': 'ficus',
-            'фикусы': 'ficus',
-            'орхидея': 'orchid',
-            'орхидеи': 'orchid',
-            'тюльпан': 'tulip',
-            'тюльпаны': 'tulip',
-            'лилия': 'lily',
-            'лилии': 'lily',
-            'ромашка': 'daisy',
-            'ромашки': 'daisy',
-            'подсолнух': 'sunflower',
-            'подсолнухи': 'sunflower',
-            'пион': 'peony',
-            'пионы': 'peony',
-            'лаванда': 'lavender',
-            'мята': 'mint',
-            'базилик': 'basil',
-            'петрушка': 'parsley',
-            'укроп': 'dill',
-            'алоэ': 'aloe',
-            'каланхоэ': 'kalanchoe',
-            'герань': 'geranium',
-            'бегония': 'begonia',
-            'драцена': 'dracaena',
-            'пальма': 'palm',
-            'плющ': 'ivy',
-            'папоротник': 'fern',
-            'мох': 'moss',
-            'суккулент': 'succulent',
-            'суккуленты': 'succulent',
-            'денежное дерево': 'jade plant',
-            'фиалка узамбарская': 'african violet',
-            'комнатная роза': 'indoor rose',
-            'цветок': 'flower',
-            'цветы': 'flower',
-            'растение': 'plant',
-            'растения': 'plant',
-            'трава': 'grass',
-            'дерево': 'tree',
-            'куст': 'bush'
+        self.session_pid = None
+        self.pool_stats = UpstreamPoolStats()
+        self.providers = {
+            'perenual': UpstreamProvider('perenual', 'Perenual', UPSTREAM_TIMEOUTS['perenual']),
+            'plantnet': UpstreamProvider('plantnet', 'PlantNet', UPSTREAM_TIMEOUTS['plantnet']),
+            'kindwise': UpstreamProvider('kindwise', 'Kindwise', UPSTREAM_TIMEOUTS['kindwise']),
         }
+        api_keys = {'perenual': PERENUAL_API_KEY, 'plantnet': PLANTNET_API_KEY, 'kindwise': KINDWISE_API_KEY}
+        self.quotas = {
+            name: UpstreamQuota(name, db.upstream_quotas, UPSTREAM_QUOTAS[name], api_keys[name])
+            for name in self.providers
+        }
+        # Image identification backends, in preference order; a provider without an API key is skipped
+        identifiers = {
+            'plantnet': (PLANTNET_API_KEY, self.identify_plant_plantnet),
+            'kindwise': (KINDWISE_API_KEY, self.identify_plant_kindwise),
+        }
+        self.identifiers = {
+            name: identifiers[name][1] for name in IDENTIFY_PROVIDERS
+            if name in identifiers and identifiers[name][0]
+        } or {'plantnet': self.identify_plant_plantnet}
+        self.inflight: Dict[Any, asyncio.Task] = {}
+        # Callers currently awaiting each in-flight task
+        self.flight_waiters: Dict[asyncio.Task, int] = {}
+        self.search_cache = SearchCache(
+            db.search_cache,
+            SEARCH_CACHE_TTL_SECONDS,
+            SEARCH_CACHE_STALE_SECONDS,
+            SEARCH_CACHE_MAX_ENTRIES
+        )
+        # Russian to English plant name translations
+        self.plant_translations = load_plant_translations(PLANT_TRANSLATIONS_PATH)
+        self.translator = QueryTranslator(self.plant_translations)
     
     def translate_query(self, query: str) -> str:
         """Translate Russian plant names to English"""
-        query_lower = query.lower().strip()
-        
-        # Direct translation
-        if query_lower in self.plant_translations:
-            return self.plant_translations[query_lower]
-        
-        # Partial match
-        for russian, english in self.plant_translations.items():
-            if russian in query_lower or query_lower in russian:
-                return english
-        
-        return query  # Return original if no translation found
+        return self.translator.translate(query) or query  # Return original if no translation found
+    
+    async def _single_flight(self, key, fetch, cancel_when_abandoned: bool = False):
+        """Run `fetch()` once for all concurrent callers sharing the same key.
+
+        The shared call runs in its own task, so a caller being cancelled only
+        stops that caller waiting; the other callers still receive the result
+        (or the exception) of the single upstream request. With
+        `cancel_when_abandoned`, the call is cancelled once every caller has.
+        """
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self.inflight[key] = task
+            self.flight_waiters[task] = 0
+            task.add_done_callback(lambda done: self._end_flight(key, done))
+        self.flight_waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if cancel_when_abandoned and self.flight_waiters.get(task) == 1:
+                task.cancel()
+            raise
+        finally:
+            if task in self.flight_waiters:
+                self.flight_waiters[task] -= 1
+
+    def _end_flight(self, key, task: asyncio.Task):
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        self.flight_waiters.pop(task, None)
+        # Mark the exception as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    async def start_session(self):
+        """Create the pooled upstream session for this process.
+
+        Called at startup in every worker. A session inherited through fork
+        (pid mismatch) is never reused, since its sockets belong to the parent.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=UPSTREAM_TIMEOUTS['perenual'],
+            trace_configs=[self.pool_stats.trace_config()]
+        )
+        self.session_pid = os.getpid()
+        return self.session
     
     async def get_session(self):
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        if self.session is None or self.session.closed or self.session_pid != os.getpid():
+            await self.start_session()
         return self.session
     
     async def close_session(self):
-        if self.session:
+        if self.session and self.session_pid == os.getpid():
             await self.session.close()
+        self.session = None
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        stats = {
+            'pid': os.getpid(),
+            'open': False,
+            'connections_created': self.pool_stats.connections_created,
+            'connections_reused': self.pool_stats.connections_reused,
+            'queued_requests': self.pool_stats.queued,
+            'queue_wait_ms_avg': round(self.pool_stats.queue_wait_ms_total / self.pool_stats.queued, 2) if self.pool_stats.queued else 0.0,
+            'queue_wait_ms_max': round(self.pool_stats.queue_wait_ms_max, 2),
+        }
+        if self.session is None or self.session.closed:
+            return stats
+        
+        connector = self.session.connector
+        # aiohttp exposes no public pool introspection; these attributes are stable since 3.x
+        idle = getattr(connector, '_conns', {})
+        acquired_per_host = getattr(connector, '_acquired_per_host', {})
+        waiters = getattr(connector, '_waiters', {})
+        stats.update({
+            'open': True,
+            'limit': connector.limit,
+            'limit_per_host': connector.limit_per_host,
+            'in_use': len(getattr(connector, '_acquired', ())),
+            'idle': sum(len(conns) for conns in idle.values()),
+            'waiting': sum(len(queue) for queue in waiters.values()),
+            'hosts': {
+                f"{key.host}:{key.port}": {
+                    'in_use': len(acquired_per_host.get(key, ())),
+                    'idle': len(idle.get(key, ()))
+                }
+                for key in set(idle) | set(acquired_per_host)
+            }
+        })
+        return stats
 
-    async def search_plants_perenual(self, query: str) -> List[PlantSearchResult]:
-        """Search plants using Perenual API"""
+    async def _request(self, provider_name: str, method: str, url: str, *, params=None, data_factory=None, headers=None) -> Any:
+        """Call an upstream through its circuit breaker, retry budget and (for GETs) hedging.
+
+        Returns the decoded JSON body of a 2xx response and raises UpstreamError otherwise.
+        `data_factory` builds a fresh request body for every attempt.
+        """
+        provider = self.providers[provider_name]
+        if not provider.breaker.allow_request():
+            provider.stats['rejected'] += 1
+            raise UpstreamUnavailable(f"{provider.label} circuit breaker is open")
+        
+        provider.stats['requests'] += 1
+        provider.retry_budget.deposit()
+        upstream_time = request_upstream_time.get()
+        started = time.perf_counter()
+        try:
+            return await self._attempt(provider, method, url, params, data_factory, headers)
+        finally:
+            if upstream_time is not None:
+                upstream_time[0] += time.perf_counter() - started
+
+    async def _attempt(self, provider: UpstreamProvider, method: str, url: str, params, data_factory, headers) -> Any:
+        """Send a request, retrying retryable failures while the breaker and retry budget allow"""
+        attempt = 1
+        while True:
+            try:
+                if provider.hedge and method == 'GET':
+                    result = await self._hedged_send(provider, method, url, params, data_factory, headers)
+                else:
+                    result = await self._send(provider, method, url, params, data_factory, headers)
+                provider.breaker.record_success()
+                return result
+            except (asyncio.CancelledError, QuotaExhausted):
+                # e.g. a slower identification provider losing a race; neither reached the upstream
+                provider.breaker.release_probe()
+                raise
+            except Exception as e:
+                if counts_as_failure(e):
+                    provider.stats['failures'] += 1
+                    provider.breaker.record_failure()
+                else:
+                    provider.breaker.record_success()
+                
+                if (not is_retryable(e) or attempt >= RETRY_MAX_ATTEMPTS
+                        or provider.breaker.state != 'closed' or not provider.retry_budget.withdraw()):
+                    raise
+            
+            provider.stats['retries'] += 1
+            # Full jitter: uniform in [0, base * 2^attempt)
+            await asyncio.sleep(random.uniform(0, RETRY_BASE_DELAY_SECONDS * 2 ** attempt))
+            attempt += 1
+
+    async def _send(self, provider: UpstreamProvider, method: str, url: str, params, data_factory, headers=None,
+                    priority: Optional[str] = None) -> Any:
+        await self.quotas[provider.name].acquire(priority or upstream_priority.get())
         session = await self.get_session()
+        data = data_factory() if data_factory else None
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            async with session.request(method, url, params=params, data=data, headers=headers, timeout=provider.timeout) as response:
+                status = str(response.status)
+                if response.status == 429:
+                    await self.quotas[provider.name].on_rate_limited()
+                if not 200 <= response.status < 300:
+                    raise UpstreamError(f"{provider.label} API returned status {response.status}", response.status)
+                result = await response.json()
+        except asyncio.TimeoutError:
+            status = 'timeout'
+            raise
+        except asyncio.CancelledError:
+            status = 'cancelled'
+            raise
+        finally:
+            upstream_call_seconds.observe(time.perf_counter() - started, provider.name, status)
+        provider.latencies.record(time.perf_counter() - started)
+        return result
+
+    async def _hedged_send(self, provider: UpstreamProvider, method: str, url: str, params, data_factory, headers=None) -> Any:
+        """Send a second copy of a slow request once it exceeds the provider's p95 latency"""
+        delay = provider.latencies.percentile(0.95)
+        if delay is None:
+            return await self._send(provider, method, url, params, data_factory, headers)
         
+        pending = {asyncio.create_task(self._send(provider, method, url, params, data_factory, headers))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                provider.stats['hedges'] += 1
+                # The copy is speculative, so it only spends quota that background work could
+                pending.add(asyncio.create_task(self._send(provider, method, url, params, data_factory, headers, 'background')))
+            error = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_breaker_states(self) -> Dict[str, Any]:
+        return {name: provider.snapshot() for name, provider in self.providers.items()}
+
+    async def get_quota_states(self) -> Dict[str, Any]:
+        return {name: await quota.snapshot() for name, quota in self.quotas.items()}
+
+    async def search_plants_perenual(self, query: str) -> List[PlantSearchResult]:
+        """Search plants using Perenual API, served through the search cache"""
         # Translate Russian to English if needed
         translated_query = self.translate_query(query)
         logging.info(f"Original query: '{query}' -> Translated: '{translated_query}'")
         
-        url = f"https://perenual.com/api/species-list"
-        params = {
-            'key': PERENUAL_API_KEY,
-            'q': translated_query,
-            'page': 1
-        }
-        
         try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    results = []
-                    
-                    for plant in data.get('data', []):
-                        result = PlantSearchResult(
-                            id=str(plant.get('id', '')),
-                            name=plant.get('common_name', ''),
-                            scientific_name=plant.get('scientific_name', [''])[0] if plant.get('scientific_name') else '',
-                            common_names=plant.get('other_name', []),
-                            image_url=plant.get('default_image', {}).get('medium_url') if plant.get('default_image') else None,
-                            description=plant.get('description', ''),
-                            care_level=plant.get('care_level', '')
-                        )
-                        results.append(result)
-                    
-                    logging.info(f"Found {len(results)} plants for query '{translated_query}'")
-                    return results
-                else:
-                    logging.error(f"Perenual API returned status {response.status}")
+            results, _ = await self.search_cache.get_or_fetch(
+                normalize_search_key(translated_query),
+                lambda: self._single_flight(
+                    ('search', normalize_search_key(translated_query)),
+                    lambda: self._fetch_search_perenual(translated_query)
+                )
+            )
+            return [PlantSearchResult(**result) for result in results]
+        except QuotaExhausted:
+            raise
         except Exception as e:
             logging.error(f"Error searching Perenual: {e}")
         
         return []
 
+    async def _fetch_search_perenual(self, translated_query: str, page: int = 1) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Fetch one page of Perenual search results and the reported last page, raising on upstream errors"""
+        data = await self.fetch_species_page(page, query=translated_query)
+        results = [search_result_from_perenual(plant).dict() for plant in data.get('data', [])]
+        
+        logging.info(f"Found {len(results)} plants for query '{translated_query}' (page {page})")
+        return results, data.get('last_page')
+
+    async def stream_search_perenual(self, query: str, max_pages: int):
+        """Yield search events page by page: ('result', dict), ('error', dict) and finally ('end', dict).
+
+        Every page goes through the search cache, page 1 under the same key as plain search.
+        Once a page reports Perenual's `last_page`, up to SEARCH_STREAM_PREFETCH later pages
+        within it are fetched concurrently while earlier ones are being sent; until then pages
+        are fetched one at a time. Species already sent on an earlier page are skipped.
+        Closing the generator (e.g. on client disconnect) cancels prefetches that no other
+        request is waiting for.
+        """
+        translated_query = self.translate_query(query)
+        key = normalize_search_key(translated_query)
+        seen = set()
+        sent = 0
+        fetched = 0
+        last_page = None
+        pages: Dict[int, asyncio.Task] = {}
+        
+        async def fetch_page(page: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+            page_key = key if page == 1 else f"{key}\npage {page}"
+            if page > 1:
+                # Later pages are prefetched ahead of the reader
+                upstream_priority.set('background')
+            return await self.search_cache.get_or_fetch(
+                page_key,
+                lambda: self._single_flight(
+                    ('search', key, page), lambda: self._fetch_search_perenual(translated_query, page),
+                    cancel_when_abandoned=page > 1
+                )
+            )
+        
+        try:
+            page = 1
+            while page <= min(max_pages, last_page or max_pages):
+                ahead_until = min(page + SEARCH_STREAM_PREFETCH, max_pages, last_page) if last_page else page
+                for ahead in range(page, ahead_until + 1):
+                    if ahead not in pages:
+                        pages[ahead] = asyncio.create_task(fetch_page(ahead))
+                try:
+                    results, reported_last_page = await pages.pop(page)
+                except Exception as e:
+                    logging.error(f"Error streaming search page {page}: {e}")
+                    yield 'error', {'page': page, 'message': 'Search provider unavailable'}
+                    break
+                fetched += 1
+                if reported_last_page:
+                    last_page = reported_last_page
+                if not results:
+                    break
+                for result in results:
+                    if result['id'] in seen:
+                        continue
+                    seen.add(result['id'])
+                    sent += 1
+                    yield 'result', result
+                page += 1
+            yield 'end', {'results': sent, 'pages': fetched, 'last_page': last_page}
+        finally:
+            for task in pages.values():
+                task.cancel()
+
+    async def fetch_species_page(self, page: int, query: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch one raw page of the Perenual species list"""
+        params = {
+            'key': PERENUAL_API_KEY,
+            'page': page
+        }
+        if query is not None:
+            params['q'] = query
+        return await self._request('perenual', 'GET', f"{PERENUAL_BASE_URL}/species-list", params=params)
+
+    async def fetch_species_details(self, plant_id: str) -> Dict[str, Any]:
+        """Fetch raw Perenual species details"""
+        params = {'key': PERENUAL_API_KEY}
+        return await self._request('perenual', 'GET', f"{PERENUAL_BASE_URL}/species/details/{plant_id}", params=params)
+
     async def get_plant_care_info_perenual(self, plant_id: str) -> Optional[PlantCareInfo]:
         """Get detailed care information from Perenual API"""
-        session = await self.get_session()
-        url = f"https://perenual.com/api/species/details/{plant_id}"
-        params = {'key': PERENUAL_API_KEY}
-        
         try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Check if data is valid
-                    if not data or 'error' in data:
-                        logging.error(f"Invalid data from Perenual API: {data}")
-                        return None
-                    
-                    care_info = PlantCareInfo(
-                        plant_id=plant_id,
-                        name=data.get('common_name', 'Unknown'),
-                        scientific_name=data.get('scientific_name', ['Unknown'])[0] if data.get('scientific_name') else 'Unknown',
-                        watering=data.get('watering', 'Информация недоступна'),
-                        sunlight=data.get('sunlight', ['Информация недоступна'])[0] if data.get('sunlight') else 'Информация недоступна',
-                        temperature=f"{data.get('hardiness', {}).get('min', 'N/A')} - {data.get('hardiness', {}).get('max', 'N/A')}°C" if data.get('hardiness') else 'Информация недоступна',
-                        humidity=data.get('humidity', 'Информация недоступна'),
-                        fertilizer=data.get('fertilizer', 'Информация недоступна'),
-                        repotting=data.get('repotting', 'Информация недоступна'),
-                        common_problems=data.get('problem', []),
-                        care_tips=data.get('care_guides', [])
-                    )
-                    
-                    return care_info
-                else:
-                    logging.error(f"Perenual API returned status {response.status}")
+            return await self._single_flight(
+                ('care', plant_id),
+                lambda: self._fetch_care_info_perenual(plant_id)
+            )
         except Exception as e:
             logging.error(f"Error getting care info from Perenual: {e}")
         
         return None
 
-    async def identify_plant_plantnet(self, image_data: bytes) -> PlantIdentification:
-        """Identify plant using PlantNet API"""
-        session = await self.get_session()
-        url = "https://my-api.plantnet.org/v2/identify/weurope"
+    async def _fetch_care_info_perenual(self, plant_id: str) -> Optional[PlantCareInfo]:
+        """Fetch species details from Perenual, raising on upstream errors"""
+        data = await self.fetch_species_details(plant_id)
         
-        # Prepare the image data
-        image_b64 = base64.b64encode(image_data).decode()
+        # Check if data is valid
+        if not data or 'error' in data:
+            logging.error(f"Invalid data from Perenual API: {data}")
+            return None
         
-        data = aiohttp.FormData()
-        data.add_field('images', image_data, filename='plant.jpg', content_type='image/jpeg')
-        data.add_field('modifiers', '["crops","isolated"]')
-        data.add_field('plant-details', '["common_names"]')
-        data.add_field('api-key', PLANTNET_API_KEY)
+        return care_info_from_perenual(plant_id, data)
+
+    async def identify_plant_plantnet(self, images: List[bytes], organs: Optional[List[str]] = None) -> PlantIdentification:
+        """Identify plant using PlantNet API.
+
+        Several photos of the same plant (one per organ) are sent as one multi-image query.
+        """
+        url = f"{PLANTNET_BASE_URL}/identify/weurope"
+        
+        def build_form() -> aiohttp.FormData:
+            data = aiohttp.FormData()
+            for index, image_data in enumerate(images):
+                data.add_field('images', image_data, filename=f'plant{index}.jpg', content_type='image/jpeg')
+            for organ in organs or []:
+                data.add_field('organs', organ)
+            data.add_field('modifiers', '["crops","isolated"]')
+            data.add_field('plant-details', '["common_names"]')
+            data.add_field('api-key', PLANTNET_API_KEY)
+            return data
         
         try:
-            async with session.post(url, data=data) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    
-                    suggestions = []
-                    max_score = 0
-                    identified_name = None
-                    
-                    for species in result.get('results', []):
-                        score = species.get('score', 0)
-                        if score > max_score:
-                            max_score = score
-                            identified_name = species.get('species', {}).get('scientificNameWithoutAuthor', '')
-                        
-                        suggestions.append({
-                            'name': species.get('species', {}).get('scientificNameWithoutAuthor', ''),
-                            'common_names': [name.get('value', '') for name in species.get('species', {}).get('commonNames', [])],
-                            'confidence': score,
-                            'family': species.get('species', {}).get('family', {}).get('scientificNameWithoutAuthor', '')
-                        })
-                    
-                    return PlantIdentification(
-                        suggestions=suggestions,
-                        confidence=max_score,
-                        identified_name=identified_name
-                    )
+            result = await self._request('plantnet', 'POST', url, data_factory=build_form)
+            return identification_from_plantnet(result)
         except Exception as e:
             logging.error(f"Error identifying plant with PlantNet: {e}")
         
         return PlantIdentification()
 
+    async def identify_plant_kindwise(self, images: List[bytes], organs: Optional[List[str]] = None) -> PlantIdentification:
+        """Identify plant using the Kindwise plant.id API (organs are not used by this API)"""
+        url = f"{KINDWISE_BASE_URL}/identification"
+        body = json.dumps({
+            'images': [base64.b64encode(image_data).decode('ascii') for image_data in images],
+            'similar_images': False
+        })
+        headers = {'Api-Key': KINDWISE_API_KEY or '', 'Content-Type': 'application/json'}
+        
+        try:
+            result = await self._request(
+                'kindwise', 'POST', url,
+                params={'details': 'common_names,taxonomy'},
+                data_factory=lambda: body,
+                headers=headers
+            )
+            return identification_from_kindwise(result)
+        except Exception as e:
+            logging.error(f"Error identifying plant with Kindwise: {e}")
+        
+        return PlantIdentification()
+
+    async def identify_plant(self, images: List[bytes], organs: Optional[List[str]] = None) -> PlantIdentification:
+        """Identify plant with the configured providers according to IDENTIFY_STRATEGY"""
+        identifiers = list(self.identifiers.values())
+        if IDENTIFY_STRATEGY == 'single' or len(identifiers) == 1:
+            return await identifiers[0](images, organs)
+        
+        tasks = [asyncio.create_task(identify(images, organs)) for identify in identifiers]
+        try:
+            if IDENTIFY_STRATEGY == 'merge':
+                done, _ = await asyncio.wait(tasks, timeout=IDENTIFY_MERGE_TIMEOUT_SECONDS)
+                return merge_identifications([task.result() for task in tasks if task in done])
+            return await self._race_identifications(tasks)
+        finally:
+            # Providers that have not answered yet are no longer needed
+            for task in tasks:
+                task.cancel()
+
+    async def _race_identifications(self, tasks: List[asyncio.Task]) -> PlantIdentification:
+        """Return the first answer above the confidence threshold, else the most confident one"""
+        best = PlantIdentification()
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                identification = task.result()
+                if identification.confidence >= IDENTIFY_CONFIDENCE_THRESHOLD:
+                    return identification
+                if identification.confidence > best.confidence:
+                    best = identification
+        return best
+
 plant_service = PlantAPIService()
 
+# Replaced by the snapshot at startup when there is one
+typeahead_index = TypeaheadIndex.build(translation_suggestions(plant_service.plant_translations))
+
+cache_events = metrics.counter('plauntie_cache_events_total', "Cache lookups by outcome", ('cache', 'event'))
+cache_hit_ratio = metrics.gauge('plauntie_cache_hit_ratio', "Share of cache lookups served from the cache", ('cache',))
+reminder_stream_connections = metrics.gauge('plauntie_reminder_stream_connections', "Open reminder event streams")
+upstream_breaker_open = metrics.gauge('plauntie_upstream_breaker_open', "1 while a provider's circuit breaker is not closed", ('provider',))
+
+def collect_service_metrics():
+    """Copy the cache and breaker counters kept by the services into the registry"""
+    caches = {
+        'search': plant_service.search_cache.get_stats(),
+        'care_info': care_info_store.get_stats(),
+        'identification': identification_cache.get_stats(),
+    }
+    for cache, stats in caches.items():
+        cache_hit_ratio.set(stats['hit_ratio'], cache)
+        for event, value in stats.items():
+            if event not in ('hit_ratio', 'entries'):
+                cache_events.set(value, cache, event)
+    for name, provider in plant_service.providers.items():
+        upstream_breaker_open.set(0 if provider.breaker.state == 'closed' else 1, name)
+    reminder_stream_connections.set(reminder_events.connections)
+
+metrics.collectors.append(collect_service_metrics)
+
 # API Routes
 @api_router.get("/")
 async def root():
     return {"message": "Plauntie API - Your wise plant companion is ready to help!"}
 
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss counters for the in-process and shared caches"""
+    return {
+        "search": plant_service.search_cache.get_stats(),
+        "care_info": care_info_store.get_stats(),
+        "identification": identification_cache.get_stats(),
+        "typeahead": typeahead_index.stats()
+    }
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Route, upstream and MongoDB latency histograms and cache counters for this worker, in Prometheus text format"""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@api_router.get("/upstream/pool")
+async def get_upstream_pool_stats():
+    """Get connection pool statistics for upstream plant APIs in this worker"""
+    return plant_service.get_pool_stats()
+
+@api_router.get("/upstream/quota")
+async def get_upstream_quota():
+    """Get remaining quota per upstream API key, shared by all workers"""
+    return await plant_service.get_quota_states()
+
+@api_router.get("/upstream/breakers")
+async def get_upstream_breakers():
+    """Get circuit breaker state and retry/hedging counters per upstream provider in this worker"""
+    return plant_service.get_breaker_states()
+
 @api_router.get("/plants/search", response_model=List[PlantSearchResult])
 async def search_plants(q: str):
     """Search for plants by name"""
     if not q or len(q) < 2:
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters long")
     
+    if CATALOG_FIRST:
+        try:
+            results = await species_catalog.search(plant_service.translate_query(q))
+            if results:
+                return results
+        except Exception as e:
+            logging.error(f"Error searching species catalog: {e}")
+    
     results = await plant_service.search_plants_perenual(q)
     return results
 
+@api_router.get("/plants/suggest")
+async def suggest_plants(prefix: str, limit: int = SUGGEST_TOP_K):
+    """Autocomplete plant names (common, scientific and Russian) from the in-memory index"""
+    if not 1 <= limit <= SUGGEST_TOP_K:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {SUGGEST_TOP_K}")
+    return typeahead_index.suggest(prefix, limit)
+
+@api_router.get("/plants/search/stream")
+async def stream_search_plants(q: str, pages: int = SEARCH_STREAM_MAX_PAGES):
+    """Search for plants across several upstream pages, streamed as NDJSON.
+
+    Each line is an event: {"type": "result", "plant": {...}} as soon as its page arrives,
+    {"type": "error", ...} if a page fails, and a final {"type": "end", "results": n, "pages": n,
+    "last_page": n or null}.
+    """
+    if not q or len(q) < 2:
+        raise HTTPException(status_code=400, detail="Query must be at least 2 characters long")
+    if not 1 <= pages <= SEARCH_STREAM_MAX_PAGES:
+        raise HTTPException(status_code=400, detail=f"pages must be between 1 and {SEARCH_STREAM_MAX_PAGES}")
+    
+    async def events():
+        if CATALOG_FIRST:
+            try:
+                results = await species_catalog.search(plant_service.translate_query(q))
+                if results:
+                    for result in results:
+                        yield orjson.dumps({'type': 'result', 'plant': jsonable_encoder(result)}) + b'\n'
+                    yield orjson.dumps({'type': 'end', 'results': len(results), 'pages': 0}) + b'\n'
+                    return
+            except Exception as e:
+                logging.error(f"Error searching species catalog: {e}")
+        
+        stream = plant_service.stream_search_perenual(q, pages)
+        try:
+            async for event, payload in stream:
+                if event == 'result':
+                    yield orjson.dumps({'type': 'result', 'plant': payload}) + b'\n'
+                else:
+                    yield orjson.dumps({'type': event, **payload}) + b'\n'
+        finally:
+            # Starlette cancels this generator when the client disconnects
+            await stream.aclose()
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+def care_info_headers(etag: str, cacheable: bool = True) -> Dict[str, str]:
+    cache_control = f"public, max-age={CARE_INFO_CACHE_SECONDS}" if cacheable else "no-cache"
+    return {'ETag': etag, 'Cache-Control': cache_control}
+
 @api_router.get("/plants/{plant_id}/care", response_model=PlantCareInfo)
-async def get_plant_care_info(plant_id: str):
+async def get_plant_care_info(plant_id: str, if_none_match: Optional[str] = Header(None)):
     """Get detailed care information for a specific plant"""
-    care_info = await plant_service.get_plant_care_info_perenual(plant_id)
+    # Answer conditional requests from the stored ETag alone
+    if if_none_match:
+        stored = await care_info_store.get_etag(plant_id)
+        if stored and care_info_store.is_fresh(stored) and etag_matches(if_none_match, stored['etag']):
+            care_info_store.stats['not_modified'] += 1
+            return Response(status_code=304, headers=care_info_headers(stored['etag']))
+    
+    stored = await care_info_store.get(plant_id)
+    if stored and care_info_store.is_fresh(stored):
+        care_info_store.stats['hits'] += 1
+        return JSONResponse(stored['care'], headers=care_info_headers(stored['etag']))
+    
+    care_info_store.stats['misses'] += 1
+    care_info = None
+    if CATALOG_FIRST:
+        try:
+            care_info = await species_catalog.get_care_info(plant_id)
+        except Exception as e:
+            logging.error(f"Error reading species catalog: {e}")
     
     if not care_info:
-        # Fallback: try to get basic info from search results
-        search_results = await plant_service.search_plants_perenual("id:" + plant_id)
-        if search_results:
-            plant = search_results[0]
-            care_info = PlantCareInfo(
-                plant_id=plant_id,
-                name=plant.name,
-                scientific_name=plant.scientific_name,
-                watering="Регулярный полив по мере высыхания почвы",
-                sunlight="Яркий рассеянный свет",
-                temperature="18-24°C",
-                humidity="Умеренная влажность 40-60%",
-                fertilizer="Подкормка раз в 2-4 недели в период роста",
-                repotting="Пересадка каждые 1-2 года весной",
-                common_problems=["Переувлажнение", "Недостаток света", "Вредители"],
-                care_tips=[
-                    "Проверяйте влажность почвы перед поливом",
-                    "Обеспечьте хорошее освещение",
-                    "Регулярно осматривайте растение на предмет вредителей",
-                    "Поддерживайте стабильную температуру"
-                ]
-            )
-        else:
-            raise HTTPException(status_code=404, detail="Plant care information not found")
+        care_info = await plant_service.get_plant_care_info_perenual(plant_id)
+    
+    if care_info:
+        etag = await care_info_store.put(care_info)
+        return JSONResponse(jsonable_encoder(care_info), headers=care_info_headers(etag))
+    
+    if stored:
+        # Upstream is unavailable: keep serving the last known care info
+        care_info_store.stats['stale'] += 1
+        return JSONResponse(stored['care'], headers=care_info_headers(stored['etag']))
+    
+    # Fallback: try to get basic info from search results
+    search_results = await plant_service.search_plants_perenual("id:" + plant_id)
+    if not search_results:
+        raise HTTPException(status_code=404, detail="Plant care information not found")
+    
+    plant = search_results[0]
+    care_info = PlantCareInfo(
+        plant_id=plant_id,
+        name=plant.name,
+        scientific_name=plant.scientific_name,
+        watering="Регулярный полив по мере высыхания почвы",
+        sunlight="Яркий рассеянный свет",
+        temperature="18-24°C",
+        humidity="Умеренная влажность 40-60%",
+        fertilizer="Подкормка раз в 2-4 недели в период роста",
+        repotting="Пересадка каждые 1-2 года весной",
+        common_problems=["Переувлажнение", "Недостаток света", "Вредители"],
+        care_tips=[
+            "Проверяйте влажность почвы перед поливом",
+            "Обеспечьте хорошее освещение",
+            "Регулярно осматривайте растение на предмет вредителей",
+            "Поддерживайте стабильную температуру"
+        ]
+    )
+    
+    # Generic care tips are not persisted, so a later upstream success replaces them
+    return JSONResponse(
+        jsonable_encoder(care_info),
+        headers=care_info_headers(CareInfoStore.content_etag(care_info), cacheable=False)
+    )
+
+async def identify_with_cache(image_data: bytes, phash: int, timings: Dict[str, float],
+                              organ: Optional[str] = None) -> PlantIdentification:
+    """Identify a single photo, reusing the result of a near-duplicate photo if there is one.
+
+    Cached results come from queries without an organ, so only auto-organ photos use the cache.
+    """
+    # A flat, featureless image hashes to 0; every such image would look like a duplicate
+    cacheable = phash != 0 and organ in (None, 'auto')
+    identification = None
+    if cacheable:
+        started = time.perf_counter()
+        identification = await identification_cache.lookup(phash)
+        timings['cache'] = round((time.perf_counter() - started) * 1000, 2)
     
-    return care_info
+    if identification is None:
+        started = time.perf_counter()
+        identification = await plant_service.identify_plant([image_data], [organ] if organ else None)
+        timings['identify'] = round((time.perf_counter() - started) * 1000, 2)
+        if cacheable and identification.suggestions:
+            await identification_cache.store(phash, identification)
+    return identification
 
 @api_router.post("/plants/identify", response_model=PlantIdentification)
-async def identify_plant(file: UploadFile = File(...)):
+async def identify_plant(response: Response, file: UploadFile = File(...)):
     """Identify a plant from an uploaded image"""
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="File must be an image")
+    timings: Dict[str, float] = {}
+    image_data, phash = await prepare_identification_image(file, timings)
+    identification = await identify_with_cache(image_data, phash, timings)
     
-    # Read and process the image
-    image_data = await file.read()
-    
-    # Convert to JPEG if needed
-    try:
-        image = Image.open(io.BytesIO(image_data))
-        if image.format != 'JPEG':
-            output = io.BytesIO()
-            image.convert('RGB').save(output, format='JPEG', quality=85)
-            image_data = output.getvalue()
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="Invalid image file")
-    
-    identification = await plant_service.identify_plant_plantnet(image_data)
+    response.headers['Server-Timing'] = server_timing_header(timings)
+    logging.info(f"Identification timings (ms): {timings}")
     return identification
 
+# Limits concurrent identification calls made by batch requests in this process
+identify_batch_slots = asyncio.Semaphore(IDENTIFY_BATCH_CONCURRENCY)
+
+@api_router.post("/plants/identify/batch", response_model=List[BatchIdentificationResult])
+async def identify_plants_batch(
+    response: Response,
+    files: List[UploadFile] = File(...),
+    plants: List[str] = Form([]),
+    organs: List[str] = Form([])
+):
+    """Identify several plants at once.
+
+    `plants` labels each file with the plant it shows; files sharing a label are sent to
+    the identification providers as one multi-image query. `organs` gives the organ of each file (default auto).
+    """
+    if len(files) > IDENTIFY_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {IDENTIFY_BATCH_MAX_FILES} images per batch")
+    plants = plants or [str(index) for index in range(len(files))]
+    organs = organs or ['auto'] * len(files)
+    if len(plants) != len(files) or len(organs) != len(files):
+        raise HTTPException(status_code=400, detail="plants and organs must have one entry per file")
+    if any(organ not in PLANTNET_ORGANS for organ in organs):
+        raise HTTPException(status_code=400, detail=f"organs must be one of: {', '.join(PLANTNET_ORGANS)}")
+    
+    groups: Dict[str, List[int]] = {}
+    for index, label in enumerate(plants):
+        groups.setdefault(label, []).append(index)
+    if any(len(indexes) > PLANTNET_MAX_IMAGES for indexes in groups.values()):
+        raise HTTPException(status_code=400, detail=f"At most {PLANTNET_MAX_IMAGES} images per plant")
+    
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    prepared = await asyncio.gather(*[prepare_identification_image(file, {}) for file in files])
+    timings['preprocess'] = round((time.perf_counter() - started) * 1000, 2)
+    
+    async def identify_group(indexes: List[int]) -> PlantIdentification:
+        async with identify_batch_slots:
+            if len(indexes) == 1:
+                image_data, phash = prepared[indexes[0]]
+                return await identify_with_cache(image_data, phash, {}, organs[indexes[0]])
+            return await plant_service.identify_plant(
+                [prepared[index][0] for index in indexes],
+                [organs[index] for index in indexes]
+            )
+    
+    started = time.perf_counter()
+    identifications = await asyncio.gather(*[identify_group(indexes) for indexes in groups.values()])
+    timings['identify'] = round((time.perf_counter() - started) * 1000, 2)
+    
+    response.headers['Server-Timing'] = server_timing_header(timings)
+    logging.info(f"Batch identification of {len(files)} images in {len(groups)} plants, timings (ms): {timings}")
+    return [
+        BatchIdentificationResult(plant=label, images=len(indexes), identification=identification)
+        for (label, indexes), identification in zip(groups.items(), identifications)
+    ]
+
 @api_router.post("/user/{user_id}/plants", response_model=UserPlant)
 async def add_user_plant(user_id: str, plant_data: dict):
     """Add a plant to user's collection"""
-    user_plant = UserPlant(
+    user_plant = user_plant_from_data(user_id, plant_data)
+    
+    await db.user_plants.insert_one(user_plant.dict())
+    
+    # Create initial reminders
+    await create_reminders_for_plant(user_plant)
+    
+    return user_plant
+
+def user_plant_from_data(user_id: str, plant_data: Dict[str, Any]) -> UserPlant:
+    """Build a user plant from request data; raises ValidationError for invalid fields"""
+    return UserPlant(
         user_id=user_id,
         plant_id=plant_data.get('plant_id', ''),
         nickname=plant_data.get('nickname', ''),
@@ -389,71 +2376,487 @@ async def add_user_plant(user_id: str, plant_data: dict):
         notes=plant_data.get('notes', ''),
         image_url=plant_data.get('image_url', '')
     )
+
+@api_router.post("/user/{user_id}/plants/import")
+async def import_user_plants(user_id: str, request: Request,
+                             body_format: Optional[str] = Query(None, alias='format')):
+    """Import plants from an NDJSON or CSV request body.
+
+    The body is read as a stream and written in chunks of IMPORT_CHUNK_SIZE plants, so memory
+    stays bounded whatever the file size. Invalid rows are reported by line number and
+    skipped. The format comes from the `format` parameter (ndjson or csv) or else the Content-Type.
+    """
+    body_format = body_format or ('csv' if 'csv' in request.headers.get('content-type', '') else 'ndjson')
+    if body_format not in ('ndjson', 'csv'):
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
     
-    await db.user_plants.insert_one(user_plant.dict())
+    importer = PlantImporter(user_id)
+    lines = iter_lines(request.stream(), IMPORT_MAX_LINE_BYTES)
+    async for line_number, plant_data, error in iter_import_rows(lines, body_format):
+        if error is None:
+            try:
+                plant_data = user_plant_from_data(user_id, plant_data)
+            except ValidationError as e:
+                error = '; '.join(f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in e.errors())
+        if error is None:
+            await importer.add(line_number, plant_data)
+        else:
+            importer.record_error(line_number, error)
+    await importer.flush()
     
-    # Create initial reminders
-    await create_reminders_for_plant(user_plant)
+    logging.info(f"Imported {importer.imported} plants for {user_id}, {importer.failed} rows failed")
+    return importer.summary()
+
+async def iter_lines(chunks, max_line_bytes: int):
+    """Split a byte stream into lines; a line longer than `max_line_bytes` is yielded as None"""
+    buffer = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b'\n', start)) >= 0:
+            if not oversized:
+                buffer += chunk[start:end]
+            yield None if oversized or len(buffer) > max_line_bytes else bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                buffer.clear()
+                oversized = True
+    if buffer or oversized:
+        yield None if oversized else bytes(buffer)
+
+async def iter_import_rows(lines, body_format: str):
+    """Yield (line number, row dict, error) for every non-blank row of an NDJSON or CSV body.
+
+    CSV rows are keyed by the header line; empty cells are left out so model defaults apply.
+    A quoted CSV cell may span several lines.
+    """
+    header = None
+    pending = ''
+    pending_line = 0
+    line_number = 0
+    async for raw in lines:
+        line_number += 1
+        if raw is None:
+            pending = ''
+            yield line_number, None, f"line longer than {IMPORT_MAX_LINE_BYTES} bytes"
+            continue
+        try:
+            text = raw.decode('utf-8').rstrip('\r')
+        except UnicodeDecodeError:
+            yield line_number, None, "line is not valid UTF-8"
+            continue
+        
+        if body_format == 'ndjson':
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError as e:
+                yield line_number, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "expected a JSON object"
+                continue
+            yield line_number, row, None
+            continue
+        
+        if not pending:
+            pending_line = line_number
+        pending = f"{pending}\n{text}" if pending else text
+        if pending.count('"') % 2:
+            # Inside a quoted cell that continues on the next line
+            continue
+        text, pending = pending, ''
+        if not text.strip():
+            continue
+        cells = next(csv.reader([text]))
+        if header is None:
+            header = [cell.strip().lstrip('\ufeff') for cell in cells]
+            continue
+        if len(cells) > len(header):
+            yield pending_line, None, f"expected {len(header)} columns, got {len(cells)}"
+            continue
+        yield pending_line, {key: value for key, value in zip(header, cells) if value != ''}, None
+    if pending:
+        yield pending_line, None, "unterminated quoted cell"
+
+class PlantImporter:
+    """Buffers imported plants and writes them with their initial reminders chunk by chunk"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.chunk: List[Tuple[int, UserPlant]] = []
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def record_error(self, line_number: int, error: str):
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({'line': line_number, 'error': error})
+
+    async def add(self, line_number: int, user_plant: UserPlant):
+        self.chunk.append((line_number, user_plant))
+        if len(self.chunk) >= IMPORT_CHUNK_SIZE:
+            await self.flush()
+
+    async def flush(self):
+        """Insert the buffered plants, then the reminders of the plants that were inserted"""
+        chunk, self.chunk = self.chunk, []
+        if not chunk:
+            return
+        
+        failed_indexes = set()
+        try:
+            await db.user_plants.bulk_write(
+                [InsertOne(user_plant.dict()) for _, user_plant in chunk], ordered=False
+            )
+        except BulkWriteError as e:
+            for write_error in e.details.get('writeErrors', []):
+                failed_indexes.add(write_error['index'])
+                self.record_error(chunk[write_error['index']][0], write_error.get('errmsg', 'insert failed'))
+        
+        inserted = {user_plant.id: line_number for index, (line_number, user_plant) in enumerate(chunk) if index not in failed_indexes}
+        reminders = [reminder for _, user_plant in chunk if user_plant.id in inserted for reminder in initial_reminders(user_plant)]
+        reminder_errors: Dict[str, str] = {}
+        if reminders:
+            try:
+                await db.reminders.bulk_write(
+                    [InsertOne(reminder_document(reminder)) for reminder in reminders], ordered=False
+                )
+            except BulkWriteError as e:
+                for write_error in e.details.get('writeErrors', []):
+                    reminder_errors.setdefault(reminders[write_error['index']].plant_id, write_error.get('errmsg', 'insert failed'))
+        
+        if reminder_errors:
+            # Take back the plants left without reminders, so those rows can simply be imported again
+            plant_ids = list(reminder_errors)
+            await db.reminders.delete_many({'user_id': self.user_id, 'plant_id': {'$in': plant_ids}})
+            await db.user_plants.delete_many({'user_id': self.user_id, 'id': {'$in': plant_ids}})
+            for plant_id, error in reminder_errors.items():
+                self.record_error(inserted.pop(plant_id), f"reminders not created: {error}")
+        for reminder in reminders:
+            if reminder.plant_id in inserted:
+                reminder_scheduler.notify(reminder.id, reminder.due_date)
+        self.imported += len(inserted)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+def encode_cursor(sort_value: datetime, item_id: str) -> str:
+    """Opaque cursor pointing just after the item with this sort key"""
+    raw = json.dumps([sort_value.isoformat(), item_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, item_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), str(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def listing_projection(fields: Optional[str], model, always: Tuple[str, ...]) -> Dict[str, int]:
+    """Mongo projection for a comma-separated `fields` parameter; all of the model's fields when
+    it is absent, so internal bookkeeping fields stored alongside them are never returned"""
+    if not fields:
+        return {'_id': 0, **{field: 1 for field in model.model_fields}}
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return {'_id': 0, **{field: 1 for field in (*always, *requested)}}
+
+async def keyset_page(collection, query: Dict[str, Any], sort_field: str, cursor: Optional[str],
+                      limit: int, projection: Dict[str, int]) -> JSONResponse:
+    """One page of `query` ordered by (sort_field, id), starting after `cursor`.
+
+    Pages are found by key rather than by offset, so every page costs the same however deep
+    it is. The cursor for the next page, if there is one, is returned in X-Next-Cursor.
+    """
+    if not 1 <= limit <= LISTING_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {LISTING_MAX_PAGE_SIZE}")
+    if cursor:
+        after_value, after_id = decode_cursor(cursor)
+        query = {**query, '$or': [
+            {sort_field: {'$gt': after_value}},
+            {sort_field: after_value, 'id': {'$gt': after_id}}
+        ]}
     
-    return user_plant
+    items = await collection.find(query, projection).sort([(sort_field, 1), ('id', 1)]).limit(limit + 1).to_list(None)
+    headers = {}
+    if len(items) > limit:
+        items = items[:limit]
+        headers['X-Next-Cursor'] = encode_cursor(items[-1][sort_field], items[-1]['id'])
+    return MongoJSONResponse(items, headers=headers)
 
 @api_router.get("/user/{user_id}/plants", response_model=List[UserPlant])
-async def get_user_plants(user_id: str):
-    """Get all plants in user's collection"""
-    plants = await db.user_plants.find({"user_id": user_id}).to_list(1000)
-    return [UserPlant(**plant) for plant in plants]
+async def get_user_plants(user_id: str, limit: int = LISTING_PAGE_SIZE, cursor: Optional[str] = None, fields: Optional[str] = None):
+    """Get the plants in user's collection, oldest first, one page at a time.
+
+    `fields` limits the response to the listed fields (plus id and date_added).
+    """
+    projection = listing_projection(fields, UserPlant, ('id', 'date_added'))
+    return await keyset_page(db.user_plants, {"user_id": user_id}, 'date_added', cursor, limit, projection)
+
+@api_router.get("/user/{user_id}/dashboard")
+async def get_user_dashboard(user_id: str):
+    """Plants with their pending reminders embedded, the reminders due within a week, and
+    summary counts, computed in one aggregation.
+
+    Overdue reminders are past due; due_today counts the rest of the current UTC day and
+    due_this_week the next 7 days (neither includes overdue ones). At most
+    LISTING_MAX_PAGE_SIZE plants and reminders are embedded; the counts cover all of them.
+    """
+    now = datetime.utcnow()
+    end_of_day = datetime(now.year, now.month, now.day) + timedelta(days=1)
+    end_of_week = now + timedelta(days=7)
+    pending = "$next_reminders.due_date"
+    
+    def count_due(*conditions):
+        return {"$sum": {"$cond": [{"$and": list(conditions)}, 1, 0]}}
+    
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        # localField with a pipeline (MongoDB 5.0+) uses the plant_id index and skips completed history
+        {"$lookup": {
+            "from": "reminders",
+            "localField": "id",
+            "foreignField": "plant_id",
+            "pipeline": [
+                {"$match": {"completed": False, "status": {"$ne": "missed"}}},
+                {"$sort": {"due_date": 1}},
+                {"$project": listing_projection(None, Reminder, ())}
+            ],
+            "as": "next_reminders"
+        }},
+        {"$facet": {
+            "plants": [
+                {"$sort": {"date_added": 1, "id": 1}},
+                {"$limit": LISTING_MAX_PAGE_SIZE},
+                {"$project": {**listing_projection(None, UserPlant, ()), "next_reminders": 1}}
+            ],
+            "reminders": [
+                {"$unwind": "$next_reminders"},
+                {"$replaceRoot": {"newRoot": "$next_reminders"}},
+                {"$match": {"due_date": {"$lte": end_of_week}}},
+                {"$sort": {"due_date": 1, "id": 1}},
+                {"$limit": LISTING_MAX_PAGE_SIZE}
+            ],
+            "counts": [
+                {"$unwind": {"path": "$next_reminders", "preserveNullAndEmptyArrays": True}},
+                {"$group": {
+                    "_id": None,
+                    "plants": {"$addToSet": "$id"},
+                    # Plants without pending reminders unwind to a missing date, which sorts below any date
+                    "overdue": count_due({"$gt": [pending, None]}, {"$lt": [pending, now]}),
+                    "due_today": count_due({"$gte": [pending, now]}, {"$lt": [pending, end_of_day]}),
+                    "due_this_week": count_due({"$gte": [pending, now]}, {"$lte": [pending, end_of_week]})
+                }},
+                {"$project": {"_id": 0, "plants": {"$size": "$plants"}, "overdue": 1, "due_today": 1, "due_this_week": 1}}
+            ]
+        }}
+    ]
+    result = (await db.user_plants.aggregate(pipeline).to_list(1))[0]
+    counts = result["counts"][0] if result["counts"] else {"plants": 0, "overdue": 0, "due_today": 0, "due_this_week": 0}
+    return MongoJSONResponse({
+        "plants": result["plants"],
+        "reminders": result["reminders"],
+        "summary": {**counts, "plants_truncated": counts["plants"] > len(result["plants"])}
+    })
+
+@api_router.get("/reminders/scheduler")
+async def get_reminder_scheduler():
+    """Leadership and heap state of this worker's reminder scheduler"""
+    return reminder_scheduler.snapshot()
 
 @api_router.get("/user/{user_id}/reminders", response_model=List[Reminder])
-async def get_user_reminders(user_id: str):
-    """Get pending reminders for user"""
-    reminders = await db.reminders.find({
+async def get_user_reminders(user_id: str, limit: int = LISTING_PAGE_SIZE, cursor: Optional[str] = None, fields: Optional[str] = None):
+    """Get pending reminders for user, soonest first, one page at a time.
+
+    `fields` limits the response to the listed fields (plus id and due_date).
+    """
+    query = {
         "user_id": user_id,
         "completed": False,
+        "status": {"$ne": "missed"},
         "due_date": {"$lte": datetime.utcnow() + timedelta(days=7)}
-    }).to_list(1000)
+    }
+    projection = listing_projection(fields, Reminder, ('id', 'due_date'))
+    return await keyset_page(db.reminders, query, 'due_date', cursor, limit, projection)
+
+@api_router.get("/user/{user_id}/reminders/stream")
+async def stream_user_reminders(user_id: str):
+    """Server-sent events as the user's reminders are created, become due, overdue or missed,
+    are completed or rescheduled. A `resync` event means events were dropped and the client
+    should reload its reminders; a 503 means it should keep polling instead."""
+    if not REMINDER_STREAM_ENABLED or not reminder_events.available:
+        raise HTTPException(status_code=503, detail="Reminder stream unavailable")
+    return ReminderEventStream(user_id)
+
+@api_router.get("/reminders/stream")
+async def get_reminder_stream_stats():
+    """Open event streams and change stream state in this worker"""
+    return reminder_events.snapshot()
+
+@api_router.post("/user/{user_id}/reminders/complete")
+async def complete_reminders(user_id: str, request: BulkCompleteRequest):
+    """Mark many reminders as completed at once, e.g. after watering every plant"""
+    reminder_ids = list(dict.fromkeys(request.reminder_ids))
+    if len(reminder_ids) > REMINDER_BULK_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {REMINDER_BULK_MAX} reminders per request")
+    now = datetime.utcnow()
+    completion_id = str(uuid.uuid4())
     
-    return [Reminder(**reminder) for reminder in reminders]
+    async def complete(session):
+        # Tag the reminders this request completes, then read back exactly those
+        await db.reminders.update_many(
+            {"id": {"$in": reminder_ids}, "user_id": user_id, "completed": False},
+            {"$set": {"completed": True, "status": "completed", "completion_id": completion_id},
+             "$unset": {"next_check_at": ""}},
+            session=session
+        )
+        reminders = await db.reminders.find(
+            {"id": {"$in": reminder_ids}, "user_id": user_id, "completion_id": completion_id}, {"_id": 0}, session=session
+        ).to_list(None)
+        await record_completions(reminders, now, session)
+        return reminders
+    
+    reminders = await run_completion(complete)
+    completed_ids = {reminder['id'] for reminder in reminders}
+    return {
+        "message": f"Completed {len(completed_ids)} reminders",
+        "completed": [reminder_id for reminder_id in reminder_ids if reminder_id in completed_ids],
+        "not_found": [reminder_id for reminder_id in reminder_ids if reminder_id not in completed_ids]
+    }
 
 @api_router.post("/user/{user_id}/reminders/{reminder_id}/complete")
 async def complete_reminder(user_id: str, reminder_id: str):
     """Mark a reminder as completed"""
-    result = await db.reminders.update_one(
-        {"id": reminder_id, "user_id": user_id},
-        {"$set": {"completed": True}}
-    )
+    now = datetime.utcnow()
     
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Reminder not found")
+    async def complete(session):
+        reminder = await db.reminders.find_one_and_update(
+            {"id": reminder_id, "user_id": user_id, "completed": False},
+            {"$set": {"completed": True, "status": "completed"}, "$unset": {"next_check_at": ""}},
+            projection={"_id": 0},
+            session=session
+        )
+        if reminder is not None:
+            await record_completions([reminder], now, session)
+        return reminder
     
-    # Update the corresponding plant care dates
-    reminder = await db.reminders.find_one({"id": reminder_id})
-    if reminder:
-        update_field = {}
-        now = datetime.utcnow()
-        
-        if reminder['reminder_type'] == 'watering':
-            update_field['last_watered'] = now
-        elif reminder['reminder_type'] == 'fertilizing':
-            update_field['last_fertilized'] = now
-        elif reminder['reminder_type'] == 'repotting':
-            update_field['last_repotted'] = now
-        
-        if update_field:
-            await db.user_plants.update_one(
-                {"id": reminder['plant_id']},
-                {"$set": update_field}
-            )
-        
-        # Create next reminder
-        plant = await db.user_plants.find_one({"id": reminder['plant_id']})
-        if plant:
-            user_plant = UserPlant(**plant)
-            await create_next_reminder(user_plant, reminder['reminder_type'])
+    if await run_completion(complete) is None:
+        raise HTTPException(status_code=404, detail="Reminder not found")
     
     return {"message": "Reminder completed successfully"}
 
+@api_router.post("/user/{user_id}/plants/reschedule")
+async def reschedule_user_plants(user_id: str, request: RescheduleRequest):
+    """Change a care frequency for many of a user's plants and move their pending reminders"""
+    return await reschedule_plants({"user_id": user_id}, request)
+
+@api_router.post("/plants/reschedule")
+async def reschedule_all_plants(request: RescheduleRequest, x_admin_token: Optional[str] = Header(None)):
+    """Change a care frequency across every user's plants, e.g. for the winter season.
+    Needs X-Admin-Token matching RESCHEDULE_ADMIN_TOKEN."""
+    if not RESCHEDULE_ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(
+        x_admin_token.encode(), RESCHEDULE_ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Rescheduling every user's plants needs an admin token")
+    return await reschedule_plants({}, request)
+
+# Plant care date updated when a reminder of each type is completed
+CARE_DATE_FIELDS = {
+    'watering': 'last_watered',
+    'fertilizing': 'last_fertilized',
+    'repotting': 'last_repotted',
+}
+
+async def run_completion(complete):
+    """Run `complete(session)` in a transaction when REMINDER_TRANSACTIONS is set, so a crash
+    cannot leave a completed reminder without its successor"""
+    if not REMINDER_TRANSACTIONS:
+        return await complete(None)
+    async with await client.start_session() as session:
+        async with session.start_transaction():
+            return await complete(session)
+
+async def record_completions(reminders: List[Dict[str, Any]], now: datetime, session=None) -> List[Reminder]:
+    """Update the plants' care dates and insert the next reminders for completed reminders.
+
+    Issues one bulk write per collection whatever the number of reminders (plus one plant
+    lookup for reminders stored before their frequency was recorded).
+    """
+    frequencies = await reminder_frequencies(reminders, session)
+    plant_updates = [
+        UpdateOne({"id": reminder['plant_id']}, {"$set": {CARE_DATE_FIELDS[reminder['reminder_type']]: now}})
+        for reminder in reminders if reminder['reminder_type'] in CARE_DATE_FIELDS
+    ]
+    successors = [
+        Reminder(
+            user_id=reminder['user_id'],
+            plant_id=reminder['plant_id'],
+            plant_nickname=reminder['plant_nickname'],
+            reminder_type=reminder['reminder_type'],
+            due_date=now + timedelta(days=frequencies[reminder['id']]),
+            frequency_days=frequencies[reminder['id']]
+        )
+        for reminder in reminders if frequencies.get(reminder['id'])
+    ]
+    
+    writes = []
+    if plant_updates:
+        writes.append(db.user_plants.bulk_write(plant_updates, ordered=False, session=session))
+    if successors:
+        writes.append(db.reminders.insert_many([reminder_document(reminder) for reminder in successors], session=session))
+    if session is None:
+        await asyncio.gather(*writes)
+    else:
+        # Operations in one transaction must not run concurrently
+        for write in writes:
+            await write
+    
+    for reminder in successors:
+        reminder_scheduler.notify(reminder.id, reminder.due_date)
+    return successors
+
+async def reminder_frequencies(reminders: List[Dict[str, Any]], session=None) -> Dict[str, int]:
+    """Recurrence period in days of each recurring reminder, keyed by reminder id"""
+    recurring = [reminder for reminder in reminders if reminder['reminder_type'] in ('watering', 'fertilizing')]
+    frequencies = {reminder['id']: reminder['frequency_days'] for reminder in recurring if reminder.get('frequency_days')}
+    legacy = [reminder for reminder in recurring if reminder['id'] not in frequencies]
+    if legacy:
+        plants = await db.user_plants.find(
+            {"id": {"$in": list({reminder['plant_id'] for reminder in legacy})}},
+            {"_id": 0, "id": 1, "watering_frequency_days": 1, "fertilizing_frequency_days": 1},
+            session=session
+        ).to_list(None)
+        plants_by_id = {plant['id']: plant for plant in plants}
+        for reminder in legacy:
+            plant = plants_by_id.get(reminder['plant_id'])
+            if plant:
+                frequencies[reminder['id']] = plant.get(f"{reminder['reminder_type']}_frequency_days", 0)
+    return frequencies
+
 async def create_reminders_for_plant(user_plant: UserPlant):
     """Create initial reminders for a new plant"""
+    reminders = initial_reminders(user_plant)
+    await db.reminders.insert_many([reminder_document(reminder) for reminder in reminders])
+    for reminder in reminders:
+        reminder_scheduler.notify(reminder.id, reminder.due_date)
+
+def initial_reminders(user_plant: UserPlant) -> List[Reminder]:
+    """The first watering and fertilizing reminders of a new plant"""
     now = datetime.utcnow()
     
     # Watering reminder
@@ -462,7 +2865,8 @@ async def create_reminders_for_plant(user_plant: UserPlant):
         plant_id=user_plant.id,
         plant_nickname=user_plant.nickname,
         reminder_type="watering",
-        due_date=now + timedelta(days=user_plant.watering_frequency_days)
+        due_date=now + timedelta(days=user_plant.watering_frequency_days),
+        frequency_days=user_plant.watering_frequency_days
     )
     
     # Fertilizing reminder
@@ -471,22 +2875,20 @@ async def create_reminders_for_plant(user_plant: UserPlant):
         plant_id=user_plant.id,
         plant_nickname=user_plant.nickname,
         reminder_type="fertilizing",
-        due_date=now + timedelta(days=user_plant.fertilizing_frequency_days)
+        due_date=now + timedelta(days=user_plant.fertilizing_frequency_days),
+        frequency_days=user_plant.fertilizing_frequency_days
     )
     
-    await db.reminders.insert_many([
-        watering_reminder.dict(),
-        fertilizing_reminder.dict()
-    ])
+    return [watering_reminder, fertilizing_reminder]
 
-async def create_next_reminder(user_plant: UserPlant, reminder_type: str):
-    """Create the next reminder for a plant"""
-    now = datetime.utcnow()
+async def create_next_reminder(user_plant: UserPlant, reminder_type: str, start: Optional[datetime] = None):
+    """Create the next reminder for a plant, one period after `start` (default now)"""
+    start = start or datetime.utcnow()
     
     if reminder_type == "watering":
-        due_date = now + timedelta(days=user_plant.watering_frequency_days)
+        frequency_days = user_plant.watering_frequency_days
     elif reminder_type == "fertilizing":
-        due_date = now + timedelta(days=user_plant.fertilizing_frequency_days)
+        frequency_days = user_plant.fertilizing_frequency_days
     else:
         return
     
@@ -495,22 +2897,775 @@ async def create_next_reminder(user_plant: UserPlant, reminder_type: str):
         plant_id=user_plant.id,
         plant_nickname=user_plant.nickname,
         reminder_type=reminder_type,
-        due_date=due_date
+        due_date=start + timedelta(days=frequency_days),
+        frequency_days=frequency_days
+    )
+    
+    await db.reminders.insert_one(reminder_document(reminder))
+    reminder_scheduler.notify(reminder.id, reminder.due_date)
+
+def reminder_document(reminder: Reminder) -> Dict[str, Any]:
+    """Stored form of a new reminder; `next_check_at` is when the scheduler next looks at it"""
+    return {**reminder.dict(), 'next_check_at': reminder.due_date}
+
+# Bulk rescheduling
+EPOCH = datetime(1970, 1, 1)
+
+def reschedule_plan(start: np.ndarray, frequencies: np.ndarray, factor: Optional[float],
+                    frequency_days: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """New frequencies and due dates (datetime64[ms]) for all plants in one vectorized pass;
+    the next reminder falls one new period after `start`"""
+    if frequency_days is not None:
+        new_frequencies = np.full(len(frequencies), frequency_days, dtype=np.int64)
+    else:
+        new_frequencies = np.maximum(1, np.rint(frequencies * factor)).astype(np.int64)
+    return new_frequencies, start + new_frequencies.astype('timedelta64[D]')
+
+async def reschedule_plants(scope: Dict[str, Any], request: RescheduleRequest) -> Dict[str, Any]:
+    """Apply a frequency change to the plants in `scope` and move their pending reminders.
+
+    MongoDB returns each plant's start date (last care, else date added) as epoch
+    milliseconds, so it loads straight into an int64 array without converting datetimes.
+    Due dates come from `reschedule_plan`, and both collections are updated with unordered
+    bulk writes of RESCHEDULE_CHUNK_SIZE plants or reminders, by their `id` index. Plant
+    updates are conditional on the old frequency and tag the plant with this run's id;
+    only the reminders of plants carrying the tag are moved, so a concurrent edit wins.
+    """
+    if request.reminder_type not in ('watering', 'fertilizing'):
+        raise HTTPException(status_code=400, detail="reminder_type must be watering or fertilizing")
+    if (request.factor is None) == (request.frequency_days is None):
+        raise HTTPException(status_code=400, detail="Give either factor or frequency_days")
+    if request.factor is not None and not 0 < request.factor <= RESCHEDULE_MAX_FACTOR:
+        raise HTTPException(status_code=400, detail=f"factor must be above 0 and at most {RESCHEDULE_MAX_FACTOR:g}")
+    if request.frequency_days is not None and request.frequency_days < 1:
+        raise HTTPException(status_code=400, detail="frequency_days must be at least 1")
+    
+    started = time.perf_counter()
+    frequency_field = f"{request.reminder_type}_frequency_days"
+    query = dict(scope)
+    if request.plant_ids is not None:
+        query['id'] = {'$in': request.plant_ids}
+    
+    plant_ids, start_ms, frequencies = [], [], []
+    cursor = db.user_plants.aggregate([
+        {'$match': query},
+        {'$project': {
+            '_id': 0,
+            'id': 1,
+            # Date minus date is milliseconds
+            'start_ms': {'$subtract': [{'$ifNull': [f"${CARE_DATE_FIELDS[request.reminder_type]}", '$date_added']}, EPOCH]},
+            'frequency': f"${frequency_field}",
+        }},
+    ], batchSize=RESCHEDULE_CHUNK_SIZE)
+    async for plant in cursor:
+        plant_ids.append(plant['id'])
+        start_ms.append(plant.get('start_ms'))
+        frequencies.append(plant.get('frequency'))
+    if not plant_ids:
+        return {'plants': 0, 'reminders': 0, 'seconds': round(time.perf_counter() - started, 3)}
+    
+    now_ms = int((datetime.utcnow() - EPOCH).total_seconds() * 1000)
+    default_frequency = UserPlant.model_fields[frequency_field].default
+    new_frequencies, due_dates = reschedule_plan(
+        np.fromiter((ms if ms is not None else now_ms for ms in start_ms), np.int64, len(start_ms)).view('datetime64[ms]'),
+        np.fromiter((frequency or default_frequency for frequency in frequencies), np.float64, len(frequencies)),
+        request.factor,
+        request.frequency_days
     )
     
-    await db.reminders.insert_one(reminder.dict())
+    plant_index = {plant_id: index for index, plant_id in enumerate(plant_ids)}
+    plant_frequencies = new_frequencies.tolist()
+    reschedule_id = str(uuid.uuid4())
+    applied = np.zeros(len(plant_ids), dtype=bool)
+    for offset in range(0, len(plant_ids), RESCHEDULE_CHUNK_SIZE):
+        # New frequencies depend only on the old one, so each chunk needs one update per
+        # distinct old value; conditional on it, so a concurrent edit of a plant wins
+        chunk_ids = plant_ids[offset:offset + RESCHEDULE_CHUNK_SIZE]
+        groups: Dict[Any, Tuple[int, List[str]]] = {}
+        for i in range(offset, offset + len(chunk_ids)):
+            groups.setdefault(frequencies[i], (plant_frequencies[i], []))[1].append(plant_ids[i])
+        await db.user_plants.bulk_write([
+            UpdateMany({**scope, 'id': {'$in': ids}, frequency_field: old},
+                       {'$set': {frequency_field: new, 'reschedule_id': reschedule_id}})
+            for old, (new, ids) in groups.items()
+        ], ordered=False)
+        cursor = db.user_plants.find({'id': {'$in': chunk_ids}, 'reschedule_id': reschedule_id}, {'_id': 0, 'id': 1})
+        async for plant in cursor:
+            applied[plant_index[plant['id']]] = True
+    
+    reminder_query = {**scope, 'reminder_type': request.reminder_type, 'completed': False}
+    if request.plant_ids is not None:
+        reminder_query['plant_id'] = {'$in': plant_ids}
+    reminder_ids, reminder_plants = [], []
+    cursor = db.reminders.find(reminder_query, {'_id': 0, 'id': 1, 'plant_id': 1})
+    async for reminder in cursor.batch_size(RESCHEDULE_CHUNK_SIZE):
+        index = plant_index.get(reminder['plant_id'])
+        if index is not None and applied[index]:
+            reminder_ids.append(reminder['id'])
+            reminder_plants.append(index)
+    reminder_plants = np.array(reminder_plants, dtype=np.int64)
+    reminder_frequencies = new_frequencies[reminder_plants].tolist()
+    reminder_due_dates = due_dates[reminder_plants]
+    reminder_due_datetimes = reminder_due_dates.tolist()
+    
+    for offset in range(0, len(reminder_ids), RESCHEDULE_CHUNK_SIZE):
+        await db.reminders.bulk_write([
+            UpdateOne({**scope, 'id': reminder_ids[i], 'completed': False}, {'$set': {
+                'due_date': reminder_due_datetimes[i],
+                'frequency_days': reminder_frequencies[i],
+                'status': 'pending',
+                'next_check_at': reminder_due_datetimes[i],
+            }})
+            for i in range(offset, min(offset + RESCHEDULE_CHUNK_SIZE, len(reminder_ids)))
+        ], ordered=False)
+    
+    # Only reminders inside the scheduler's loaded horizon need to enter its heap now
+    if reminder_scheduler.leader and reminder_scheduler.seeded_until is not None:
+        soon = np.flatnonzero(reminder_due_dates <= np.datetime64(reminder_scheduler.seeded_until, 'ms'))
+        for i in soon.tolist():
+            reminder_scheduler.notify(reminder_ids[i], reminder_due_datetimes[i])
+    
+    elapsed = round(time.perf_counter() - started, 3)
+    plant_count = int(applied.sum())
+    logging.info(f"Rescheduled {plant_count} plants and {len(reminder_ids)} {request.reminder_type} reminders in {elapsed}s")
+    return {'plants': plant_count, 'reminders': len(reminder_ids), 'seconds': elapsed}
+
+# Reminder scheduling
+class MongoLease:
+    """Time-limited leadership lease stored in a Mongo document, renewed by its holder"""
+
+    def __init__(self, collection, name: str, lease_seconds: float):
+        self.collection = collection
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.owner = None
+
+    async def acquire(self) -> bool:
+        """Take the lease if it is free or expired, or extend it if we already hold it"""
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {'_id': self.name, '$or': [{'owner': self.owner}, {'expires_at': {'$lt': now}}]},
+                {'$set': {'owner': self.owner, 'expires_at': now + timedelta(seconds=self.lease_seconds)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # The document exists and belongs to a live leader
+            return False
+
+    async def release(self):
+        await self.collection.delete_one({'_id': self.name, 'owner': self.owner})
+
+class ReminderScheduler:
+    """Advances reminders through due, overdue and missed as their times arrive.
+
+    Runs in every worker, but only the holder of the Mongo lease schedules. The leader
+    keeps a min-heap of (next_check_at, reminder id) for the next horizon, loaded with a
+    range query on the `next_check_at` index, and sleeps until the earliest entry instead
+    of scanning. A reminder left overdue for a whole period is marked missed and rolled
+    forward to the next occurrence.
+    """
+
+    def __init__(self, reminders, leases, overdue_after: timedelta, horizon_seconds: float, batch_size: int):
+        self.reminders = reminders
+        self.lease = MongoLease(leases, 'reminders', SCHEDULER_LEASE_SECONDS)
+        self.overdue_after = overdue_after
+        self.horizon = timedelta(seconds=horizon_seconds)
+        self.batch_size = batch_size
+        self.heap: List[Tuple[datetime, str]] = []
+        # Latest check time per heap entry; older duplicates are skipped when popped
+        self.scheduled: Dict[str, datetime] = {}
+        self.seeded_until: Optional[datetime] = None
+        self.leader = False
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {'due': 0, 'overdue': 0, 'missed': 0, 'seeds': 0}
+
+    def start(self):
+        self.lease.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        if self.leader:
+            await self.lease.release()
+            self.leader = False
+
+    def notify(self, reminder_id: str, check_at: datetime):
+        """Schedule a reminder created by this worker if it falls inside the loaded horizon"""
+        if not self.leader or self.seeded_until is None or check_at > self.seeded_until:
+            return
+        self._push(check_at, reminder_id)
+        self.wakeup.set()
+
+    def _push(self, check_at: datetime, reminder_id: str):
+        if self.scheduled.get(reminder_id) == check_at:
+            return
+        self.scheduled[reminder_id] = check_at
+        heapq.heappush(self.heap, (check_at, reminder_id))
+
+    async def run(self):
+        renew_every = self.lease.lease_seconds / 3
+        while True:
+            try:
+                was_leader = self.leader
+                self.leader = await self.lease.acquire()
+                if self.leader and not was_leader:
+                    logging.info(f"Reminder scheduler leadership acquired by {self.lease.owner}")
+                    await self.migrate()
+                elif was_leader and not self.leader:
+                    logging.warning("Reminder scheduler leadership lost")
+                if not self.leader:
+                    self.heap.clear()
+                    self.scheduled.clear()
+                    self.seeded_until = None
+                    await self._sleep(renew_every)
+                    continue
+                
+                renew_at = datetime.utcnow() + timedelta(seconds=renew_every)
+                if self.seeded_until is None or datetime.utcnow() >= self.seeded_until:
+                    await self.seed()
+                await self.process_due(renew_at)
+                
+                wake_at = min(renew_at, self.seeded_until)
+                if self.heap:
+                    wake_at = min(wake_at, self.heap[0][0])
+                await self._sleep((wake_at - datetime.utcnow()).total_seconds())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Reminder scheduler error: {e}")
+                await asyncio.sleep(5)
+
+    async def _sleep(self, seconds: float):
+        """Sleep until the timeout or until `notify` schedules an earlier reminder"""
+        self.wakeup.clear()
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout=max(0.0, seconds))
+        except asyncio.TimeoutError:
+            pass
+
+    async def migrate(self):
+        """Give reminders created before the scheduler existed a status and check time"""
+        result = await self.reminders.update_many(
+            {'completed': False, 'status': {'$exists': False}},
+            [{'$set': {'status': 'pending', 'next_check_at': '$due_date'}}]
+        )
+        if result.modified_count:
+            logging.info(f"Scheduled {result.modified_count} existing reminders")
+
+    async def seed(self):
+        """Load the reminders whose next check falls within the horizon into the heap"""
+        horizon_end = datetime.utcnow() + self.horizon
+        cursor = self.reminders.find(
+            {'next_check_at': {'$lte': horizon_end}},
+            {'_id': 0, 'id': 1, 'next_check_at': 1}
+        ).sort('next_check_at', 1).limit(self.batch_size)
+        loaded = 0
+        last_check_at = None
+        async for doc in cursor:
+            self._push(doc['next_check_at'], doc['id'])
+            last_check_at = doc['next_check_at']
+            loaded += 1
+        # A full batch means there may be more within the horizon; reload once it is drained
+        self.seeded_until = last_check_at if loaded >= self.batch_size else horizon_end
+        self.stats['seeds'] += 1
+
+    async def process_due(self, deadline: datetime):
+        """Advance every heap entry whose time has come, stopping at `deadline` to renew the lease"""
+        while self.heap and self.heap[0][0] <= datetime.utcnow() < deadline:
+            check_at, reminder_id = heapq.heappop(self.heap)
+            if self.scheduled.get(reminder_id) != check_at:
+                continue
+            del self.scheduled[reminder_id]
+            reminder = await self.reminders.find_one(
+                {'id': reminder_id, 'completed': False, 'next_check_at': check_at}, {'_id': 0}
+            )
+            if reminder is not None:
+                await self.advance(reminder, check_at)
+
+    async def advance(self, reminder: Dict[str, Any], check_at: datetime):
+        """Move a reminder to its next status; conditional on `next_check_at` so a
+        completion or another leader's update in between wins"""
+        status = reminder.get('status', 'pending')
+        update: Dict[str, Any]
+        next_check_at = None
+        if status == 'pending':
+            update = {'status': 'due'}
+            next_check_at = reminder['due_date'] + self.overdue_after
+        elif status == 'due':
+            update = {'status': 'overdue'}
+            frequency_days = reminder.get('frequency_days') or await self.plant_frequency(reminder)
+            if frequency_days:
+                next_check_at = reminder['due_date'] + timedelta(days=frequency_days)
+        else:
+            update = {'status': 'missed'}
+        
+        changes: Dict[str, Any] = {'$set': update}
+        if next_check_at is not None:
+            update['next_check_at'] = max(next_check_at, check_at)
+        else:
+            changes['$unset'] = {'next_check_at': ''}
+        result = await self.reminders.update_one(
+            {'id': reminder['id'], 'completed': False, 'next_check_at': check_at}, changes
+        )
+        if result.modified_count == 0:
+            return
+        self.stats[update['status']] += 1
+        if next_check_at is not None:
+            self._push(update['next_check_at'], reminder['id'])
+        
+        if update['status'] == 'missed':
+            await self.roll_forward(reminder)
+
+    async def roll_forward(self, reminder: Dict[str, Any]):
+        """Replace a missed reminder with its latest occurrence that is already due, so a
+        reminder missed for several periods does not produce one missed copy per period"""
+        plant = await db.user_plants.find_one({'id': reminder['plant_id']})
+        if not plant:
+            return
+        user_plant = UserPlant(**plant)
+        frequency_days = getattr(user_plant, f"{reminder['reminder_type']}_frequency_days", None)
+        if not frequency_days:
+            return
+        period = timedelta(days=frequency_days)
+        periods = max(1, (datetime.utcnow() - reminder['due_date']) // period)
+        start = reminder['due_date'] + (periods - 1) * period
+        await create_next_reminder(user_plant, reminder['reminder_type'], start=start)
+
+    async def plant_frequency(self, reminder: Dict[str, Any]) -> Optional[int]:
+        """Frequency for reminders stored before `frequency_days` was recorded"""
+        plant = await db.user_plants.find_one({'id': reminder['plant_id']})
+        if not plant:
+            return None
+        return plant.get(f"{reminder['reminder_type']}_frequency_days")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'enabled': REMINDER_SCHEDULER_ENABLED,
+            'leader': self.leader,
+            'owner': self.lease.owner,
+            'scheduled': len(self.scheduled),
+            'next_check_at': self.heap[0][0] if self.heap else None,
+            'seeded_until': self.seeded_until,
+            **self.stats,
+        }
+
+reminder_scheduler = ReminderScheduler(
+    db.reminders,
+    db.scheduler_leases,
+    timedelta(hours=REMINDER_OVERDUE_HOURS),
+    REMINDER_SCHEDULER_HORIZON_SECONDS,
+    REMINDER_SCHEDULER_BATCH
+)
+
+# Reminder event stream
+class ReminderSubscriber:
+    """One open event stream: a short queue of encoded events and the future its
+    connection is parked on. Slotted because a worker holds one per idle client."""
+
+    __slots__ = ('events', 'waiter', 'overflowed')
+
+    def __init__(self):
+        self.events: List[bytes] = []
+        self.waiter: Optional[asyncio.Future] = None
+        self.overflowed = False
+
+    def push(self, event: bytes) -> bool:
+        """Queue an event; returns True when this one overflowed the queue"""
+        overflowed = False
+        if self.overflowed:
+            pass
+        elif len(self.events) >= REMINDER_STREAM_QUEUE:
+            # Drop the backlog; the client reloads its reminders instead of replaying it
+            self.events.clear()
+            self.overflowed = overflowed = True
+        else:
+            self.events.append(event)
+        self.wake()
+        return overflowed
+
+    def wake(self):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+class ReminderEventHub:
+    """Fans reminder changes out to the event streams open in this worker.
+
+    One change stream per worker watches the reminders collection for inserts and status
+    or due date changes, whichever worker (or the scheduler leader) made them. Each change
+    is encoded once and appended to the queue of every subscriber of that user.
+    """
+
+    EVENT_FIELDS = ('id', 'plant_id', 'plant_nickname', 'reminder_type', 'due_date', 'status')
+    PIPELINE = [
+        {'$match': {'$or': [
+            {'operationType': 'insert'},
+            {'operationType': 'update', 'updateDescription.updatedFields.status': {'$exists': True}},
+            {'operationType': 'update', 'updateDescription.updatedFields.due_date': {'$exists': True}},
+        ]}},
+        {'$project': {'operationType': 1, **{f"fullDocument.{field}": 1 for field in ('user_id',) + EVENT_FIELDS}}},
+    ]
+
+    def __init__(self, reminders):
+        self.reminders = reminders
+        self.subscribers: Dict[str, set] = {}
+        self.connections = 0
+        self.resume_token = None
+        self.watching = False
+        # False once the server turned out not to support change streams
+        self.available = True
+        self.closed = False
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {'changes': 0, 'delivered': 0, 'overflows': 0, 'restarts': 0}
+
+    def subscribe(self, user_id: str) -> ReminderSubscriber:
+        subscriber = ReminderSubscriber()
+        self.subscribers.setdefault(user_id, set()).add(subscriber)
+        self.connections += 1
+        return subscriber
+
+    def unsubscribe(self, user_id: str, subscriber: ReminderSubscriber):
+        subscribers = self.subscribers.get(user_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[user_id]
+        self.connections -= 1
+
+    def publish(self, user_id: str, event: str, reminder: Dict[str, Any]):
+        subscribers = self.subscribers.get(user_id)
+        if not subscribers:
+            return
+        data = orjson.dumps({field: reminder.get(field) for field in self.EVENT_FIELDS})
+        encoded = b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+        for subscriber in subscribers:
+            if subscriber.push(encoded):
+                self.stats['overflows'] += 1
+        self.stats['delivered'] += len(subscribers)
+
+    def dispatch(self, change: Dict[str, Any]):
+        reminder = change.get('fullDocument')
+        if not reminder:
+            # Deleted before the update was looked up
+            return
+        self.stats['changes'] += 1
+        event = 'created' if change['operationType'] == 'insert' else reminder.get('status', 'pending')
+        self.publish(reminder['user_id'], event, reminder)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.closed = True
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        # Wake every stream so it finishes instead of waiting out its heartbeat
+        for subscribers in self.subscribers.values():
+            for subscriber in subscribers:
+                subscriber.wake()
+
+    async def run(self):
+        while True:
+            try:
+                async with self.reminders.watch(
+                    self.PIPELINE, full_document='updateLookup', resume_after=self.resume_token
+                ) as stream:
+                    self.watching = True
+                    async for change in stream:
+                        self.resume_token = stream.resume_token
+                        self.dispatch(change)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                self.watching = False
+                if e.code == 40573:
+                    logging.warning("Reminder stream disabled: change streams need a replica set")
+                    self.available = False
+                    return
+                if e.code == 286:
+                    # The oplog moved past the resume token; clients resync on their next reconnect
+                    self.resume_token = None
+                logging.error(f"Reminder change stream error: {e}")
+            except Exception as e:
+                self.watching = False
+                logging.error(f"Reminder change stream error: {e}")
+            self.stats['restarts'] += 1
+            await asyncio.sleep(5)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'enabled': REMINDER_STREAM_ENABLED,
+            'available': self.available,
+            'watching': self.watching,
+            'connections': self.connections,
+            'users': len(self.subscribers),
+            **self.stats,
+        }
+
+reminder_events = ReminderEventHub(db.reminders)
+
+class ReminderEventStream(Response):
+    """text/event-stream of one user's reminder events.
+
+    Written against ASGI directly rather than with StreamingResponse, which runs a task
+    group and a second task per response: an idle connection here is its request task, one
+    pending `receive()` for the disconnect and a future parked until an event or heartbeat.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.status_code = 200
+        self.background = None
+        self.init_headers({'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    async def __call__(self, scope, receive, send):
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+        subscriber = reminder_events.subscribe(self.user_id)
+        disconnect = asyncio.ensure_future(receive())
+        loop = asyncio.get_running_loop()
+        retry_ms = int(REMINDER_STREAM_RETRY_SECONDS * 1000)
+        chunk = f"retry: {retry_ms}\nevent: ready\ndata: {{}}\n\n".encode()
+        try:
+            while True:
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                woken = True
+                if not subscriber.events and not subscriber.overflowed:
+                    subscriber.waiter = loop.create_future()
+                    woken, _ = await asyncio.wait((disconnect, subscriber.waiter), timeout=REMINDER_STREAM_HEARTBEAT_SECONDS,
+                                                  return_when=asyncio.FIRST_COMPLETED)
+                    subscriber.waiter = None
+                if disconnect.done():
+                    if disconnect.result()['type'] == 'http.disconnect':
+                        break
+                    disconnect = asyncio.ensure_future(receive())
+                if reminder_events.closed:
+                    break
+                if subscriber.overflowed:
+                    subscriber.overflowed = False
+                    subscriber.events.clear()
+                    chunk = b"event: resync\ndata: {}\n\n"
+                elif subscriber.events:
+                    chunk = b"".join(subscriber.events)
+                    subscriber.events.clear()
+                elif not woken:
+                    chunk = b": keepalive\n\n"
+                else:
+                    # The request body arriving, not an event
+                    chunk = None
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        except OSError:
+            # Client went away mid-write
+            pass
+        finally:
+            reminder_events.unsubscribe(self.user_id, subscriber)
+            if not disconnect.done():
+                disconnect.cancel()
+
+# Request profiling
+def frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+def awaited_stack(task: asyncio.Task) -> List[str]:
+    """Coroutine chain a suspended task is waiting in, outermost first, ending with what it awaits"""
+    labels = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        code = getattr(awaitable, 'cr_code', None) or getattr(awaitable, 'gi_code', None) or getattr(awaitable, 'ag_code', None)
+        if code is None:
+            labels.append(f"<{type(awaitable).__name__}>")
+            break
+        labels.append(frame_label(code))
+        awaitable = getattr(awaitable, 'cr_await', None) or getattr(awaitable, 'gi_yieldfrom', None) or getattr(awaitable, 'ag_await', None)
+    return labels
+
+class RequestProfiler:
+    """Samples one request from a background thread.
+
+    Every sample is attributed to one of three states:
+      cpu        - the request's task is running; the event loop thread's stack is recorded
+      await      - the task is suspended and the loop is idle; the coroutine chain it waits in is recorded
+      loop_busy  - the task is suspended while the loop runs another task, so a result that is
+                   already in may be waiting its turn
+    """
+
+    def __init__(self, task: asyncio.Task, loop: asyncio.AbstractEventLoop, interval: float):
+        self.task = task
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.interval = interval
+        self.root_code = task.get_coro().cr_code
+        self.samples: Dict[Tuple[str, ...], float] = {}
+        self.states = {'cpu': 0.0, 'await': 0.0, 'loop_busy': 0.0}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.wall_seconds = time.perf_counter() - self.started
+
+    def run(self):
+        # Each sample is weighted by the time since the previous one: while the loop holds the
+        # GIL the sampler wakes late, and counting samples would under-report CPU time
+        last = self.started
+        while not self.stopped.wait(self.interval):
+            state, stack = self.sample()
+            now = time.perf_counter()
+            key = (f"[{state}]", *stack)
+            self.states[state] += now - last
+            self.samples[key] = self.samples.get(key, 0.0) + now - last
+            last = now
+
+    def sample(self) -> Tuple[str, List[str]]:
+        running = asyncio.current_task(self.loop)
+        if running is self.task:
+            frame = sys._current_frames().get(self.loop_thread_id)
+            frames = []
+            while frame is not None:
+                frames.append(frame.f_code)
+                frame = frame.f_back
+            frames.reverse()
+            # Drop the event loop frames below the request's own coroutine
+            for index, code in enumerate(frames):
+                if code is self.root_code:
+                    frames = frames[index:]
+                    break
+            return 'cpu', [frame_label(code) for code in frames]
+        return ('await' if running is None else 'loop_busy'), awaited_stack(self.task)
+
+    def breakdown(self) -> Dict[str, float]:
+        return {
+            'wall_ms': round(self.wall_seconds * 1000, 1),
+            **{f"{state}_ms": round(seconds * 1000, 1) for state, seconds in self.states.items()},
+        }
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed stack format, readable by flamegraph.pl and speedscope; weights are microseconds"""
+        return ''.join(f"{';'.join(stack)} {round(seconds * 1e6)}\n" for stack, seconds in sorted(self.samples.items()))
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        frames: Dict[str, int] = {}
+        samples = []
+        weights = []
+        for stack, seconds in self.samples.items():
+            samples.append([frames.setdefault(label, len(frames)) for label in stack])
+            weights.append(round(seconds * 1000, 3))
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'plauntie',
+            'shared': {'frames': [{'name': label} for label in frames]},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': round(self.wall_seconds * 1000, 3),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+
+    def write(self, directory: Path, name: str, format: str) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        if format == 'speedscope':
+            path = directory / f"{name}.speedscope.json"
+            path.write_bytes(orjson.dumps(self.speedscope(name)))
+        else:
+            path = directory / f"{name}.collapsed"
+            path.write_text(self.collapsed())
+        return path
+
+class ProfilingMiddleware:
+    """Profiles a sampled fraction of requests, and any request whose X-Profile header carries the admin token"""
+
+    def __init__(self, app):
+        self.app = app
+
+    # Event streams stay open as long as their client, keeping a sampler thread each;
+    # only the admin header profiles them
+    LONG_LIVED_PATHS = re.compile(r'/reminders/stream$')
+
+    def wanted(self, scope) -> bool:
+        long_lived = self.LONG_LIVED_PATHS.search(scope['path']) is not None
+        for name, value in scope['headers']:
+            if PROFILE_ADMIN_TOKEN and name == b'x-profile' and hmac.compare_digest(value, PROFILE_ADMIN_TOKEN.encode()):
+                return True
+            if name == b'accept' and b'text/event-stream' in value:
+                long_lived = True
+        return not long_lived and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{scope['method']}-{uuid.uuid4().hex[:8]}"
+        
+        async def send_with_profile_name(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message.get('headers', []), (b'x-profile-id', name.encode())]
+            await send(message)
+        
+        loop = asyncio.get_running_loop()
+        profiler = RequestProfiler(asyncio.current_task(), loop, PROFILE_INTERVAL_MS / 1000)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_name)
+        finally:
+            profiler.stop()
+            route = getattr(scope.get('route'), 'path', scope['path'])
+            path = await loop.run_in_executor(None, profiler.write, PROFILE_DIR, name, PROFILE_FORMAT)
+            logging.info(f"Profiled {scope['method']} {route}: {profiler.breakdown()} -> {path}")
 
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.exception_handler(QuotaExhausted)
+async def quota_exhausted_handler(request: Request, exc: QuotaExhausted):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Plant data provider quota is used up, please try again later"},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))}
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Profile-Id"],
 )
 
+if PROFILE_SAMPLE_RATE > 0 or PROFILE_ADMIN_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so the recorded latency includes the other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -521,10 +3676,37 @@ logger = logging.getLogger(__name__)
 @app.on_event("startup")
 async def startup_db_client():
     # Create indexes for better performance
-    await db.user_plants.create_index("user_id")
-    await db.reminders.create_index([("user_id", 1), ("due_date", 1)])
+    # Listings page by (sort key, id). A default listing still fetches each whole document;
+    # only a `fields=` projection within these keys is answered from the index alone
+    await db.user_plants.create_index([("user_id", 1), ("date_added", 1), ("id", 1)])
+    # Completions, rescheduling and the scheduler look plants and reminders up by id
+    await db.user_plants.create_index("id", unique=True)
+    await db.reminders.create_index("id", unique=True)
+    await db.reminders.create_index([("user_id", 1), ("completed", 1), ("due_date", 1), ("id", 1), ("status", 1)])
+    await db.search_cache.create_index("expires_at", expireAfterSeconds=0)
+    await db.care_info.create_index("plant_id", unique=True)
+    await db.identifications.create_index("bands")
+    await db.identifications.create_index("created_at", expireAfterSeconds=IDENTIFY_CACHE_TTL_DAYS * 24 * 3600)
+    await db.reminders.create_index("next_check_at", sparse=True)
+    await db.reminders.create_index([("plant_id", 1), ("completed", 1)])
+    await species_catalog.ensure_indexes()
+    await plant_service.start_session()
+    
+    global typeahead_index
+    typeahead_index = await asyncio.get_running_loop().run_in_executor(
+        None, load_typeahead_index, SUGGEST_SNAPSHOT_PATH, plant_service.plant_translations
+    )
+    logging.info(f"Typeahead index loaded: {typeahead_index.stats()}")
+    if REMINDER_SCHEDULER_ENABLED:
+        reminder_scheduler.start()
+    if REMINDER_STREAM_ENABLED:
+        reminder_events.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await reminder_scheduler.stop()
+    await reminder_events.stop()
     await plant_service.close_session()
+    if image_pool is not None:
+        image_pool.shutdown(wait=False, cancel_futures=True)
     client.close()
\ No newline at end of file
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Mirror the Perenual species catalog into the local `species` collection.
+
+The sync runs in two phases:
+  1. list   - pages through /species-list and upserts the summary of every species
+  2. details - fetches /species/details for species whose details are missing or stale
+
+Progress is stored in `catalog_sync_state`, so an interrupted run (or one that hit
+its request budget) resumes where it stopped. Once the list has been walked in full,
+later runs only re-read the last page to pick up newly added species.
+
+Usage:
+    python sync_catalog.py [--requests-per-minute 30] [--max-requests 90] [--refresh-days 30]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from server import (
+    client,
+    db,
+    plant_service,
+    species_catalog,
+    species_names,
+    name_trigrams,
+    upstream_priority,
+    UpstreamError,
+)
+
+STATE_ID = 'perenual'
+
+
+class RequestBudget:
+    """Spaces upstream requests evenly and stops after a fixed number of them"""
+
+    def __init__(self, requests_per_minute: float, max_requests: int):
+        self.interval = 60.0 / requests_per_minute
+        self.remaining = max_requests
+        self.last_request = 0.0
+
+    def exhausted(self) -> bool:
+        return self.remaining <= 0
+
+    async def wait(self):
+        delay = self.last_request + self.interval - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.last_request = time.monotonic()
+        self.remaining -= 1
+
+
+def species_document(plant: dict) -> dict:
+    """Summary fields of a species-list entry plus the computed search fields"""
+    doc = {key: value for key, value in plant.items() if key != 'id'}
+    trigrams = set()
+    for name in species_names(plant):
+        trigrams.update(name_trigrams(name))
+    doc['trigrams'] = sorted(trigrams)
+    doc['list_synced_at'] = datetime.utcnow()
+    return doc
+
+
+async def sync_list(budget: RequestBudget, refresh_days: int):
+    """Upsert species summaries page by page, recording progress after every page"""
+    state = await db.catalog_sync_state.find_one({'_id': STATE_ID}) or {}
+    completed_at = state.get('list_completed_at')
+    incremental = False
+    if 'next_page' in state:
+        page = state['next_page']
+        logging.info(f"Resuming species list sync at page {page}")
+    elif completed_at and datetime.utcnow() - completed_at < timedelta(days=refresh_days):
+        incremental = True
+        page = state.get('last_page', 1)
+        logging.info(f"Species list is up to date, checking last page {page} for new species")
+    else:
+        page = 1
+
+    last_page = state.get('last_page', page)
+    while page <= last_page:
+        if budget.exhausted():
+            logging.info(f"Request budget exhausted, list sync will resume at page {page}")
+            return False
+
+        await budget.wait()
+        data = await plant_service.fetch_species_page(page)
+        last_page = data.get('last_page', page)
+
+        for plant in data.get('data', []):
+            if not plant.get('id'):
+                continue
+            await db.species.update_one(
+                {'id': plant['id']},
+                {'$set': species_document(plant)},
+                upsert=True
+            )
+
+        page += 1
+        progress = {'last_page': last_page}
+        if not incremental:
+            progress['next_page'] = page
+        await db.catalog_sync_state.update_one({'_id': STATE_ID}, {'$set': progress}, upsert=True)
+        logging.info(f"Synced species page {page - 1}/{last_page}")
+
+    if not incremental:
+        await db.catalog_sync_state.update_one(
+            {'_id': STATE_ID},
+            {'$set': {'list_completed_at': datetime.utcnow()}, '$unset': {'next_page': ''}},
+            upsert=True
+        )
+    return True
+
+
+async def sync_details(budget: RequestBudget, refresh_days: int):
+    """Fetch details for species that have none yet or whose details are stale"""
+    stale_before = datetime.utcnow() - timedelta(days=refresh_days)
+    cursor = db.species.find(
+        {'$or': [
+            {'details_synced_at': {'$exists': False}},
+            {'details_synced_at': {'$lt': stale_before}}
+        ]},
+        {'_id': 0, 'id': 1}
+    ).sort('id', 1)
+
+    synced = 0
+    async for doc in cursor:
+        if budget.exhausted():
+            logging.info(f"Request budget exhausted after {synced} species details")
+            return False
+
+        await budget.wait()
+        details = await plant_service.fetch_species_details(str(doc['id']))
+        await db.species.update_one(
+            {'id': doc['id']},
+            {'$set': {'details': details, 'details_synced_at': datetime.utcnow()}}
+        )
+        synced += 1
+
+    logging.info(f"Synced details for {synced} species")
+    return True
+
+
+async def run(args):
+    # Catalog calls only spend quota above the share reserved for users of the app
+    upstream_priority.set('background')
+    await species_catalog.ensure_indexes()
+    if args.restart:
+        await db.catalog_sync_state.delete_one({'_id': STATE_ID})
+
+    budget = RequestBudget(args.requests_per_minute, args.max_requests)
+    try:
+        if await sync_list(budget, args.refresh_days) and not args.skip_details:
+            await sync_details(budget, args.refresh_days)
+    except UpstreamError as e:
+        # 429 or a spent quota; the next run resumes from the saved state
+        logging.error(f"Stopping catalog sync: {e}")
+    finally:
+        await plant_service.close_session()
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror the Perenual species catalog into MongoDB")
+    parser.add_argument('--requests-per-minute', type=float, default=30,
+                        help="upstream request rate (default: 30)")
+    parser.add_argument('--max-requests', type=int, default=90,
+                        help="upstream requests to spend in this run (default: 90)")
+    parser.add_argument('--refresh-days', type=int, default=30,
+                        help="re-fetch the list and details older than this (default: 30)")
+    parser.add_argument('--skip-details', action='store_true',
+                        help="only sync the species list")
+    parser.add_argument('--restart', action='store_true',
+                        help="forget saved progress and start from the first page")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -71,6 +71,24 @@ class PlantCareAPITester:
             except Exception as e:
                 self.log_test(f"Plant Search - {query}", False, f"Error: {str(e)}")
 
+    def test_plant_suggest(self):
+        """Test typeahead suggestions for a name prefix"""
+        try:
+            response = requests.get(f"{self.api_url}/plants/suggest", params={'prefix': 'ро'}, timeout=10)
+            success = response.status_code == 200
+            
+            if success:
+                data = response.json()
+                success = isinstance(data, list)
+                details = f"Prefix: 'ро' | Suggestions: {', '.join(item.get('name', '') for item in data[:5])}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            return self.log_test("Plant Suggest", success, details)
+            
+        except Exception as e:
+            return self.log_test("Plant Suggest", False, f"Error: {str(e)}")
+
     def test_plant_care_info(self):
         """Test getting plant care information"""
         if not self.test_plant_id:
@@ -129,6 +147,34 @@ class PlantCareAPITester:
         except Exception as e:
             return self.log_test("Plant Identification", False, f"Error: {str(e)}")
 
+    def test_batch_identification(self):
+        """Test batch identification with two photos of one plant and a second plant"""
+        try:
+            files = []
+            for index, color in enumerate(['green', 'darkgreen', 'yellow']):
+                img = Image.new('RGB', (300, 300), color=color)
+                img_buffer = io.BytesIO()
+                img.save(img_buffer, format='JPEG')
+                files.append(('files', (f'test_plant_{index}.jpg', img_buffer.getvalue(), 'image/jpeg')))
+            
+            data = {'plants': ['balcony-1', 'balcony-1', 'balcony-2'], 'organs': ['leaf', 'flower', 'auto']}
+            response = requests.post(f"{self.api_url}/plants/identify/batch", 
+                                   files=files, data=data, timeout=30)
+            
+            success = response.status_code == 200
+            
+            if success:
+                results = response.json()
+                success = [result.get('images') for result in results] == [2, 1]
+                details = f"Plants: {len(results)} | Images per plant: {[result.get('images') for result in results]}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            return self.log_test("Batch Plant Identification", success, details)
+            
+        except Exception as e:
+            return self.log_test("Batch Plant Identification", False, f"Error: {str(e)}")
+
     def test_add_user_plant(self):
         """Test adding a plant to user collection"""
         if not self.test_plant_id:
@@ -167,6 +213,31 @@ class PlantCareAPITester:
         except Exception as e:
             return self.log_test("Add User Plant", False, f"Error: {str(e)}")
 
+    def test_import_plants(self):
+        """Test importing plants from an NDJSON body"""
+        try:
+            rows = [
+                json.dumps({"plant_id": "import-1", "nickname": "Импорт 1", "plant_name": "Rose", "scientific_name": "Rosa"}),
+                json.dumps({"plant_id": "import-2", "nickname": "Импорт 2", "watering_frequency_days": "often"}),
+            ]
+            response = requests.post(f"{self.api_url}/user/{self.user_id}/plants/import",
+                                   data="\n".join(rows).encode('utf-8'),
+                                   headers={"Content-Type": "application/x-ndjson"},
+                                   timeout=30)
+            success = response.status_code == 200
+            
+            if success:
+                data = response.json()
+                success = data.get('imported') == 1 and data.get('failed') == 1
+                details = f"Imported: {data.get('imported')} | Errors: {data.get('errors')}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            return self.log_test("Import Plants", success, details)
+            
+        except Exception as e:
+            return self.log_test("Import Plants", False, f"Error: {str(e)}")
+
     def test_get_user_plants(self):
         """Test getting user's plant collection"""
         try:
@@ -188,6 +259,60 @@ class PlantCareAPITester:
         except Exception as e:
             return self.log_test("Get User Plants", False, f"Error: {str(e)}")
 
+    def test_user_dashboard(self):
+        """Test the combined plants and reminders dashboard"""
+        try:
+            response = requests.get(f"{self.api_url}/user/{self.user_id}/dashboard", timeout=10)
+            success = response.status_code == 200
+            
+            if success:
+                data = response.json()
+                summary = data.get('summary', {})
+                success = all(key in data for key in ('plants', 'reminders', 'summary'))
+                details = (f"Plants: {summary.get('plants')} | Overdue: {summary.get('overdue')} | "
+                           f"Today: {summary.get('due_today')} | Week: {summary.get('due_this_week')}")
+            else:
+                details = f"Status: {response.status_code}"
+            
+            return self.log_test("User Dashboard", success, details)
+            
+        except Exception as e:
+            return self.log_test("User Dashboard", False, f"Error: {str(e)}")
+
+    def test_reschedule_plants(self):
+        """Test stretching the watering frequency of a user's plants, on a user of its own so the
+        demo user's reminders stay within the reminder window"""
+        user_id = f"{self.user_id}-reschedule"
+        plants_url = f"{self.api_url}/user/{user_id}/plants"
+        try:
+            if not requests.get(plants_url, timeout=10).json():
+                requests.post(plants_url, json={
+                    "plant_id": "1", "nickname": "Reschedule test", "plant_name": "Rose",
+                    "watering_frequency_days": 7
+                }, timeout=10)
+            response = requests.post(
+                f"{plants_url}/reschedule",
+                json={"reminder_type": "watering", "factor": 1.5},
+                timeout=30
+            )
+            success = response.status_code == 200
+            
+            if success:
+                data = response.json()
+                frequencies = [plant.get('watering_frequency_days') for plant in requests.get(plants_url, timeout=10).json()]
+                success = data.get('plants', 0) >= 1 and all(frequency in (10, 11) for frequency in frequencies)
+                details = f"Plants: {data.get('plants')} | Reminders: {data.get('reminders')} | {data.get('seconds')}s | Frequencies: {frequencies}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            # Back to a weekly frequency so repeated runs do not compound the stretch
+            requests.post(f"{plants_url}/reschedule", json={"reminder_type": "watering", "frequency_days": 7}, timeout=30)
+            
+            return self.log_test("Reschedule Plants", success, details)
+            
+        except Exception as e:
+            return self.log_test("Reschedule Plants", False, f"Error: {str(e)}")
+
     def test_get_user_reminders(self):
         """Test getting user reminders"""
         try:
@@ -211,6 +336,24 @@ class PlantCareAPITester:
         except Exception as e:
             return self.log_test("Get User Reminders", False, f"Error: {str(e)}")
 
+    def test_reminder_stream(self):
+        """Test the reminder event stream (503 when MongoDB has no change streams)"""
+        try:
+            with requests.get(f"{self.api_url}/user/{self.user_id}/reminders/stream", stream=True, timeout=10) as response:
+                if response.status_code == 200:
+                    lines = response.iter_lines(decode_unicode=True)
+                    first = next((line for line in lines if line.startswith('event:')), '')
+                    success = response.headers.get('content-type', '').startswith('text/event-stream') and first == 'event: ready'
+                    details = f"First event: {first}"
+                else:
+                    success = response.status_code == 503
+                    details = f"Status: {response.status_code}"
+            
+            return self.log_test("Reminder Stream", success, details)
+            
+        except Exception as e:
+            return self.log_test("Reminder Stream", False, f"Error: {str(e)}")
+
     def test_complete_reminder(self):
         """Test completing a reminder"""
         if not self.test_reminder_id:
@@ -237,6 +380,65 @@ class PlantCareAPITester:
         except Exception as e:
             return self.log_test("Complete Reminder", False, f"Error: {str(e)}")
 
+    def test_bulk_complete_reminders(self):
+        """Test completing all pending reminders in one request"""
+        try:
+            pending = requests.get(f"{self.api_url}/user/{self.user_id}/reminders", timeout=10).json()
+            reminder_ids = [reminder['id'] for reminder in pending]
+            response = requests.post(f"{self.api_url}/user/{self.user_id}/reminders/complete",
+                                   json={"reminder_ids": reminder_ids + ["missing-reminder"]},
+                                   timeout=10)
+            success = response.status_code == 200
+            
+            if success:
+                data = response.json()
+                success = sorted(data.get('completed', [])) == sorted(reminder_ids) and data.get('not_found') == ["missing-reminder"]
+                details = f"Message: {data.get('message')} | Not found: {data.get('not_found')}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            return self.log_test("Bulk Complete Reminders", success, details)
+            
+        except Exception as e:
+            return self.log_test("Bulk Complete Reminders", False, f"Error: {str(e)}")
+
+    def test_metrics(self):
+        """Test the Prometheus metrics endpoint"""
+        try:
+            response = requests.get(f"{self.api_url}/metrics", timeout=10)
+            success = response.status_code == 200 and 'plauntie_http_request_duration_seconds' in response.text
+            
+            if success:
+                series = [line for line in response.text.splitlines() if line and not line.startswith('#')]
+                details = f"Series: {len(series)}"
+            else:
+                details = f"Status: {response.status_code}"
+            
+            return self.log_test("Metrics", success, details)
+            
+        except Exception as e:
+            return self.log_test("Metrics", False, f"Error: {str(e)}")
+
+    def test_upstream_quota(self):
+        """Test remaining upstream quota per provider"""
+        try:
+            response = requests.get(f"{self.api_url}/upstream/quota", timeout=10)
+            success = response.status_code == 200
+            
+            if success:
+                data = response.json()
+                details = ' | '.join(
+                    f"{name}: " + (', '.join(f"{limit['remaining']}/{limit['limit']}" for limit in quota['limits']) or 'unlimited')
+                    for name, quota in data.items()
+                )
+            else:
+                details = f"Status: {response.status_code}"
+            
+            return self.log_test("Upstream Quota", success, details)
+            
+        except Exception as e:
+            return self.log_test("Upstream Quota", False, f"Error: {str(e)}")
+
     def test_invalid_endpoints(self):
         """Test error handling for invalid requests"""
         test_cases = [
@@ -264,22 +466,33 @@ class PlantCareAPITester:
         
         # Test plant search and care info
         self.test_plant_search()
+        self.test_plant_suggest()
         self.test_plant_care_info()
         
         # Test plant identification
         self.test_plant_identification()
+        self.test_batch_identification()
         
         # Test user collection management
         self.test_add_user_plant()
+        self.test_import_plants()
         self.test_get_user_plants()
+        self.test_user_dashboard()
         
         # Test reminders system
         self.test_get_user_reminders()
+        self.test_reminder_stream()
         self.test_complete_reminder()
+        self.test_bulk_complete_reminders()
+        self.test_reschedule_plants()
         
         # Test error handling
         self.test_invalid_endpoints()
         
+        # Test instrumentation
+        self.test_metrics()
+        self.test_upstream_quota()
+        
         # Print summary
         print("\n" + "=" * 60)
         print(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
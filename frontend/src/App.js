@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import "./App.css";
 import axios from "axios";
 
@@ -7,6 +7,8 @@ const API = `${BACKEND_URL}/api`;
 
 // Mock user ID for demo
 const USER_ID = "demo-user";
+// Matches SEARCH_STREAM_MAX_PAGES on the backend
+const SEARCH_MAX_PAGES = 5;
 
 // Language translations
 const translations = {
@@ -21,6 +23,7 @@ const translations = {
     remindersTab: "⏰ Напоминания",
     searchPlaceholder: "Введите название растения...",
     searchButton: "Найти",
+    showMoreResults: "Показать ещё",
     searching: "Поиск...",
     careButton: "Уход",
     addButton: "Добавить",
@@ -86,6 +89,7 @@ const translations = {
     remindersTab: "⏰ Reminders",
     searchPlaceholder: "Enter plant name...",
     searchButton: "Search",
+    showMoreResults: "Show more",
     searching: "Searching...",
     careButton: "Care",
     addButton: "Add",
@@ -146,6 +150,9 @@ function App() {
   const [activeTab, setActiveTab] = useState('search');
   const [searchQuery, setSearchQuery] = useState('');
   const [searchResults, setSearchResults] = useState([]);
+  const [suggestions, setSuggestions] = useState([]);
+  // Upstream pages the current results cover, and whether another page may exist
+  const [searchPages, setSearchPages] = useState({ loaded: 0, more: false });
   const [userPlants, setUserPlants] = useState([]);
   const [reminders, setReminders] = useState([]);
   const [loading, setLoading] = useState(false);
@@ -155,12 +162,12 @@ function App() {
   const [identificationResult, setIdentificationResult] = useState(null);
   const [language, setLanguage] = useState('ru');
   const [isDarkTheme, setIsDarkTheme] = useState(true);
+  const careInfoCache = useRef({});
 
   const t = translations[language];
 
   useEffect(() => {
-    loadUserPlants();
-    loadReminders();
+    loadDashboard();
     
     // Load theme preference
     const savedTheme = localStorage.getItem('plauntie-theme');
@@ -175,6 +182,42 @@ function App() {
     }
   }, []);
 
+  useEffect(() => {
+    // Reminder changes are pushed over server-sent events; without the stream the list
+    // refreshes only after the user's own actions
+    if (typeof EventSource === 'undefined') {
+      return undefined;
+    }
+    const source = new EventSource(`${API}/user/${USER_ID}/reminders/stream`);
+    let connected = false;
+    const weekAhead = () => Date.now() + 7 * 24 * 3600 * 1000;
+    const upsert = (reminder) => setReminders((current) => {
+      const rest = current.filter((item) => item.id !== reminder.id);
+      if (new Date(reminder.due_date).getTime() > weekAhead()) {
+        return rest;
+      }
+      const merged = { ...current.find((item) => item.id === reminder.id), ...reminder };
+      return [...rest, merged].sort((a, b) => new Date(a.due_date) - new Date(b.due_date));
+    });
+    const remove = (reminder) => setReminders((current) => current.filter((item) => item.id !== reminder.id));
+
+    // `ready` after a reconnect, or `resync` when events were dropped: reload everything
+    source.addEventListener('ready', () => {
+      if (connected) {
+        loadDashboard();
+      }
+      connected = true;
+    });
+    source.addEventListener('resync', () => loadDashboard());
+    ['created', 'pending', 'due', 'overdue'].forEach((name) => {
+      source.addEventListener(name, (event) => upsert(JSON.parse(event.data)));
+    });
+    ['completed', 'missed'].forEach((name) => {
+      source.addEventListener(name, (event) => remove(JSON.parse(event.data)));
+    });
+    return () => source.close();
+  }, []);
+
   useEffect(() => {
     // Apply theme to body and save to localStorage
     document.body.className = isDarkTheme ? 'dark-theme' : 'light-theme';
@@ -186,31 +229,100 @@ function App() {
     localStorage.setItem('plauntie-language', language);
   }, [language]);
 
+  useEffect(() => {
+    // Autocomplete plant names while typing, debounced
+    const prefix = searchQuery.trim();
+    if (prefix.length < 2) {
+      setSuggestions([]);
+      return undefined;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${API}/plants/suggest`, { params: { prefix } });
+        setSuggestions(response.data);
+      } catch (error) {
+        console.error('Error loading suggestions:', error);
+      }
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  // Listings are paginated; follow X-Next-Cursor until the last page
+  const fetchAllPages = async (url) => {
+    const items = [];
+    let cursor = null;
+    do {
+      const response = await axios.get(url, { params: cursor ? { cursor } : {} });
+      items.push(...response.data);
+      cursor = response.headers['x-next-cursor'];
+    } while (cursor);
+    return items;
+  };
+
   const loadUserPlants = async () => {
     try {
-      const response = await axios.get(`${API}/user/${USER_ID}/plants`);
-      setUserPlants(response.data);
+      setUserPlants(await fetchAllPages(`${API}/user/${USER_ID}/plants`));
     } catch (error) {
       console.error('Error loading user plants:', error);
     }
   };
 
-  const loadReminders = async () => {
+  // Plants and reminders in one request; falls back to the paged listings for very large collections
+  const loadDashboard = async () => {
     try {
-      const response = await axios.get(`${API}/user/${USER_ID}/reminders`);
-      setReminders(response.data);
+      const response = await axios.get(`${API}/user/${USER_ID}/dashboard`);
+      setReminders(response.data.reminders);
+      if (response.data.summary.plants_truncated) {
+        await loadUserPlants();
+      } else {
+        setUserPlants(response.data.plants);
+      }
     } catch (error) {
-      console.error('Error loading reminders:', error);
+      // e.g. MongoDB older than 5.0 cannot run the dashboard pipeline; use the paged listings
+      console.error('Error loading dashboard, falling back to listings:', error);
+      await loadUserPlants();
+      try {
+        setReminders(await fetchAllPages(`${API}/user/${USER_ID}/reminders`));
+      } catch (listingError) {
+        console.error('Error loading reminders:', listingError);
+      }
     }
   };
 
-  const searchPlants = async () => {
+  // One upstream page unless the user asks for more; pages already seen come from the server's cache
+  const searchPlants = async (pages = 1) => {
     if (!searchQuery.trim()) return;
     
     setLoading(true);
+    setSearchResults([]);
+    setSearchPages({ loaded: 0, more: false });
     try {
-      const response = await axios.get(`${API}/plants/search?q=${encodeURIComponent(searchQuery)}`);
-      setSearchResults(response.data);
+      // Results stream in as NDJSON, one event per line, so the first page renders immediately
+      const response = await fetch(`${API}/plants/search/stream?q=${encodeURIComponent(searchQuery)}&pages=${pages}`);
+      if (!response.ok) throw new Error(`Search failed with status ${response.status}`);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        const events = lines.filter((line) => line.trim()).map((line) => JSON.parse(line));
+        const plants = events.filter((event) => event.type === 'result').map((event) => event.plant);
+        const end = events.find((event) => event.type === 'end');
+        if (end) {
+          setSearchPages({
+            loaded: end.pages,
+            more: end.pages === pages && pages < SEARCH_MAX_PAGES && (end.last_page == null || end.last_page > pages),
+          });
+        }
+        if (plants.length > 0) {
+          setSearchResults((previous) => [...previous, ...plants]);
+          setLoading(false);
+        }
+      }
     } catch (error) {
       console.error('Error searching plants:', error);
     } finally {
@@ -219,9 +331,17 @@ function App() {
   };
 
   const getPlantCareInfo = async (plantId) => {
+    // Care info rarely changes; reopening the modal reuses the previous response
+    if (careInfoCache.current[plantId]) {
+      setPlantCareInfo(careInfoCache.current[plantId]);
+      setSelectedPlant(searchResults.find(p => p.id === plantId));
+      return;
+    }
+
     setLoading(true);
     try {
       const response = await axios.get(`${API}/plants/${plantId}/care`);
+      careInfoCache.current[plantId] = response.data;
       setPlantCareInfo(response.data);
       setSelectedPlant(searchResults.find(p => p.id === plantId));
     } catch (error) {
@@ -249,10 +369,7 @@ function App() {
 
       await axios.post(`${API}/user/${USER_ID}/plants`, plantData);
       
-      await Promise.all([
-        loadUserPlants(),
-        loadReminders()
-      ]);
+      await loadDashboard();
       
       alert(t.plantAdded);
       setActiveTab('collection');
@@ -269,10 +386,7 @@ function App() {
     try {
       await axios.post(`${API}/user/${USER_ID}/reminders/${reminderId}/complete`);
       
-      await Promise.all([
-        loadReminders(),
-        loadUserPlants()
-      ]);
+      await loadDashboard();
       
       alert(t.reminderCompleted);
     } catch (error) {
@@ -423,6 +537,7 @@ function App() {
                 <input
                   type="text"
                   value={searchQuery}
+                  list="plant-suggestions"
                   onChange={(e) => setSearchQuery(e.target.value)}
                   onKeyPress={(e) => e.key === 'Enter' && searchPlants()}
                   placeholder={t.searchPlaceholder}
@@ -432,8 +547,13 @@ function App() {
                       : 'border-gray-300 focus:ring-green-500'
                   }`}
                 />
+                <datalist id="plant-suggestions">
+                  {suggestions.map((suggestion) => (
+                    <option key={suggestion.name} value={suggestion.name} />
+                  ))}
+                </datalist>
                 <button
-                  onClick={searchPlants}
+                  onClick={() => searchPlants()}
                   disabled={loading}
                   className={`px-8 py-3 rounded-lg disabled:opacity-50 transition-all duration-300 ${
                     isDarkTheme
@@ -503,6 +623,20 @@ function App() {
                 ))}
               </div>
             )}
+            {searchPages.more && !loading && (
+              <div className="text-center mt-6">
+                <button
+                  onClick={() => searchPlants(searchPages.loaded + 1)}
+                  className={`px-6 py-2 rounded-lg transition-all duration-300 ${
+                    isDarkTheme
+                      ? 'bg-gray-700 text-gray-200 hover:bg-gray-600'
+                      : 'bg-gray-200 text-gray-800 hover:bg-gray-300'
+                  }`}
+                >
+                  {t.showMoreResults}
+                </button>
+              </div>
+            )}
 
             {/* Plant Care Info Modal */}
             {plantCareInfo && (
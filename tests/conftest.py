@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# server.py lives in backend/ and reads MONGO_URL and DB_NAME from backend/.env on import;
+# the Motor client connects lazily, so these tests need neither MongoDB nor the network
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
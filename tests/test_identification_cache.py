@@ -0,0 +1,83 @@
+import asyncio
+import random
+
+from server import IdentificationCache, PlantIdentification, hamming_distance, hash_bands
+
+
+class FakeCollection:
+    """The few Motor collection calls IdentificationCache makes, over a list of documents"""
+
+    def __init__(self):
+        self.documents = []
+
+    async def insert_one(self, document):
+        self.documents.append({'_id': len(self.documents), **document})
+
+    async def _find(self, bands):
+        for document in self.documents:
+            if set(document['bands']) & set(bands):
+                yield {'_id': document['_id'], 'phash': document['phash']}
+
+    def find(self, query, projection):
+        assert projection == {'phash': 1}
+        return self._find(query['bands']['$in'])
+
+    async def find_one(self, query, projection):
+        document = self.documents[query['_id']]
+        return {key: value for key, value in document.items() if key not in ('_id', 'bands')}
+
+
+def flip_bits(phash, count, rng):
+    for bit in rng.sample(range(64), count):
+        phash ^= 1 << bit
+    return phash
+
+
+def identification(name):
+    return PlantIdentification(suggestions=[{'name': name}], confidence=0.9, identified_name=name)
+
+
+def test_hashes_within_seven_bits_share_a_band():
+    rng = random.Random(7)
+    for _ in range(500):
+        phash = rng.getrandbits(64)
+        near = flip_bits(phash, rng.randint(0, 7), rng)
+        assert set(hash_bands(phash)) & set(hash_bands(near))
+
+
+def test_bands_are_tagged_by_position():
+    # The same byte in different positions must not match
+    low, high = hash_bands(0x00000000000000AB), hash_bands(0x000000000000AB00)
+    assert low[0] not in high
+    assert high[1] not in low
+
+
+def test_lookup_returns_closest_entry_within_distance():
+    rng = random.Random(1)
+    phash = rng.getrandbits(64) | (1 << 63)  # stored as a negative int64
+    cache = IdentificationCache(FakeCollection(), max_distance=6)
+
+    async def scenario():
+        await cache.store(flip_bits(phash, 5, rng), identification('far'))
+        await cache.store(flip_bits(phash, 2, rng), identification('near'))
+        return await cache.lookup(phash)
+
+    result = asyncio.run(scenario())
+    assert result.identified_name == 'near'
+    assert result.cached
+    assert cache.stats == {'hits': 1, 'misses': 0}
+
+
+def test_lookup_misses_beyond_distance():
+    rng = random.Random(2)
+    phash = rng.getrandbits(64)
+    other = flip_bits(phash, 7, rng)
+    assert hamming_distance(phash, other) == 7
+    cache = IdentificationCache(FakeCollection(), max_distance=6)
+
+    async def scenario():
+        await cache.store(other, identification('other'))
+        return await cache.lookup(phash)
+
+    assert asyncio.run(scenario()) is None
+    assert cache.stats == {'hits': 0, 'misses': 1}
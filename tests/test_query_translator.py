@@ -0,0 +1,38 @@
+from server import QueryTranslator, tokenize_query
+
+TRANSLATIONS = {
+    'роза': 'rose',
+    'фиалка': 'violet',
+    'фиалка узамбарская': 'african violet',
+    'орхидея': 'orchid',
+}
+
+
+def test_inflected_phrase_matches_dictionary_phrase():
+    translator = QueryTranslator(TRANSLATIONS)
+    assert translator.translate('фиалки узамбарские') == 'african violet'
+    assert translator.translate('Фиалка') == 'violet'
+
+
+def test_longest_phrase_wins_anywhere_in_query():
+    translator = QueryTranslator(TRANSLATIONS)
+    assert translator.translate('купить фиалку узамбарскую недорого') == 'african violet'
+    assert translator.translate('красная роза') == 'rose'
+
+
+def test_partial_name_completes_to_phrase():
+    translator = QueryTranslator(TRANSLATIONS)
+    assert translator.translate('орхид') == 'orchid'
+
+
+def test_unknown_and_short_queries_are_not_translated():
+    translator = QueryTranslator(TRANSLATIONS)
+    assert translator.translate('кактус') is None
+    assert translator.translate('ор') is None
+    assert translator.translate('') is None
+
+
+def test_phrases_without_tokens_are_skipped():
+    translator = QueryTranslator({'!!!': 'nothing', 'роза': 'rose'})
+    assert translator.max_phrase_tokens == 1
+    assert translator.prefix_keys == tokenize_query('роза')
@@ -0,0 +1,31 @@
+import numpy as np
+
+from server import reschedule_plan
+
+START = np.array(['2026-01-01T08:30', '2026-03-15T00:00', '2026-12-31T23:59'], dtype='datetime64[ms]')
+
+
+def test_factor_scales_and_rounds_frequencies():
+    frequencies, due_dates = reschedule_plan(START, np.array([7.0, 3.0, 1.0]), 1.5, None)
+    # rint rounds halves to even: 10.5 -> 10, 4.5 -> 4
+    assert frequencies.tolist() == [10, 4, 2]
+    assert frequencies.dtype == np.int64
+    assert due_dates.tolist() == (START + np.array([10, 4, 2], dtype='timedelta64[D]')).tolist()
+
+
+def test_frequency_never_drops_below_one_day():
+    frequencies, _ = reschedule_plan(START, np.array([1.0, 2.0, 30.0]), 0.1, None)
+    assert frequencies.tolist() == [1, 1, 3]
+
+
+def test_fixed_frequency_overrides_every_plant():
+    frequencies, due_dates = reschedule_plan(START, np.array([7.0, 3.0, 1.0]), None, 14)
+    assert frequencies.tolist() == [14, 14, 14]
+    assert due_dates.dtype == np.dtype('datetime64[ms]')
+    assert due_dates[0] == np.datetime64('2026-01-15T08:30', 'ms')
+    assert due_dates[2] == np.datetime64('2027-01-14T23:59', 'ms')
+
+
+def test_empty_plan():
+    frequencies, due_dates = reschedule_plan(START[:0], np.array([]), 2.0, None)
+    assert len(frequencies) == len(due_dates) == 0
@@ -0,0 +1,73 @@
+import random
+
+from server import TypeaheadIndex, load_typeahead_index, normalize_species_name
+
+ENTRIES = [
+    ('Rosa chinensis', 'rose', '101', 40),
+    ('Rosa rugosa', 'rose', '102', 25),
+    ('Rosa', 'rose', '', 90),
+    ('rosa  CHINENSIS', 'rose', '', 70),  # same name once normalized
+    ('Rosmarinus officinalis', 'rosemary', '201', 60),
+    ('Saintpaulia ionantha', 'african violet', '301', 30),
+    ('Роза', 'rose', '', 0),
+    ('Фиалка узамбарская', 'african violet', '', 0),
+]
+
+
+def names(suggestions):
+    return [item['name'] for item in suggestions]
+
+
+def test_ranked_by_popularity_then_length():
+    index = TypeaheadIndex.build(ENTRIES)
+    assert names(index.suggest('ros')) == ['Rosa', 'Rosa chinensis', 'Rosmarinus officinalis', 'Rosa rugosa']
+    assert names(index.suggest('ROSA', limit=2)) == ['Rosa', 'Rosa chinensis']
+    assert names(index.suggest('')) == []
+
+
+def test_duplicate_names_are_merged():
+    index = TypeaheadIndex.build(ENTRIES)
+    [merged] = [item for item in index.suggest('rosa chin')]
+    assert merged == {'name': 'Rosa chinensis', 'plant': 'rose', 'species_id': '101', 'popularity': 70}
+
+
+def test_later_words_and_cyrillic_names_match():
+    index = TypeaheadIndex.build(ENTRIES)
+    assert names(index.suggest('ionan')) == ['Saintpaulia ionantha']
+    assert names(index.suggest('узамб')) == ['Фиалка узамбарская']
+    assert index.suggest('ро')[0]['plant'] == 'rose'
+
+
+def test_precomputed_prefixes_match_a_full_scan():
+    rng = random.Random(3)
+    letters = 'abcр'
+    entries = [
+        (''.join(rng.choice(letters) for _ in range(rng.randint(1, 6))), f'plant {i % 7}', str(i), rng.randint(0, 50))
+        for i in range(400)
+    ]
+    index = TypeaheadIndex.build(entries, top_k=5, scan_limit=8)
+    scanning = TypeaheadIndex.build(entries, top_k=5, scan_limit=10 ** 6)
+    assert index.top and not scanning.top
+    for prefix in {normalize_species_name(name)[:length] for name, *_ in entries for length in (1, 2, 3)}:
+        assert index.suggest(prefix, limit=5) == scanning.suggest(prefix, limit=5)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = TypeaheadIndex.build(ENTRIES, top_k=3, scan_limit=2)
+    path = tmp_path / 'suggest.npz'
+    index.save(path)
+    loaded = TypeaheadIndex.load(path)
+
+    assert loaded.stats() == index.stats()
+    assert loaded.top == index.top
+    for prefix in ('r', 'ros', 'rosa c', 'sa', 'ио', 'ф', 'missing'):
+        assert loaded.suggest(prefix) == index.suggest(prefix)
+    assert not path.with_name(path.name + '.tmp').exists()
+
+
+def test_unreadable_snapshot_falls_back_to_translations(tmp_path):
+    path = tmp_path / 'suggest.npz'
+    path.write_bytes(b'not a snapshot')
+    index = load_typeahead_index(path, {'роза': 'rose'})
+    assert names(index.suggest('ро')) == ['роза']
+    assert names(index.suggest('ros')) == ['rose']
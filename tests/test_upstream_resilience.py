@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+import server
+from server import CircuitBreaker, RetryBudget, plant_service
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(server.time, 'monotonic', clock)
+    return clock
+
+
+def test_breaker_opens_after_threshold_and_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow_request()
+
+    clock.now += 30
+    assert breaker.allow_request()
+    assert breaker.state == 'half_open'
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert breaker.snapshot()['retry_in_seconds'] == 10
+    assert not breaker.allow_request()
+
+
+def test_released_probe_lets_another_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.allow_request()
+
+
+def test_retry_budget_refills_by_ratio_up_to_max():
+    budget = RetryBudget(ratio=0.5, max_tokens=2)
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2
+
+
+def test_single_flight_shares_one_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    async def scenario():
+        return await asyncio.gather(*[plant_service._single_flight('test-shared', fetch) for _ in range(5)])
+
+    assert asyncio.run(scenario()) == ['result'] * 5
+    assert calls == [1]
+    assert 'test-shared' not in plant_service.inflight
+
+
+def test_single_flight_survives_a_cancelled_caller():
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 'result'
+
+    async def scenario():
+        first = asyncio.create_task(plant_service._single_flight('test-cancel', fetch))
+        second = asyncio.create_task(plant_service._single_flight('test-cancel', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ('result', True)
+
+
+def test_abandoned_single_flight_is_cancelled():
+    started = []
+
+    async def fetch():
+        started.append(1)
+        await asyncio.sleep(10)
+
+    async def scenario():
+        caller = asyncio.create_task(plant_service._single_flight('test-abandoned', fetch, cancel_when_abandoned=True))
+        await asyncio.sleep(0.01)
+        flight = plant_service.inflight['test-abandoned']
+        caller.cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return flight.cancelled()
+
+    assert asyncio.run(scenario())
+    assert started == [1]
+    assert 'test-abandoned' not in plant_service.inflight
+
+
+def test_single_flight_shares_the_exception():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError('upstream failed')
+
+    async def scenario():
+        return await asyncio.gather(
+            *[plant_service._single_flight('test-error', fetch) for _ in range(3)], return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [ValueError] * 3